@@ -0,0 +1,141 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright 2011-2013, Nigel Small
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+""" Compare JSONStream tokeniser engines on a multi-megabyte Cypher result
+payload, delivered in chunks as it would be by `Response.iter_chunks`.
+
+Usage: python bench/jsonstream_bench.py [row_count] [chunk_size]
+"""
+
+
+from __future__ import print_function, unicode_literals
+
+import json
+import os
+import sys
+from time import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from py2neo.packages.httpstream.jsonstream import (JSONStream, Tokeniser,
+                                                   BufferedTokeniser,
+                                                   JSONEnvelopeStream,
+                                                   AwaitingData, EndOfStream,
+                                                   assembled, grouped)
+
+
+def cypher_payload(row_count):
+    base = "http://localhost:7474/db/data/node/"
+    data = []
+    for i in range(row_count):
+        uri = base + str(i)
+        data.append([{
+            "self": uri,
+            "properties": uri + "/properties",
+            "labels": uri + "/labels",
+            "data": {"name": "Person #" + str(i), "age": i % 100,
+                     "score": i / 7.0, "active": i % 2 == 0},
+        }, i])
+    return json.dumps({"columns": ["n", "i"], "data": data})
+
+
+def chunked(text, chunk_size):
+    return [text[i:i + chunk_size] for i in range(0, len(text), chunk_size)]
+
+
+def tokenise(tokeniser, chunks):
+    """ Time the tokeniser alone, without path tracking.
+    """
+    t0 = time()
+    count = 0
+    tokens = tokeniser()
+    for chunk in chunks + [None]:
+        if chunk is None:
+            tokens.end()
+        else:
+            tokens.write(chunk)
+        try:
+            while True:
+                tokens.read()
+                count += 1
+        except (AwaitingData, EndOfStream):
+            pass
+    return count, time() - t0
+
+
+def run(tokeniser, chunks):
+    t0 = time()
+    count = 0
+    for _ in JSONStream(chunks, tokeniser=tokeniser):
+        count += 1
+    return count, time() - t0
+
+
+def rows_by_assembly(chunks):
+    """ Build rows from per-scalar events, as results used to be built.
+    """
+    t0 = time()
+    count = 0
+    for key, section in grouped(JSONStream(chunks)):
+        if key[0] == "data":
+            for i, row in grouped(section):
+                assembled(row)
+                count += 1
+    return count, time() - t0
+
+
+def rows_by_envelope(chunks):
+    """ Build rows by decoding each row of the envelope in one go.
+    """
+    t0 = time()
+    count = 0
+    for key, row in JSONEnvelopeStream(chunks):
+        if key[0] == "data":
+            count += 1
+    return count, time() - t0
+
+
+def main():
+    row_count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    chunk_size = int(sys.argv[2]) if len(sys.argv) > 2 else 4096
+    text = cypher_payload(row_count)
+    chunks = chunked(text, chunk_size)
+    megabytes = len(text) / 1048576.0
+    print("Payload: {0} rows, {1:.2f} MB, {2} chunks of {3}".format(
+        row_count, megabytes, len(chunks), chunk_size))
+    for label, func in (("tokens", tokenise), ("events", run)):
+        results = {}
+        for tokeniser in (Tokeniser, BufferedTokeniser):
+            count, elapsed = func(tokeniser, chunks)
+            results[tokeniser] = elapsed
+            print("{0:<20} {1:>9} {2} {3:>8.3f}s {4:>8.2f} MB/s".format(
+                tokeniser.__name__, count, label, elapsed,
+                megabytes / elapsed))
+        print("Speed-up ({0}): {1:.1f}x".format(
+            label, results[Tokeniser] / results[BufferedTokeniser]))
+    results = {}
+    for func in (rows_by_assembly, rows_by_envelope):
+        count, elapsed = func(chunks)
+        results[func] = elapsed
+        print("{0:<20} {1:>9} rows {2:>8.3f}s {3:>8.2f} MB/s".format(
+            func.__name__, count, elapsed, megabytes / elapsed))
+    print("Speed-up (rows): {0:.1f}x".format(
+        results[rows_by_assembly] / results[rows_by_envelope]))
+
+
+if __name__ == "__main__":
+    main()
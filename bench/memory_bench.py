@@ -0,0 +1,119 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright 2011-2013, Nigel Small
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+""" Measure the heap retained per row by hydrated Cypher results, each row
+holding one node and one relationship as returned by a Neo4j 2.0 server.
+The properties of each entity are reported separately, as these are the
+payload itself rather than per-row overhead.
+
+Usage: python bench/memory_bench.py [row_count]
+"""
+
+
+from __future__ import print_function, unicode_literals
+
+import gc
+import json
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from py2neo.neo4j import CypherResults
+
+
+BASE = "http://localhost:7474/db/data/"
+
+
+def node(i):
+    uri = BASE + "node/" + str(i)
+    return {
+        "extensions": {},
+        "paged_traverse": uri + "/paged/traverse/{returnType}{?pageSize,leaseTime}",
+        "labels": uri + "/labels",
+        "outgoing_relationships": uri + "/relationships/out",
+        "traverse": uri + "/traverse/{returnType}",
+        "all_typed_relationships": uri + "/relationships/all/{-list|&|types}",
+        "property": uri + "/properties/{key}",
+        "all_relationships": uri + "/relationships/all",
+        "self": uri,
+        "outgoing_typed_relationships": uri + "/relationships/out/{-list|&|types}",
+        "properties": uri + "/properties",
+        "incoming_relationships": uri + "/relationships/in",
+        "incoming_typed_relationships": uri + "/relationships/in/{-list|&|types}",
+        "create_relationship": uri + "/relationships",
+        "data": {"name": "Person #" + str(i), "age": i % 100},
+    }
+
+
+def relationship(i):
+    uri = BASE + "relationship/" + str(i)
+    return {
+        "extensions": {},
+        "start": BASE + "node/" + str(i),
+        "property": uri + "/properties/{key}",
+        "self": uri,
+        "properties": uri + "/properties",
+        "type": "KNOWS",
+        "end": BASE + "node/" + str(i + 1),
+        "data": {"since": 1999 + i % 20},
+    }
+
+
+def cypher_payload(row_count):
+    data = [[node(i), relationship(i)] for i in range(row_count)]
+    return json.dumps({"columns": ["n", "r"], "data": data})
+
+
+def retained(build, text):
+    """ Heap retained by the object built from the decoded payload, once the
+    decoded payload itself has been released.
+    """
+    gc.collect()
+    tracemalloc.start()
+    content = json.loads(text)
+    obj = build(content)
+    del content
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del obj
+    return size
+
+
+def properties_only(content):
+    return [[entity["data"] for entity in row] for row in content["data"]]
+
+
+def records(content):
+    return CypherResults._hydrated(content)
+
+
+def main():
+    row_count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    text = cypher_payload(row_count)
+    payload = retained(properties_only, text)
+    total = retained(records, text)
+    print("Rows: {0}".format(row_count))
+    print("{0:<12} {1:>10.1f} bytes/row".format("properties", payload / row_count))
+    print("{0:<12} {1:>10.1f} bytes/row".format("records", total / row_count))
+    print("{0:<12} {1:>10.1f} bytes/row".format("overhead", (total - payload) / row_count))
+
+
+if __name__ == "__main__":
+    main()
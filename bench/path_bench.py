@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright 2011-2013, Nigel Small
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+""" Time a variable-length path query against a chain of nodes, reading the
+properties of every node and the type and properties of every relationship
+in each path returned. Paths hydrated from a single follow-up batch are
+compared with paths left holding bare URIs, whose members are then fetched
+one request at a time. Requires a Neo4j server at localhost:7474.
+
+Usage: python bench/path_bench.py [chain_length] [max_depth]
+"""
+
+
+from __future__ import print_function, unicode_literals
+
+import os
+import sys
+from time import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from py2neo import neo4j
+from py2neo.neo4j import _hydrated
+
+
+def create_chain(graph_db, length):
+    abstracts = [{"name": "Person #{0}".format(i)} for i in range(length)]
+    abstracts.extend((i, "KNOWS", i + 1, {"since": 1990 + i % 20})
+                     for i in range(length - 1))
+    return graph_db.create(*abstracts)[0]
+
+
+def walk(paths):
+    for path in paths:
+        for node in path.nodes:
+            node.get_properties()
+        for rel in path.relationships:
+            rel.type
+            rel.get_properties()
+
+
+def fetch_rows(graph_db, start, max_depth):
+    query = ("START a=node({{a}}) MATCH p=a-[:KNOWS*1..{0}]->() "
+             "RETURN p".format(int(max_depth)))
+    response = neo4j.CypherQuery(graph_db, query)._execute(a=start._id)
+    return response.json["data"]
+
+
+def hydrated_in_batch(rows):
+    return [row[0] for row in _hydrated(rows)]
+
+
+def hydrated_with_uris(rows):
+    return [row[0] for row in _hydrated(rows, {})]
+
+
+def main():
+    length = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    max_depth = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    graph_db = neo4j.GraphDatabaseService()
+    start = create_chain(graph_db, length)
+    print("Chain length: {0}, maximum depth: {1}".format(length, max_depth))
+    for func in (hydrated_with_uris, hydrated_in_batch):
+        # properties already loaded are only reused within an identity map
+        with neo4j.IdentityMap(graph_db):
+            t0 = time()
+            paths = func(fetch_rows(graph_db, start, max_depth))
+            walk(paths)
+            elapsed = time() - t0
+        print("{0:<20} {1:>6} paths {2:>8.3f}s".format(
+            func.__name__, len(paths), elapsed))
+
+if __name__ == "__main__":
+    main()
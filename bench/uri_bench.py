@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright 2011-2013, Nigel Small
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+""" Time URI handling on the paths taken by hydrated entities: building URIs
+from strings, hashing them, hydrating nodes and reading their URIs and IDs,
+and building nodes by ID from a graph database. Also time the URI template
+expansions used for index lookups and queries.
+
+Usage: python bench/uri_bench.py [count]
+"""
+
+
+from __future__ import print_function, unicode_literals
+
+import os
+import sys
+from time import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from py2neo.neo4j import GraphDatabaseService, Node
+from py2neo.packages.httpstream.uri import URI, URITemplate
+
+
+BASE = "http://localhost:7474/db/data/"
+
+
+def node_data(i):
+    uri = BASE + "node/" + str(i)
+    return {
+        "self": uri,
+        "properties": uri + "/properties",
+        "labels": uri + "/labels",
+        "data": {"name": "Person #" + str(i)},
+    }
+
+
+def uri_string_and_hash(count):
+    t0 = time()
+    for i in range(count):
+        uri = URI(BASE + "node/" + str(i))
+        hash(uri)
+        uri.string
+    return time() - t0
+
+
+def hydrate_and_identify(count):
+    rows = [node_data(i) for i in range(count)]
+    t0 = time()
+    for data in rows:
+        node = Node._hydrated(data)
+        hash(node.__uri__)
+        node._id
+    return time() - t0
+
+
+def node_by_id(count):
+    graph_db = GraphDatabaseService(BASE)
+    t0 = time()
+    for i in range(count):
+        graph_db.node(i)
+    return time() - t0
+
+
+def template_expansion(count):
+    searcher = URITemplate(BASE + "index/node/People/{key}/{value}")
+    query = URITemplate(BASE + "index/node/People{?query,order}")
+    t0 = time()
+    for i in range(count):
+        searcher.expand(key="name", value="Person #" + str(i)).string
+        query.expand(query="name:Person*", order="score").string
+    return time() - t0
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    print("Count: {0}".format(count))
+    for func in (uri_string_and_hash, hydrate_and_identify, node_by_id,
+                 template_expansion):
+        elapsed = func(count)
+        print("{0:<24} {1:>8.3f}s {2:>10.0f}/s".format(
+            func.__name__, elapsed, count / elapsed))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,417 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright 2011-2013, Nigel Small
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+""" Asyncio support for Cypher queries, batches and transactions.
+
+This module requires Python 3.5 or above. The classes here extend their
+blocking counterparts so that the requests which carry data are issued from
+coroutines, allowing a single event loop to keep many queries in flight::
+
+    >>> from py2neo import neo4j, aio
+    >>> graph_db = aio.AsyncGraphDatabaseService()
+    >>> results = await graph_db.execute("START n=node(1) RETURN n")
+    >>> async with await graph_db.stream("START n=node(*) RETURN n") as rs:
+    ...     async for record in rs:
+    ...         print(record.n)
+
+.. note ::
+    Discovery of service metadata (such as the location of the Cypher or
+    batch resources) is carried out with blocking requests the first time it
+    is needed and cached thereafter, as for the rest of the library.
+"""
+
+
+from collections import OrderedDict
+
+from .cypher import Session, Transaction
+from .exceptions import ClientError, ServerError, CypherError, BatchError
+from .neo4j import (GraphDatabaseService, CypherQuery, CypherResults,
+                    BatchResponse, ReadBatch, WriteBatch, Resource,
+                    _hydrated, _collect_path_uris)
+from .packages.httpstream import ClientError as _ClientError
+from .packages.httpstream import ServerError as _ServerError
+from .packages.httpstream.aio import AsyncResource
+from .packages.httpstream.jsonstream import (JSONEnvelopeStream, AwaitingData,
+                                             EndOfStream)
+from .util import RecordProducer, has_all
+
+
+__all__ = ["AsyncGraphDatabaseService", "AsyncCypherQuery",
+           "AsyncIterableCypherResults", "AsyncReadBatch", "AsyncWriteBatch",
+           "AsyncBatchResponseList", "AsyncSession", "AsyncTransaction"]
+
+
+async def _request(resource, method, body=None):
+    """ Issue a request against a :py:class:`py2neo.neo4j.Resource` from a
+    coroutine, returning an :py:class:`AsyncResponse`.
+    """
+    async_resource = AsyncResource(resource.__uri__)
+    kwargs = {"headers": resource._headers, "product": resource._product}
+    if body is not None:
+        kwargs["body"] = body
+    try:
+        return await getattr(async_resource, method)(**kwargs)
+    except _ClientError as e:
+        raise ClientError(e)
+    except _ServerError as e:
+        raise ServerError(e)
+
+
+async def _path_entities(data):
+    """ Fetch the nodes and relationships of all paths within the input in a
+    single batch from a coroutine, returning their representations keyed by
+    URI.
+    """
+    uris = OrderedDict()
+    _collect_path_uris(data, uris)
+    if not uris:
+        return {}
+    batch = AsyncReadBatch(Resource(next(iter(uris))).graph_db)
+    for uri in uris:
+        batch.append_get(batch._uri_for(Resource(uri)))
+    responses = await (await batch._execute()).json()
+    return dict(zip(uris, (BatchResponse(rs).body for rs in responses)))
+
+
+def _batch_data(responses):
+    """ Return the values within a list of batch responses which may hold
+    paths, looking inside any Cypher results.
+    """
+    return [
+        rs.body["data"] if isinstance(rs.body, dict) and
+        has_all(rs.body, CypherResults.signature) else rs.body
+        for rs in responses
+    ]
+
+
+def _feature_error(error, base):
+    if error.exception:
+        # a dynamically created subclass with the same name as the
+        # underlying server exception, as raised by the blocking API
+        return type(str(error.exception), (base,), {})(error)
+    else:
+        return base(error)
+
+
+class _AsyncEvents(object):
+    """ Asynchronous iterator of events decoded from a response by a
+    :py:class:`JSONEnvelopeStream`.
+    """
+
+    def __init__(self, response):
+        self._response = response
+        self._chunks = response.iter_chunks()
+        self._stream = JSONEnvelopeStream(())
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        stream = self._stream
+        while True:
+            try:
+                return stream.read()
+            except AwaitingData:
+                try:
+                    stream.write(await self._chunks.__anext__())
+                except StopAsyncIteration:
+                    stream.end()
+            except EndOfStream:
+                raise StopAsyncIteration()
+
+
+class AsyncIterableCypherResults(object):
+    """ Asynchronous counterpart of
+    :py:class:`IterableCypherResults <py2neo.neo4j.IterableCypherResults>`.
+    Instances are returned from :py:meth:`AsyncCypherQuery.stream` once the
+    column names have been received.
+    """
+
+    def __init__(self, response):
+        self._response = response
+        self._events = _AsyncEvents(response)
+        self._pending = []
+        self._columns = None
+        self._producer = None
+
+    async def _fetch_columns(self):
+        async for key, value in self._events:
+            if key[0] == "columns":
+                self._producer = RecordProducer(value)
+                self._columns = self._producer.columns
+                break
+            elif key[0] == "data":
+                self._pending.append(value)
+        return self
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+        return False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        # the members of any paths are left as URIs rather than fetched
+        # with a blocking request
+        if self._pending:
+            return self._producer.produce(_hydrated(self._pending.pop(0), {}))
+        async for key, value in self._events:
+            if key[0] == "data":
+                return self._producer.produce(_hydrated(value, {}))
+        raise StopAsyncIteration()
+
+    @property
+    def columns(self):
+        """ Column names.
+        """
+        return self._columns
+
+    def close(self):
+        """ Close results and free resources.
+        """
+        self._response.close()
+
+
+class AsyncCypherQuery(CypherQuery):
+    """ A reusable Cypher query, executed from coroutines.
+    """
+
+    async def _execute(self, **params):
+        try:
+            return await _request(self._cypher, "post", {
+                "query": self._query,
+                "params": dict(params or {}),
+            })
+        except ClientError as e:
+            raise _feature_error(e, CypherError)
+
+    async def run(self, **params):
+        """ Execute the query and discard any results.
+        """
+        (await self._execute(**params)).close()
+
+    async def execute(self, **params):
+        """ Execute the query and return the results.
+
+        :rtype: :py:class:`CypherResults <py2neo.neo4j.CypherResults>`
+        """
+        response = await (await self._execute(**params)).buffered()
+        content = response.json
+        path_entities = await _path_entities(content["data"])
+        return CypherResults(response, content, path_entities)
+
+    async def execute_one(self, **params):
+        """ Execute the query and return the first value from the first row.
+        """
+        try:
+            return (await self.execute(**params)).data[0][0]
+        except IndexError:
+            return None
+
+    async def stream(self, **params):
+        """ Execute the query and return an asynchronous result iterator.
+
+        :rtype: :py:class:`AsyncIterableCypherResults`
+        """
+        results = AsyncIterableCypherResults(await self._execute(**params))
+        return await results._fetch_columns()
+
+
+class AsyncBatchResponseList(object):
+    """ Asynchronous iterator of hydrated batch results, available as they
+    are received from the server.
+    """
+
+    def __init__(self, response):
+        self._response = response
+        self._events = _AsyncEvents(response)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        async for key, result in self._events:
+            response = BatchResponse(result)
+            path_entities = await _path_entities(_batch_data([response]))
+            return response._hydrate(path_entities)
+        self.close()
+        raise StopAsyncIteration()
+
+    @property
+    def closed(self):
+        return self._response.closed
+
+    def close(self):
+        self._response.close()
+
+
+class _AsyncBatch(object):
+    """ Coroutine execution methods shared by asynchronous batches.
+    """
+
+    async def _execute(self):
+        try:
+            return await _request(self._batch, "post",
+                                  self._payload(self._body))
+        except (ClientError, ServerError) as e:
+            raise _feature_error(e, BatchError)
+
+    async def run(self):
+        """ Execute the batch on the server and discard the results.
+        """
+        (await self._execute()).close()
+
+    async def stream(self):
+        """ Execute the batch on the server and return an asynchronous
+        iterator of results.
+
+        :rtype: :py:class:`AsyncBatchResponseList`
+        """
+        return AsyncBatchResponseList(await self._execute())
+
+    async def submit(self):
+        """ Execute the batch on the server and return a list of results.
+        """
+        responses = [BatchResponse(rs)
+                     for rs in await (await self._execute()).json()]
+        path_entities = await _path_entities(_batch_data(responses))
+        return [rs._hydrate(path_entities) for rs in responses]
+
+
+class AsyncReadBatch(_AsyncBatch, ReadBatch):
+    """ A :py:class:`ReadBatch <py2neo.neo4j.ReadBatch>` executed from
+    coroutines.
+    """
+
+
+class AsyncWriteBatch(_AsyncBatch, WriteBatch):
+    """ A :py:class:`WriteBatch <py2neo.neo4j.WriteBatch>` executed from
+    coroutines.
+    """
+
+
+class AsyncTransaction(Transaction):
+    """ A Cypher transaction whose statements are sent from coroutines.
+    """
+
+    async def _post(self, resource):
+        self._assert_unfinished()
+        response = await (await _request(resource, "post",
+                                         self._body())).buffered()
+        content = response.json
+        path_entities = await _path_entities([
+            [r["rest"] for r in result["data"]]
+            for result in content.get("results", [])
+        ])
+        return self._results(response, content, path_entities)
+
+    async def execute(self):
+        """ Send all pending statements to the server for execution, leaving
+        the transaction open for further statements.
+        """
+        return await self._post(self._execute or self._begin)
+
+    async def commit(self):
+        """ Send all pending statements to the server for execution and commit
+        the transaction.
+        """
+        try:
+            return await self._post(self._commit or self._begin_commit)
+        finally:
+            self._finished = True
+
+    async def rollback(self):
+        """ Rollback the current transaction.
+        """
+        self._assert_unfinished()
+        try:
+            if self._execute:
+                (await _request(self._execute, "delete")).close()
+        finally:
+            self._finished = True
+
+
+class AsyncSession(Session):
+    """ A Cypher session creating :py:class:`AsyncTransaction` objects.
+    """
+
+    def create_transaction(self, group=False):
+        """ Create a new transaction object.
+
+        :param group: group repeated statements, see
+                      :py:class:`Transaction <py2neo.cypher.Transaction>`
+        :rtype: :py:class:`AsyncTransaction`
+        """
+        self._check_group(group)
+        return AsyncTransaction(self._transaction_uri, group=group)
+
+
+class AsyncGraphDatabaseService(object):
+    """ Asynchronous facade over a
+    :py:class:`GraphDatabaseService <py2neo.neo4j.GraphDatabaseService>`.
+
+    :param graph_db: graph database service or URI of one (optional)
+    """
+
+    def __init__(self, graph_db=None):
+        if not isinstance(graph_db, GraphDatabaseService):
+            graph_db = GraphDatabaseService.get_instance(graph_db) \
+                if graph_db else GraphDatabaseService()
+        self._graph_db = graph_db
+
+    @property
+    def graph_db(self):
+        """ The underlying blocking graph database service.
+        """
+        return self._graph_db
+
+    def query(self, query):
+        """ Create a reusable asynchronous Cypher query.
+
+        :rtype: :py:class:`AsyncCypherQuery`
+        """
+        return AsyncCypherQuery(self._graph_db, query)
+
+    async def execute(self, query, **params):
+        """ Execute a Cypher query and return the results.
+        """
+        return await self.query(query).execute(**params)
+
+    async def stream(self, query, **params):
+        """ Execute a Cypher query and return an asynchronous result
+        iterator.
+        """
+        return await self.query(query).stream(**params)
+
+    def read_batch(self):
+        """ Create a new :py:class:`AsyncReadBatch`.
+        """
+        return AsyncReadBatch(self._graph_db)
+
+    def write_batch(self):
+        """ Create a new :py:class:`AsyncWriteBatch`.
+        """
+        return AsyncWriteBatch(self._graph_db)
+
+    def create_transaction(self):
+        """ Create a new :py:class:`AsyncTransaction`.
+        """
+        return AsyncSession(self._graph_db.__uri__).create_transaction()
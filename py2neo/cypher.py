@@ -23,10 +23,32 @@ from __future__ import unicode_literals
 
 from collections import OrderedDict
 import json
+import logging
+import re
+import time
 
 from .neo4j import DEFAULT_URI, CypherQuery, CypherError, ServiceRoot, Resource, _hydrated
-from .util import deprecated, Record
-from .packages.httpstream import URI
+from .exceptions import ServerError
+from .util import deprecated, Record, RecordProducer
+from .packages.httpstream import URI, SocketError
+from .packages.httpstream.jsonencoder import JSONEncoder
+from .packages.httpstream.numbers import (BAD_GATEWAY, SERVICE_UNAVAILABLE,
+                                          GATEWAY_TIMEOUT)
+
+
+log = logging.getLogger(__name__)
+
+# string literals, which are skipped, or parameter references
+_literal_or_parameter = re.compile(r"""('(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*")"""
+                                   r"""|\{(\w+)\}""")
+# a parameter used as the property map of a node or relationship pattern
+_pattern_parameter = re.compile(r"[(\[][\w:`\s]*\{\w+\}")
+# clauses across which rows cannot be told apart once grouped
+_ungroupable = re.compile(r"\b(?:START|USING|WITH|UNION|ORDER\s+BY|SKIP|LIMIT|"
+                          r"DISTINCT|RETURN\s+\*|(?:count|sum|avg|min|max|"
+                          r"collect|stdevp?|percentile(?:Cont|Disc))\s*\()",
+                          re.IGNORECASE)
+_return = re.compile(r"\bRETURN\b", re.IGNORECASE)
 
 
 @deprecated("The cypher module is deprecated, use "
@@ -131,7 +153,7 @@ class Session(object):
             raise NotImplementedError("Cypher transactions are not supported "
                                       "by this server version")
         
-    def create_transaction(self):
+    def create_transaction(self, group=False):
         """ Create a new transaction object.
 
         ::
@@ -140,27 +162,127 @@ class Session(object):
             >>> session = cypher.Session()
             >>> tx = session.create_transaction()
 
+        :param group: group repeated statements (requires version 2.1 or
+                      above), see :py:class:`Transaction`
         :return: new transaction object
         :rtype: Transaction
         """
-        return Transaction(self._transaction_uri)
+        self._check_group(group)
+        return Transaction(self._transaction_uri, group=group)
+
+    def _check_group(self, group):
+        if group and not self._graph_db.supports_unwind:
+            raise NotImplementedError("Statement grouping requires "
+                                      "version 2.1 or above")
 
         
+def _grouped_statement(statement, keys):
+    """ Rewrite a statement to run once for each row of a list parameter,
+    returning :py:const:`None` if this cannot safely be done.
+    """
+    statement = statement.strip().rstrip(";")
+    bare = _literal_or_parameter.sub(
+        lambda m: "''" if m.group(1) else m.group(0), statement)
+    if "_i" in keys or ";" in bare or _pattern_parameter.search(bare) or \
+            _ungroupable.search(bare):
+        return None
+
+    def rewrite(match):
+        if match.group(1):
+            return match.group(1)
+        elif match.group(2) in keys:
+            return "_row.`{0}`".format(match.group(2))
+        else:
+            raise KeyError(match.group(2))
+
+    try:
+        statement = _literal_or_parameter.sub(rewrite, statement)
+    except KeyError:
+        return None
+    if _return.search(bare):
+        statement += ", _row._i AS _i"
+    return "UNWIND {_rows} AS _row " + statement
+
+
+def _grouped(statements):
+    """ Collapse runs of identical statements with the same parameter names
+    into single statements, returning the statements to send along with the
+    number of original statements each one represents (or :py:const:`None`
+    for those sent unchanged).
+    """
+    out, plan = [], []
+    i, count = 0, len(statements)
+    while i < count:
+        statement = statements[i]["statement"]
+        keys = set(statements[i]["parameters"])
+        j = i + 1
+        while j < count and statements[j]["statement"] == statement and \
+                set(statements[j]["parameters"]) == keys:
+            j += 1
+        grouped = _grouped_statement(statement, keys) if j - i > 1 else None
+        if grouped:
+            rows = []
+            for n, original in enumerate(statements[i:j]):
+                row = dict(original["parameters"])
+                row["_i"] = n
+                rows.append(row)
+            out.append(OrderedDict([
+                ("statement", grouped),
+                ("parameters", {"_rows": rows}),
+                ("resultDataContents", ["REST"]),
+            ]))
+            plan.append(j - i)
+        else:
+            out.extend(statements[i:j])
+            plan.extend([None] * (j - i))
+        i = j
+    return out, plan
+
+
+def _fanned_out(results, plan):
+    """ Split the results of grouped statements back into one result per
+    original statement.
+    """
+    out = []
+    for (columns, rows), count in zip(results, plan):
+        if count is None:
+            out.append((columns, rows))
+        else:
+            split = [[] for _ in range(count)]
+            for row in rows:
+                split[row[-1]].append(row[:-1])
+            out.extend((columns[:-1], rows) for rows in split)
+    return out
+
+
 class Transaction(object):
     """ A transaction is a transient resource that allows multiple Cypher
     statements to be executed within a single server transaction.
+
+    In grouping mode, consecutive appends of the same statement with the
+    same parameter names are sent as a single statement which unwinds a
+    list of parameter rows, and the results are split back out so that one
+    result is still returned per append. Statements are only grouped when
+    their rows remain independent, so those containing clauses such as
+    WITH, ORDER BY, LIMIT or aggregate functions, or parameters used as
+    property maps in patterns, are always sent unchanged.
+
+    :param uri: URI of the transaction endpoint
+    :param group: group repeated statements (requires version 2.1 or above)
     """
 
-    def __init__(self, uri):
+    def __init__(self, uri, group=False):
         self._begin = Resource(uri)
         self._begin_commit = Resource(uri + "/commit")
         self._execute = None
         self._commit = None
         self._clear()
         self._finished = False
+        self.group = group
 
     def _clear(self):
         self._statements = []
+        self._plan = None
 
     def _assert_unfinished(self):
         if self._finished:
@@ -191,14 +313,32 @@ class Transaction(object):
             ("resultDataContents", ["REST"]),
         ]))
 
+    def _body(self):
+        """ Build the request body for all pending statements.
+        """
+        if self.group:
+            statements, self._plan = _grouped(self._statements)
+        else:
+            statements = self._statements
+        return {"statements": statements}
+
     def _post(self, resource):
         self._assert_unfinished()
-        rs = resource._post({"statements": self._statements})
+        rs = resource._post(self._body())
+        return self._results(rs)
+
+    def _results(self, rs, content=None, path_entities=None):
+        """ Process a response from the transaction endpoint, returning the
+        results of the statements sent. The content of the response may be
+        passed if already read, along with the representations of entities
+        within any paths it holds.
+        """
         location = dict(rs.headers).get("location")
         if location:
             self._execute = Resource(location)
-        j = rs.json
+        j = rs.json if content is None else content
         rs.close()
+        plan = self._plan
         self._clear()
         if "commit" in j:
             self._commit = Resource(j["commit"])
@@ -207,13 +347,17 @@ class Transaction(object):
             if len(errors) >= 1:
                 error = errors[0]
                 raise TransactionError(error["code"], error["status"], error["message"])
-        return [
-            [
-                Record(result["columns"], _hydrated(r["rest"]))
-                for r in result["data"]
-            ]
+        results = [
+            (result["columns"], [r["rest"] for r in result["data"]])
             for result in j["results"]
         ]
+        if plan:
+            results = _fanned_out(results, plan)
+        producers = [(RecordProducer(columns), rows) for columns, rows in results]
+        return [
+            [producer.produce(row) for row in _hydrated(rows, path_entities)]
+            for producer, rows in producers
+        ]
         
     def execute(self):
         """ Send all pending statements to the server for execution, leaving
@@ -245,6 +389,216 @@ class Transaction(object):
             self._finished = True
 
 
+class BulkTransactionWriter(object):
+    """ Writes an unbounded sequence of Cypher statements through a series
+    of transactions of bounded size. Pending statements are sent to the open
+    transaction every `flush_every` statements (or `flush_bytes` bytes of
+    statement text and parameters) and the transaction is committed every
+    `commit_every` statements::
+
+        >>> from py2neo import cypher
+        >>> session = cypher.Session()
+        >>> with cypher.BulkTransactionWriter(session) as writer:
+        ...     for name in names:
+        ...         writer.write("CREATE (a {name:{N}})", {"N": name})
+
+    If a transaction fails with a transient error (a dropped connection, a
+    502, 503 or 504 response, or a transient error such as a deadlock
+    detected by the server), it is rolled back and its statements are
+    replayed within a new transaction, up to `retries` times. Note that a failure while committing cannot tell whether the
+    commit took effect, so statements should be idempotent (for example,
+    using MERGE) if duplicates are to be avoided in that case.
+
+    :param session: :py:class:`Session` from which to create transactions
+    :param flush_every: maximum number of statements per request
+    :param flush_bytes: approximate maximum size of statements per request
+    :param commit_every: maximum number of statements per transaction
+    :param retries: number of times to replay a failed transaction
+    :param retry_delay: seconds to wait before the first replay, doubling
+                        for each subsequent attempt
+    """
+
+    def __init__(self, session, flush_every=100, flush_bytes=None,
+                 commit_every=1000, retries=3, retry_delay=1.0):
+        self._session = session
+        self.flush_every = flush_every
+        self.flush_bytes = flush_bytes
+        self.commit_every = commit_every
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self._transaction = None
+        self._pending = []
+        self._pending_bytes = 0
+        self._uncommitted = []
+        self._statements = 0
+        self._requests = 0
+        self._transactions = 0
+        self._replays = 0
+        self._started = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    @property
+    def stats(self):
+        """ Dictionary of statement, request, transaction and replay counts
+        along with the elapsed time and the statement throughput.
+        """
+        elapsed = time.time() - self._started if self._started else 0.0
+        return {
+            "statements": self._statements,
+            "requests": self._requests,
+            "transactions": self._transactions,
+            "replays": self._replays,
+            "elapsed": elapsed,
+            "rate": self._statements / elapsed if elapsed else 0.0,
+        }
+
+    def write(self, statement, parameters=None):
+        """ Queue a statement for execution, sending and committing
+        statements as the configured limits are reached.
+
+        :param statement: the statement to execute
+        :param parameters: a dictionary of execution parameters
+        """
+        if self._started is None:
+            self._started = time.time()
+        parameters = dict(parameters or {})
+        self._pending.append((statement, parameters))
+        if self.flush_bytes:
+            self._pending_bytes += len(statement) + len(json.dumps(
+                parameters, cls=JSONEncoder, separators=(",", ":")))
+        if len(self._uncommitted) + len(self._pending) >= self.commit_every:
+            self.commit()
+        elif len(self._pending) >= self.flush_every or \
+                (self.flush_bytes and self._pending_bytes >= self.flush_bytes):
+            self.flush()
+
+    def write_all(self, statements):
+        """ Write every statement from an iterable of `(statement,
+        parameters)` pairs and commit the final transaction.
+
+        :return: writer statistics, as per :py:attr:`stats`
+        """
+        for statement, parameters in statements:
+            self.write(statement, parameters)
+        self.close()
+        return self.stats
+
+    def flush(self):
+        """ Send all pending statements to the open transaction.
+        """
+        if self._pending:
+            self._attempt(False)
+
+    def commit(self):
+        """ Send all pending statements and commit the open transaction.
+        """
+        if self._pending or self._transaction:
+            self._attempt(True)
+
+    def close(self):
+        """ Commit any outstanding statements.
+        """
+        self.commit()
+        log.info("Wrote {statements} statements in {transactions} "
+                 "transactions ({rate:.1f}/s)".format(**self.stats))
+
+    def abort(self):
+        """ Roll back the open transaction and discard pending statements.
+        """
+        self._pending, self._pending_bytes = [], 0
+        self._uncommitted = []
+        self._rollback()
+
+    def _rollback(self):
+        transaction, self._transaction = self._transaction, None
+        if transaction is None:
+            return
+        try:
+            if not transaction.finished:
+                transaction.rollback()
+            elif transaction._execute:
+                # a commit that failed may have left the transaction open on
+                # the server, holding its locks until it times out
+                transaction._execute._delete()
+        except Exception as error:
+            log.warning("Rollback failed ({0})".format(error))
+
+    @staticmethod
+    def _is_transient(error):
+        if isinstance(error, SocketError):
+            return True
+        if isinstance(error, ServerError):
+            return error.status_code in (BAD_GATEWAY, SERVICE_UNAVAILABLE,
+                                         GATEWAY_TIMEOUT)
+        if isinstance(error, TransactionError):
+            return "TransientError" in str(error.code)
+        return False
+
+    def _send(self, statements, commit):
+        if self._transaction is None:
+            self._transaction = self._session.create_transaction()
+        for statement, parameters in statements:
+            self._transaction.append(statement, parameters)
+        self._requests += 1
+        if commit:
+            # the transaction is kept until committed, so that it can be
+            # rolled back if the commit fails
+            self._transaction.commit()
+            self._transaction = None
+        else:
+            self._transaction.execute()
+
+    def _attempt(self, commit):
+        statements, self._pending = self._pending, []
+        self._pending_bytes = 0
+        replay = []
+        attempt = 0
+        while True:
+            try:
+                # statements already sent to a transaction that has since
+                # failed are resent first, in requests of the usual size
+                while replay:
+                    self._send(replay[:self.flush_every], False)
+                    self._uncommitted.extend(replay[:self.flush_every])
+                    replay = replay[self.flush_every:]
+                self._send(statements, commit)
+            except Exception as error:
+                if attempt >= self.retries or not self._is_transient(error):
+                    self._uncommitted = []
+                    self._rollback()
+                    raise
+                attempt += 1
+                self._replays += 1
+                delay = self.retry_delay * 2 ** (attempt - 1)
+                log.warning("Transaction failed ({0}), replaying {1} "
+                            "statements in {2}s".format(
+                                error, len(self._uncommitted) + len(replay) +
+                                len(statements), delay))
+                self._rollback()
+                replay, self._uncommitted = self._uncommitted + replay, []
+                time.sleep(delay)
+            else:
+                break
+        self._statements += len(statements)
+        if commit:
+            self._transactions += 1
+            self._uncommitted = []
+            if __debug__:
+                log.debug("Committed transaction {0} ({1} statements "
+                          "written)".format(self._transactions,
+                                            self._statements))
+        else:
+            self._uncommitted.extend(statements)
+
+
 class TransactionError(Exception):
     """ Raised when an error occurs while processing a Cypher transaction.
     """
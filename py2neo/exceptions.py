@@ -22,7 +22,7 @@ from .packages.httpstream.jsonstream import assembled
 
 
 __all__ = ["IndexTypeError", "ServerException", "ClientError", "ServerError",
-           "CypherError", "BatchError"]
+           "CypherError", "BatchError", "ParallelBatchError"]
 
 
 class IndexTypeError(TypeError):
@@ -144,3 +144,20 @@ class CypherError(_FeatureError):
 class BatchError(_FeatureError):
 
     pass
+
+
+class ParallelBatchError(Exception):
+    """ Raised when one or more partitions of a batch executed in parallel
+    fail. Results from partitions which succeeded remain available.
+    """
+
+    def __init__(self, errors, partitions, results):
+        #: Dictionary of exceptions raised, keyed by partition number
+        self.errors = errors
+        #: List of partitions, each a list of request positions
+        self.partitions = partitions
+        #: List of responses in request order, with :py:const:`None` for
+        #: requests within failed partitions
+        self.results = results
+        Exception.__init__(self, "{0} of {1} batch partitions failed".format(
+            len(errors), len(partitions)))
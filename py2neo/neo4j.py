@@ -37,21 +37,34 @@ classes provided are:
 
 from __future__ import division, unicode_literals
 
-from collections import namedtuple
+from collections import OrderedDict, deque, namedtuple
 from datetime import datetime
 import base64
+from heapq import heappop, heappush
 import json
 import logging
 import re
+from threading import Event, RLock, Thread, local
+from time import time
+from weakref import WeakKeyDictionary
+
+try:
+    from queue import Full, Queue
+except ImportError:
+    from Queue import Full, Queue
 
 from .packages.httpstream import (http,
+                                  ChunkedJSON,
                                   Resource as _Resource,
                                   ResourceTemplate as _ResourceTemplate,
                                   URITemplate,
                                   ClientError as _ClientError,
                                   ServerError as _ServerError)
-from .packages.httpstream.jsonstream import assembled, grouped
-from .packages.httpstream.numbers import CREATED, NOT_FOUND, CONFLICT
+from .packages.httpstream.jsonencoder import JSONEncoder
+from .packages.httpstream.jsonstream import (JSONEnvelopeStream, assembled,
+                                              assembled_groups)
+from .packages.httpstream.numbers import (CREATED, NOT_FOUND, CONFLICT,
+                                          NOT_MODIFIED)
 from .packages.httpstream.uri import URI, Query, percent_encode
 
 from . import __version__
@@ -81,6 +94,8 @@ _headers = {
 
 _http_rewrites = {}
 
+_json_headers = {"Content-Type": "application/json"}
+
 
 def _add_header(key, value, host_port=None):
     """ Add an HTTP header to be sent with all requests if no `host_port`
@@ -164,22 +179,56 @@ def rewrite(from_scheme_host_port, to_scheme_host_port):
         _http_rewrites[from_scheme_host_port] = to_scheme_host_port
 
 
-def _hydrated(data):
+def _hydrated(data, path_entities=None):
     """ Takes input iterable, assembles and resolves any Resource objects,
     returning the result.
+
+    The nodes and relationships of paths are returned by the server as
+    URIs only. Representations of these, keyed by URI, may be passed as
+    `path_entities`; otherwise those for all paths within the input are
+    fetched in a single batch.
     """
+    if path_entities is None:
+        path_entities = _path_entities(data)
     if isinstance(data, dict):
-        for cls in (Relationship, Node, Path):
+        for cls in (Relationship, Node):
             if has_all(data, cls.signature):
                 return cls._hydrated(data)
+        if has_all(data, Path.signature):
+            return Path._hydrated(data, path_entities)
         else:
             raise ValueError("Cannot determine object type", data)
     elif is_collection(data):
-        return type(data)([_hydrated(datum) for datum in data])
+        return type(data)([_hydrated(datum, path_entities) for datum in data])
     else:
         return data
 
 
+def _collect_path_uris(data, uris):
+    if isinstance(data, dict):
+        if "self" not in data and has_all(data, Path.signature):
+            for uri in data["nodes"]:
+                uris[uri] = None
+            for uri in data["relationships"]:
+                uris[uri] = None
+    elif is_collection(data):
+        for datum in data:
+            _collect_path_uris(datum, uris)
+
+
+def _path_entities(data):
+    """ Fetch the nodes and relationships of all paths within the input in a
+    single batch, returning their representations keyed by URI.
+    """
+    uris = OrderedDict()
+    _collect_path_uris(data, uris)
+    if not uris:
+        return {}
+    resources = [Resource(uri) for uri in uris]
+    graph_db = resources[0].graph_db
+    return dict(zip(uris, graph_db._fetch_entities(resources)))
+
+
 def _node(*args, **kwargs):
     """ Cast the arguments provided to a :py:class:`neo4j.Node`. The following
     general combinations are possible:
@@ -277,23 +326,37 @@ def _rel(*args, **kwargs):
 class Resource(object):
     """ Basic RESTful web resource with JSON metadata. Wraps an
     `httpstream.Resource`.
+
+    A plain URI string is held as it is until the resource is first used,
+    so that the many entities hydrated from a large result set do not each
+    carry a parsed URI, HTTP resource and header dictionary.
     """
 
+    __slots__ = ("_uri_string", "_http_resource", "_http_headers",
+                 "_metadata", "_subresources", "__weakref__")
+
+    _product = PRODUCT
+
     def __init__(self, uri):
+        self._metadata = None
+        self._subresources = None
+        self._http_headers = None
+        if isinstance(uri, ustr) and not _http_rewrites and "@" not in uri:
+            self._uri_string = uri
+            self._http_resource = None
+            return
         uri = URI(uri)
         scheme_host_port = (uri.scheme, uri.host, uri.port)
         if scheme_host_port in _http_rewrites:
-            scheme_host_port = _http_rewrites[scheme_host_port]
-            uri._scheme = scheme_host_port[0]
-            uri._authority._host = scheme_host_port[1]
-            uri._authority._port = scheme_host_port[2]
+            scheme, host, port = _http_rewrites[scheme_host_port]
+            authority = uri.authority
+            authority._host, authority._port = host, port
+            # reassigning the components discards the memoised string
+            uri._scheme, uri._authority = scheme, authority
         if uri.user_info:
             authenticate(uri.host_port, *uri.user_info.partition(":")[0::2])
-        self._resource = _Resource(uri)
-        self._metadata = None
-        self._subresources = {}
-        self._headers = _get_headers(self.__uri__.host_port)
-        self._product = PRODUCT
+        self._uri_string = None
+        self._http_resource = _Resource(uri)
 
     def __repr__(self):
         """ Return a valid Python representation of this object.
@@ -303,20 +366,41 @@ class Resource(object):
     def __eq__(self, other):
         """ Determine equality of two objects based on URI.
         """
+        if self._uri_string is not None and \
+                self._uri_string == getattr(other, "_uri_string", None):
+            return True
         return self._resource == other._resource
 
     def __ne__(self, other):
         """ Determine inequality of two objects based on URI.
         """
-        return self._resource != other._resource
+        return not self.__eq__(other)
+
+    @property
+    def _resource(self):
+        if self._http_resource is None:
+            self._http_resource = _Resource(self._uri_string)
+        return self._http_resource
+
+    @property
+    def _headers(self):
+        if self._http_headers is None:
+            self._http_headers = _get_headers(self.__uri__.host_port)
+        return self._http_headers
 
     @property
     def __uri__(self):
         return self._resource.__uri__
 
+    #: Shared :py:class:`MetadataCache` used for this class of resource,
+    #: if any
+    _metadata_cache = None
+
     @property
     def __metadata__(self):
-        if not self._metadata:
+        if self._metadata_cache is not None and not self.is_abstract:
+            self._metadata = self._metadata_cache.fetch(self)
+        elif not self._metadata:
             self.refresh()
         return self._metadata
 
@@ -325,6 +409,8 @@ class Resource(object):
         """ Indicates whether this entity is abstract (i.e. not bound
         to a concrete entity within the database)
         """
+        if self._http_resource is None:
+            return not self._uri_string
         return not bool(self.__uri__)
 
     @property
@@ -338,12 +424,21 @@ class Resource(object):
     def refresh(self):
         """ Refresh resource metadata.
         """
-        if not self.is_abstract:
+        if self.is_abstract:
+            pass
+        elif self._metadata_cache is not None:
+            self._metadata_cache.invalidate(self.__uri__)
+            self._metadata = self._metadata_cache.fetch(self)
+        else:
             self._metadata = ResourceMetadata(self._get().content)
 
-    def _get(self):
+    def _get(self, headers=None):
+        if headers:
+            headers = dict(self._headers, **headers)
+        else:
+            headers = self._headers
         try:
-            return self._resource.get(headers=self._headers,
+            return self._resource.get(headers=headers,
                                       product=self._product)
         except _ClientError as e:
             raise ClientError(e)
@@ -360,10 +455,14 @@ class Resource(object):
         except _ServerError as e:
             raise ServerError(e)
 
-    def _post(self, body=None):
+    def _post(self, body=None, headers=None):
+        if headers:
+            headers = dict(self._headers, **headers)
+        else:
+            headers = self._headers
         try:
             return self._resource.post(body=body,
-                                       headers=self._headers,
+                                       headers=headers,
                                        product=self._product)
         except _ClientError as e:
             raise ClientError(e)
@@ -380,6 +479,8 @@ class Resource(object):
             raise ServerError(e)
 
     def _subresource(self, key, cls=None):
+        if self._subresources is None:
+            self._subresources = {}
         if key not in self._subresources:
             try:
                 uri = URI(self.__metadata__[key])
@@ -394,6 +495,34 @@ class Resource(object):
 
 class ResourceMetadata(object):
 
+    __slots__ = ("_metadata",)
+
+    @classmethod
+    def _hydrated(cls, data):
+        """ Build metadata for an entity from the data returned by the server,
+        without copying it. URIs below the "self" URI of the entity are held
+        as suffixes in a layout shared between all entities with the same
+        keys, leaving only the remaining values to be held per entity.
+        """
+        base = data["self"]
+        derived, constant, other = [], [], []
+        for key, value in data.items():
+            if isinstance(value, ustr) and value.startswith(base):
+                derived.append((key, value[len(base):]))
+            elif value == {} and key != "data":
+                constant.append(key)
+            else:
+                other.append((key, value))
+        other.sort()
+        signature = (tuple(sorted(derived)), tuple(sorted(constant)),
+                     tuple(key for key, _ in other))
+        layout = _metadata_layouts.get(signature)
+        if layout is None:
+            layout = _MetadataLayout(*signature)
+            if len(_metadata_layouts) < _METADATA_LAYOUT_LIMIT:
+                _metadata_layouts[signature] = layout
+        return _CompactMetadata(base, layout, tuple(value for _, value in other))
+
     def __init__(self, metadata):
         self._metadata = dict(metadata)
 
@@ -407,6 +536,122 @@ class ResourceMetadata(object):
         return iter(self._metadata.items())
 
 
+class _MetadataLayout(object):
+
+    def __init__(self, derived, constant, other):
+        self.derived = dict(derived)
+        self.constant = frozenset(constant)
+        self.other = dict((key, i) for i, key in enumerate(other))
+        self.keys = frozenset(self.derived) | self.constant | frozenset(other)
+
+
+#: Layouts shared between compact metadata instances, keyed by signature;
+#: only the first few distinct layouts seen are shared
+_metadata_layouts = {}
+_METADATA_LAYOUT_LIMIT = 64
+
+
+class _CompactMetadata(ResourceMetadata):
+
+    __slots__ = ("_base", "_layout", "_values")
+
+    def __init__(self, base, layout, values):
+        self._base = base
+        self._layout = layout
+        self._values = values
+
+    def __contains__(self, key):
+        return key in self._layout.keys
+
+    def __getitem__(self, key):
+        layout = self._layout
+        if key in layout.derived:
+            return self._base + layout.derived[key]
+        elif key in layout.constant:
+            return {}
+        else:
+            return self._values[layout.other[key]]
+
+    def __iter__(self):
+        return iter([(key, self[key]) for key in self._layout.keys])
+
+
+_MetadataEntry = namedtuple("_MetadataEntry", ("metadata", "expires", "etag",
+                                               "last_modified"))
+
+
+class MetadataCache(object):
+    """ Cache of resource metadata shared between all instances of the
+    resource classes that use it, keyed by URI. Entries are reused for `ttl`
+    seconds after which they are revalidated with a conditional request,
+    using any `ETag` or `Last-Modified` validators sent by the server.
+
+    :param ttl: number of seconds for which an entry is used without
+                revalidation or :py:const:`None` to never revalidate
+    :param capacity: maximum number of entries held
+    """
+
+    def __init__(self, ttl=300, capacity=256):
+        self.ttl = ttl
+        self._entries = LRUCache(capacity)
+        self._revalidations = 0
+
+    def fetch(self, resource):
+        """ Fetch metadata for a resource, from the cache if possible.
+
+        :param resource: :py:class:`Resource` for which to fetch metadata
+        :rtype: :py:class:`ResourceMetadata`
+        """
+        uri = resource.__uri__
+        entry = self._entries.get(uri)
+        now = time()
+        if entry and (entry.expires is None or now < entry.expires):
+            return entry.metadata
+        headers = {}
+        if entry and entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry and entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+        rs = resource._get(headers)
+        etag, last_modified = rs["ETag"], rs["Last-Modified"]
+        if entry and rs.status_code == NOT_MODIFIED:
+            rs.close()
+            self._revalidations += 1
+            metadata = entry.metadata
+            # a 304 need not repeat the validators, which remain in force
+            etag = etag or entry.etag
+            last_modified = last_modified or entry.last_modified
+        else:
+            metadata = ResourceMetadata(rs.content)
+        expires = None if self.ttl is None else now + self.ttl
+        self._entries.put(uri, _MetadataEntry(metadata, expires, etag,
+                                              last_modified))
+        return metadata
+
+    def invalidate(self, uri=None):
+        """ Remove the entry for `uri` or, if no URI is given, all entries.
+
+        :param uri: URI of the resource (optional)
+        """
+        if uri is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(uri)
+
+    @property
+    def stats(self):
+        """ Dictionary of hit, miss, eviction and revalidation counts along
+        with the current size and capacity.
+        """
+        stats = self._entries.stats
+        stats["revalidations"] = self._revalidations
+        return stats
+
+
+#: Metadata cache shared by the service root and graph database resources
+metadata_cache = MetadataCache()
+
+
 class ResourceTemplate(_ResourceTemplate):
 
     def expand(self, **values):
@@ -414,8 +659,39 @@ class ResourceTemplate(_ResourceTemplate):
 
 
 class Cacheable(object):
+    """ Mixin providing a registry of instances keyed by URI. Each class
+    holds its own registry, which is bounded to the `cache_size` most
+    recently used instances.
+    """
 
-    _instances = {}
+    #: Maximum number of instances held in the registry of each class
+    cache_size = 256
+
+    _registry_lock = RLock()
+
+    @classmethod
+    def _registry(cls):
+        registry = cls.__dict__.get("_instances")
+        if registry is None:
+            with Cacheable._registry_lock:
+                registry = cls.__dict__.get("_instances")
+                if registry is None:
+                    registry = LRUCache(cls.cache_size)
+                    cls._instances = registry
+        return registry
+
+    @classmethod
+    def _registries(cls):
+        if cls is Cacheable:
+            stack, found = list(cls.__subclasses__()), []
+            while stack:
+                subclass = stack.pop()
+                stack.extend(subclass.__subclasses__())
+                if "_instances" in subclass.__dict__:
+                    found.append(subclass._instances)
+            return found
+        else:
+            return [cls._registry()]
 
     @classmethod
     def get_instance(cls, uri):
@@ -425,15 +701,43 @@ class Cacheable(object):
         :param uri: URI of the cached resource
         :return: a resource instance
         """
-        if uri not in cls._instances:
-            cls._instances[uri] = cls(uri)
-        return cls._instances[uri]
+        registry = cls._registry()
+        instance = registry.get(uri)
+        if instance is None:
+            instance = registry.setdefault(uri, cls(uri))
+        return instance
+
+    @classmethod
+    def invalidate(cls, uri=None):
+        """ Remove the cached instance for `uri` or, if no URI is given, all
+        cached instances of this class (or of every class, if called on
+        :py:class:`Cacheable` itself). This should be used when a server
+        is restarted or a resource deleted.
+
+        :param uri: URI of the cached resource (optional)
+        """
+        for registry in cls._registries():
+            if uri is None:
+                registry.clear()
+            else:
+                registry.pop(uri)
+
+    @classmethod
+    def cache_stats(cls):
+        """ Fetch hit, miss and eviction statistics for the registry of
+        this class.
+
+        :return: dictionary of statistics
+        """
+        return cls._registry().stats
 
 
 class ServiceRoot(Cacheable, Resource):
     """ Neo4j REST API service root resource.
     """
 
+    _metadata_cache = metadata_cache
+
     def __init__(self, uri=None):
         Resource.__init__(self, uri or DEFAULT_URI)
         self._load2neo = None
@@ -514,6 +818,8 @@ class GraphDatabaseService(Cacheable, Resource):
         :py:data:`DEFAULT_URI`)
     """
 
+    _metadata_cache = metadata_cache
+
     def __init__(self, uri=None):
         if uri is None:
             uri = ServiceRoot().graph_db.__uri__
@@ -525,6 +831,10 @@ class GraphDatabaseService(Cacheable, Resource):
         """
         return self.size
 
+    def _entity_uri(self, prefix, id_):
+        # the prefix is resolved against the graph database URI only once
+        return URI.interned(self.__uri__.string, prefix).string + str(id_)
+
     @property
     def _load2neo(self):
         return self.service_root.load2neo
@@ -541,7 +851,7 @@ class GraphDatabaseService(Cacheable, Resource):
         batch.append_cypher("START n=node(*) DELETE n")
         batch.run()
 
-    def create(self, *abstracts):
+    def create(self, *abstracts, **kwargs):
         """ Create multiple nodes and/or relationships as part of a single
         batch.
 
@@ -573,6 +883,11 @@ class GraphDatabaseService(Cacheable, Resource):
                 {"name": "Alice"}, (ref_node, "PERSON", 0)
             )
 
+        Large numbers of independent entities may be created over several
+        concurrent calls by passing a number of `workers`; see
+        :py:class:`ParallelBatchExecutor`. The creation is then no longer
+        atomic.
+
         :return: list of :py:class:`Node` and/or :py:class:`Relationship`
             instances
 
@@ -588,11 +903,17 @@ class GraphDatabaseService(Cacheable, Resource):
         batch = WriteBatch(self)
         for abstract in abstracts:
             batch.create(abstract)
+        workers = kwargs.get("workers")
+        if workers:
+            return ParallelBatchExecutor(workers).submit(batch)
         return batch.submit()
 
-    def delete(self, *entities):
+    def delete(self, *entities, **kwargs):
         """ Delete multiple nodes and/or relationships as part of a single
         batch.
+
+        :param workers: number of concurrent calls over which to spread the
+            deletions (optional, see :py:meth:`create`)
         """
         if not entities:
             return
@@ -600,26 +921,54 @@ class GraphDatabaseService(Cacheable, Resource):
         for entity in entities:
             if entity is not None:
                 batch.delete(entity)
-        batch.run()
+        workers = kwargs.get("workers")
+        if workers:
+            ParallelBatchExecutor(workers).run(batch)
+        else:
+            batch.run()
 
-    def find(self, label, property_key=None, property_value=None):
+    def find(self, label, property_key=None, property_value=None,
+             page_size=None, resume_from=None):
         """ Iterate through a set of labelled nodes, optionally filtering
         by property key and value
+
+        :param page_size: if given, nodes are fetched in pages of this size
+            and returned through a resumable :py:class:`PagedResults`
+            iterator; each page re-runs the query, see there for the cost
+        :param resume_from: :py:attr:`PagedResults.checkpoint` token from
+            which to resume a paged iteration
         """
+        if page_size:
+            query = "MATCH (n:`{0}`) WHERE id(n) > {{after}}".format(label)
+            params = {}
+            if property_key:
+                query += " AND n.`{0}` = {{V}}".format(property_key)
+                params["V"] = property_value
+            query += " RETURN n, id(n) ORDER BY id(n)"
+            return PagedResults(self, query, params, page_size,
+                                resume_from=resume_from)
+        elif resume_from is not None:
+            raise ValueError("Only paged iteration can be resumed")
+        return self._find(label, property_key, property_value)
+
+    def _find(self, label, property_key, property_value):
         uri = URI(self).resolve("/".join(["label", label, "nodes"]))
         if property_key:
             uri = uri.resolve("?" + Query.encode({property_key: json.dumps(property_value, ensure_ascii=False)}))
         try:
-            for i, result in grouped(Resource(uri)._get()):
-                yield _hydrated(assembled(result))
+            for i, result in assembled_groups(Resource(uri)._get()):
+                yield _hydrated(result)
         except ClientError as err:
             if err.status_code != NOT_FOUND:
                 raise
 
-    def get_properties(self, *entities):
+    def get_properties(self, *entities, **kwargs):
         """ Fetch properties for multiple nodes and/or relationships as part
         of a single batch; returns a list of dictionaries in the same order
         as the supplied entities.
+
+        :param workers: number of concurrent calls over which to spread the
+            requests (optional, see :py:meth:`create`)
         """
         if not entities:
             return []
@@ -628,12 +977,42 @@ class GraphDatabaseService(Cacheable, Resource):
         batch = BatchRequestList(self)
         for entity in entities:
             batch.append_get(batch._uri_for(entity, "properties"))
+        workers = kwargs.get("workers")
+        if workers:
+            executor = ParallelBatchExecutor(workers)
+            return [rs.body or {} for rs in executor.execute(batch)]
         responses = batch._execute()
         try:
             return [BatchResponse(rs).body or {} for rs in responses.json]
         finally:
             responses.close()
 
+    def hydrate(self, *entities):
+        """ Fetch metadata and properties for multiple nodes and/or
+        relationships as part of a single batch, filling in the entities
+        supplied. Relationship types and start and end nodes are then
+        available, as are properties within an :py:class:`IdentityMap`,
+        without further requests; abstract entities are ignored.
+
+        :return: list of the entities supplied
+        """
+        concrete = [entity for entity in entities if not entity.is_abstract]
+        for entity, data in zip(concrete, self._fetch_entities(concrete)):
+            entity._refill(data)
+        return list(entities)
+
+    def _fetch_entities(self, entities):
+        if not entities:
+            return []
+        batch = BatchRequestList(self)
+        for entity in entities:
+            batch.append_get(batch._uri_for(entity))
+        responses = batch._execute()
+        try:
+            return [BatchResponse(rs).body for rs in responses.json]
+        finally:
+            responses.close()
+
     def load_geoff(self, geoff):
         """ Load Geoff data via the load2neo extension.
 
@@ -661,7 +1040,8 @@ class GraphDatabaseService(Cacheable, Resource):
         return version_tuple(self._load2neo.__metadata__["load2neo_version"])
 
     def match(self, start_node=None, rel_type=None, end_node=None,
-              bidirectional=False, limit=None):
+              bidirectional=False, limit=None, page_size=None,
+              resume_from=None):
         """ Iterate through all relationships matching specified criteria.
 
         Examples are as follows::
@@ -694,6 +1074,11 @@ class GraphDatabaseService(Cacheable, Resource):
             # (alice)-[r:FRIEND]->()
             rels = list(graph_db.match(start_node=alice, rel_type="FRIEND", limit=3))
 
+            # all relationships, fetched a thousand at a time
+            # ()-[r]->()
+            for rel in graph_db.match(page_size=1000):
+                pass
+
         :param start_node: concrete start :py:class:`Node` to match or
             :py:const:`None` if any
         :param rel_type: type of relationships to match or :py:const:`None` if
@@ -704,6 +1089,12 @@ class GraphDatabaseService(Cacheable, Resource):
             also be included
         :param limit: maximum number of relationships to match or
             :py:const:`None` if no limit
+        :param page_size: if given, relationships are fetched in pages of
+            this size, each relationship once only, and returned through a
+            resumable :py:class:`PagedResults` iterator; each page re-runs
+            the query, see there for the cost
+        :param resume_from: :py:attr:`PagedResults.checkpoint` token from
+            which to resume a paged iteration
         :return: matching relationships
         :rtype: generator
         """
@@ -736,11 +1127,24 @@ class GraphDatabaseService(Cacheable, Resource):
         else:
             rel_clause = ":`{0}`".format(rel_type)
         if bidirectional:
-            query += " MATCH (a)-[r" + rel_clause + "]-(b) RETURN r"
+            query += " MATCH (a)-[r" + rel_clause + "]-(b)"
         else:
-            query += " MATCH (a)-[r" + rel_clause + "]->(b) RETURN r"
+            query += " MATCH (a)-[r" + rel_clause + "]->(b)"
+        if page_size:
+            # a relationship matched in both directions must not straddle
+            # two pages, so each is returned once only
+            query += (" WHERE id(r) > {after}"
+                      " RETURN DISTINCT r, id(r) ORDER BY id(r)")
+            return PagedResults(self, query, params, page_size, limit,
+                                resume_from)
+        elif resume_from is not None:
+            raise ValueError("Only paged iteration can be resumed")
+        query += " RETURN r"
         if limit is not None:
             query += " LIMIT {0}".format(int(limit))
+        return self._match(query, params)
+
+    def _match(self, query, params):
         results = CypherQuery(self, query).stream(**params)
         try:
             for result in results:
@@ -782,7 +1186,12 @@ class GraphDatabaseService(Cacheable, Resource):
     def node(self, id_):
         """ Fetch a node by ID.
         """
-        return Node(URI(self).resolve("node/" + str(id_)))
+        node = Node(self._entity_uri("node/", id_))
+        identity_map = IdentityMap.current()
+        if identity_map is None:
+            return node
+        else:
+            return identity_map.add(node)
 
     @property
     def node_labels(self):
@@ -808,7 +1217,12 @@ class GraphDatabaseService(Cacheable, Resource):
     def relationship(self, id_):
         """ Fetch a relationship by ID.
         """
-        return Relationship(URI(self).resolve("relationship/" + str(id_)))
+        rel = Relationship(self._entity_uri("relationship/", id_))
+        identity_map = IdentityMap.current()
+        if identity_map is None:
+            return rel
+        else:
+            return identity_map.add(rel)
 
     @property
     def relationship_types(self):
@@ -826,6 +1240,59 @@ class GraphDatabaseService(Cacheable, Resource):
         """
         return Schema.get_instance(URI(self).resolve("schema"))
 
+    def scan_nodes(self, partitions=16, workers=4, ordered=False,
+                   page_size=1000, progress=None):
+        """ Iterate through every node in the graph, splitting the range of
+        node IDs into equal partitions which are fetched concurrently::
+
+            def report(p):
+                print("partition {0}: {1} nodes at {2:.0f}/s".format(
+                    p.partition, p.count, p.rate))
+
+            for node in graph_db.scan_nodes(partitions=32, workers=8,
+                                            progress=report):
+                export(node)
+
+        :param partitions: number of ID ranges into which to split the scan
+        :param workers: number of ID ranges fetched concurrently
+        :param ordered: if true, nodes are returned in order of ID, otherwise
+            in whichever order they arrive
+        :param page_size: maximum number of nodes fetched per request; each
+            request scans every node, so fewer, larger pages cost less
+        :param progress: function called with a :py:class:`ScanProgress` for
+            each page received, on the iterating thread
+        :rtype: :py:class:`ScanResults`
+        """
+        return self._scan("START n=node(*)", "n", partitions, workers,
+                          ordered, page_size, progress)
+
+    def scan_relationships(self, partitions=16, workers=4, ordered=False,
+                           page_size=1000, progress=None):
+        """ Iterate through every relationship in the graph, splitting the
+        range of relationship IDs into equal partitions which are fetched
+        concurrently. Arguments are as for :py:func:`scan_nodes`.
+
+        :rtype: :py:class:`ScanResults`
+        """
+        return self._scan("START r=rel(*)", "r", partitions, workers,
+                          ordered, page_size, progress)
+
+    def _scan(self, start, name, partitions, workers, ordered, page_size,
+              progress):
+        if partitions < 1 or workers < 1:
+            raise ValueError("At least one partition and one worker are "
+                             "required")
+        highest = CypherQuery(self, "{0} RETURN max(id({1}))".format(
+            start, name)).execute_one()
+        end = 0 if highest is None else highest + 1
+        width = max(1, -(-end // partitions))
+        bounds = [(lower, min(lower + width, end))
+                  for lower in range(0, end, width)]
+        query = ("{0} WHERE id({1}) > {{after}} AND id({1}) < {{upper}} "
+                 "RETURN {1}, id({1}) ORDER BY id({1})").format(start, name)
+        return ScanResults(self, query, bounds, page_size, workers, ordered,
+                           progress)
+
     @property
     def size(self):
         """ The number of relationships in this graph.
@@ -858,6 +1325,12 @@ class GraphDatabaseService(Cacheable, Resource):
         """
         return self.neo4j_version >= (2, 0)
 
+    @property
+    def supports_unwind(self):
+        """ Indicates whether the server supports the Cypher UNWIND clause.
+        """
+        return self.neo4j_version >= (2, 1)
+
     @property
     def supports_cypher_transactions(self):
         """ Indicates whether the server supports explicit Cypher transactions.
@@ -1017,11 +1490,57 @@ class CypherQuery(object):
         >>> graph_db = neo4j.GraphDatabaseService()
         >>> query = neo4j.CypherQuery(graph_db, "CREATE (a) RETURN a")
 
+    Queries are prepared once for each graph database and query text: the
+    Cypher endpoint resource and the serialised query text are held in a
+    shared cache of at most :py:attr:`cache_size` entries, so that
+    queries built repeatedly need only serialise their parameters.
     """
 
+    #: Maximum number of prepared queries held, applied (discarding the
+    #: least recently used queries if lowered) when the cache is next used
+    cache_size = 1024
+
+    _prepared = LRUCache(cache_size)
+
+    @classmethod
+    def _cache(cls):
+        """ Return the prepared query cache, first resizing it to match
+        :py:attr:`cache_size` if that has been changed.
+        """
+        # the cache, and so its size, is shared with all subclasses
+        prepared, cache_size = CypherQuery._prepared, CypherQuery.cache_size
+        if prepared.capacity != cache_size:
+            prepared.capacity = cache_size
+        return prepared
+
+    @classmethod
+    def cache_stats(cls):
+        """ Fetch hit, miss and eviction statistics for the prepared query
+        cache.
+
+        :return: dictionary of statistics
+        """
+        return cls._cache().stats
+
+    @classmethod
+    def invalidate(cls):
+        """ Discard all prepared queries. This should be used when a server
+        is restarted or moved.
+        """
+        cls._cache().clear()
+
     def __init__(self, graph_db, query):
-        self._cypher = Resource(graph_db.__metadata__["cypher"])
-        self._query = query
+        key = (graph_db.__uri__.string, query)
+        cache = self._cache()
+        prepared = cache.get(key)
+        if prepared is None:
+            cypher = Resource(graph_db.__metadata__["cypher"])
+            # the request body up to the parameters, which are all that
+            # change from one execution to the next
+            head = '{"query":' + json.dumps(query) + ',"params":'
+            prepared = cache.setdefault(key, (cypher, head, query))
+        # queries with the same text share the same string
+        self._cypher, self._body_head, self._query = prepared
 
     def __str__(self):
         return self._query
@@ -1037,11 +1556,10 @@ class CypherQuery(object):
             cypher_log.debug("Query: " + repr(self._query))
             if params:
                 cypher_log.debug("Params: " + repr(params))
+        body = self._body_head + json.dumps(params, cls=JSONEncoder,
+                                            separators=(",", ":")) + "}"
         try:
-            return self._cypher._post({
-                "query": self._query,
-                "params": dict(params or {}),
-            })
+            return self._cypher._post(body, _json_headers)
         except ClientError as e:
             if e.exception:
                 # A CustomCypherError is a dynamically created subclass of
@@ -1096,21 +1614,20 @@ class CypherResults(object):
     signature = ("columns", "data")
 
     @classmethod
-    def _hydrated(cls, data):
+    def _hydrated(cls, data, path_entities=None):
         """ Takes assembled data...
         """
-        return [
-            Record(data["columns"], _hydrated(row))
-            for row in data["data"]
-        ]
-
-    def __init__(self, response):
-        content = response.json
-        self._columns = tuple(content["columns"])
-        self._data = [
-            Record(self._columns, _hydrated(row))
-            for row in content["data"]
-        ]
+        producer = RecordProducer(data["columns"])
+        return [producer.produce(row)
+                for row in _hydrated(data["data"], path_entities)]
+
+    def __init__(self, response, content=None, path_entities=None):
+        if content is None:
+            content = response.json
+        producer = RecordProducer(content["columns"])
+        self._columns = producer.columns
+        self._data = [producer.produce(row)
+                      for row in _hydrated(content["data"], path_entities)]
 
     def __enter__(self):
         return self
@@ -1160,23 +1677,20 @@ class IterableCypherResults(object):
 
     def __init__(self, response):
         self._response = response
-        self._redo_buffer = []
-        self._buffered = self._buffered_results()
+        self._events = iter(JSONEnvelopeStream(response.iter_chunks()))
+        self._pending = []
         self._columns = None
         self._fetch_columns()
 
     def _fetch_columns(self):
-        redo = []
-        section = []
-        for key, value in self._buffered:
-            if key and key[0] == "columns":
-                section.append((key, value))
-            else:
-                redo.append((key, value))
-                if key and key[0] == "data":
-                    break
-        self._redo_buffer.extend(redo)
-        self._columns = tuple(assembled(section)["columns"])
+        # rows received ahead of the column names are held back until
+        # iteration begins
+        for key, value in self._events:
+            if key[0] == "columns":
+                self._columns = tuple(value)
+                break
+            elif key[0] == "data":
+                self._pending.append(value)
 
     def __enter__(self):
         return self
@@ -1185,17 +1699,13 @@ class IterableCypherResults(object):
         self.close()
         return False
 
-    def _buffered_results(self):
-        for result in self._response:
-            while self._redo_buffer:
-                yield self._redo_buffer.pop(0)
-            yield result
-
     def __iter__(self):
-        for key, section in grouped(self._buffered):
+        producer = RecordProducer(self._columns or ())
+        while self._pending:
+            yield producer.produce(_hydrated(self._pending.pop(0)))
+        for key, value in self._events:
             if key[0] == "data":
-                for i, row in grouped(section):
-                    yield Record(self._columns, _hydrated(assembled(row)))
+                yield producer.produce(_hydrated(value))
 
     @property
     def columns(self):
@@ -1209,6 +1719,299 @@ class IterableCypherResults(object):
         self._response.close()
 
 
+class PagedResults(object):
+    """ Iterator over the entities returned by a Cypher query, fetched a page
+    at a time in order of ID. Each page picks up after the ID of the last
+    entity in the one before, so pages are not shifted by entities created
+    or deleted elsewhere in the meantime. The next page is fetched in the
+    background while the current one is consumed.
+
+    This is not a server-side cursor: every page runs the query afresh.
+    Servers of this generation do not use an index to satisfy the ID
+    filter and ordering, so each page costs a scan and sort of all
+    candidate entities, and a full iteration of N entities costs O(N) per
+    page rather than O(page size). Larger pages mean fewer such scans.
+
+    The :py:attr:`checkpoint` token marks the last entity returned. This can
+    be passed back as `resume_from` to the method which produced these
+    results in order to carry on from that point after an interruption::
+
+        rels = graph_db.match(rel_type="KNOWS", page_size=1000)
+        try:
+            for rel in rels:
+                process(rel)
+        except SocketError:
+            for rel in graph_db.match(rel_type="KNOWS", page_size=1000,
+                                      resume_from=rels.checkpoint):
+                process(rel)
+
+    A page which cannot be fetched raises an error from :py:func:`next`;
+    iteration may then be continued, and the page will be requested again.
+
+    :param graph_db: the database to query
+    :param query: Cypher query returning each entity together with its ID,
+        in order of ID, and only those with an ID greater than the `after`
+        parameter
+    :param params: other query parameters
+    :param page_size: maximum number of entities fetched per page
+    :param limit: maximum number of entities in total or :py:const:`None` if
+        no limit
+    :param resume_from: checkpoint token after which to start
+    """
+
+    def __init__(self, graph_db, query, params, page_size, limit=None,
+                 resume_from=None):
+        if page_size < 1:
+            raise ValueError("Page size must be at least 1")
+        self._graph_db = graph_db
+        self._query = query
+        self._params = dict(params)
+        self._page_size = page_size
+        self._remaining = limit
+        if resume_from is None:
+            self._last_id = None
+        else:
+            self._last_id = int(resume_from)
+        self._page = deque()
+        self._fetcher = None
+        self._fetched = None
+        self._error = None
+        # ID after which the next page starts, or None once all have been
+        # requested
+        self._next_after = -1 if self._last_id is None else self._last_id
+        self._prefetch()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        while not self._page:
+            if self._fetcher is None:
+                if self._next_after is None:
+                    raise StopIteration
+                self._prefetch()
+            self._receive()
+        entity, self._last_id = self._page.popleft()
+        return entity
+
+    next = __next__
+
+    @property
+    def checkpoint(self):
+        """ Token marking the last entity returned, or :py:const:`None` if
+        none has yet been returned.
+        """
+        if self._last_id is None:
+            return None
+        else:
+            return str(self._last_id)
+
+    def _page_limit(self):
+        if self._remaining is None:
+            return self._page_size
+        else:
+            return min(self._page_size, self._remaining)
+
+    def _fetch_page(self, after, size):
+        """ Fetch the raw content of a page of up to `size` results with IDs
+        greater than `after`.
+        """
+        query = CypherQuery(self._graph_db,
+                            "{0} LIMIT {1}".format(self._query, size))
+        response = query._execute(after=after, **self._params)
+        try:
+            return response.json
+        finally:
+            response.close()
+
+    def _fetch(self, after, size):
+        try:
+            self._fetched = self._fetch_page(after, size)
+        except Exception as error:
+            self._error = error
+
+    def _prefetch(self):
+        size = self._page_limit()
+        if size <= 0:
+            self._next_after = None
+            return
+        self._fetcher = Thread(target=self._fetch,
+                               args=(self._next_after, size))
+        self._fetcher.start()
+
+    def _receive(self):
+        """ Wait for the page being fetched, hydrate it on this thread and
+        start fetching the one after, if any.
+        """
+        size = self._page_limit()
+        self._fetcher.join()
+        self._fetcher = None
+        error, self._error = self._error, None
+        if error:
+            raise error
+        content, self._fetched = self._fetched, None
+        rows = content["data"]
+        if self._remaining is not None:
+            self._remaining -= len(rows)
+        if len(rows) < size:
+            self._next_after = None
+        else:
+            self._next_after = rows[-1][1]
+            self._prefetch()
+        self._page.extend((record[0], record[1])
+                          for record in CypherResults._hydrated(content))
+
+
+class ScanProgress(namedtuple("ScanProgress", ("partition", "lower", "upper",
+                                               "count", "elapsed",
+                                               "complete"))):
+    """ Progress of one partition of a :py:class:`ScanResults` scan: the
+    number of entities received from the ID range `lower` (inclusive) to
+    `upper` (exclusive), the seconds spent fetching them and whether the
+    range has been exhausted.
+    """
+
+    __slots__ = ()
+
+    @property
+    def rate(self):
+        """ Entities received per second.
+        """
+        if self.elapsed:
+            return self.count / self.elapsed
+        else:
+            return 0.0
+
+
+class ScanResults(object):
+    """ Iterator over the entities returned by a Cypher query for each of a
+    number of ID ranges. Ranges are taken in turn by a pool of worker
+    threads, each of which pages through its range in order of ID; pages
+    are handed back to be hydrated on the iterating thread, so that any
+    :py:class:`IdentityMap` in use there applies.
+
+    As for :py:class:`PagedResults`, each page runs the query afresh, at
+    the cost of a scan of all entities of the kind queried, so the total
+    work grows with both the size of the graph and the number of pages.
+
+    Iteration stops early, and the workers with it, if any page cannot be
+    fetched, in which case the error is raised.
+
+    :param graph_db: the database to query
+    :param query: Cypher query returning each entity together with its ID,
+        in order of ID, and only those with an ID greater than the `after`
+        parameter and less than the `upper` parameter
+    :param bounds: list of (lower, upper) ID ranges
+    :param page_size: maximum number of entities fetched per page
+    :param workers: number of ranges fetched concurrently
+    :param ordered: if true, entities are returned range by range, in order
+    :param progress: function called with a :py:class:`ScanProgress` for
+        each page received
+    """
+
+    #: Number of pages received but not yet consumed per worker
+    queue_depth = 2
+
+    def __init__(self, graph_db, query, bounds, page_size, workers=4,
+                 ordered=False, progress=None):
+        if page_size < 1:
+            raise ValueError("Page size must be at least 1")
+        self._graph_db = graph_db
+        self._query = query
+        self.bounds = list(bounds)
+        self._page_size = page_size
+        self._workers = workers
+        self._ordered = ordered
+        self._progress = progress
+
+    def _fetch_page(self, after, upper, size):
+        """ Fetch the raw content of a page of up to `size` results with IDs
+        greater than `after` and less than `upper`.
+        """
+        query = CypherQuery(self._graph_db,
+                            "{0} LIMIT {1}".format(self._query, size))
+        response = query._execute(after=after, upper=upper)
+        try:
+            return response.json
+        finally:
+            response.close()
+
+    def _work(self, pending, queues, stopped):
+        def put(queue, item):
+            while not stopped.is_set():
+                try:
+                    queue.put(item, timeout=0.1)
+                except Full:
+                    pass
+                else:
+                    return True
+            return False
+
+        while not stopped.is_set():
+            try:
+                k, (lower, upper) = pending.popleft()
+            except IndexError:
+                return
+            t0 = time()
+            after = lower - 1
+            try:
+                while True:
+                    content = self._fetch_page(after, upper, self._page_size)
+                    rows = content["data"]
+                    complete = len(rows) < self._page_size
+                    if rows:
+                        after = rows[-1][1]
+                    if not put(queues[k], (k, content, complete,
+                                           time() - t0, None)):
+                        return
+                    if complete:
+                        break
+            except Exception as error:
+                cypher_log.error("Scan partition {0} failed: {1}".format(
+                    k, error))
+                put(queues[k], (k, None, True, time() - t0, error))
+                return
+
+    def __iter__(self):
+        count = len(self.bounds)
+        if not count:
+            return
+        pending = deque(enumerate(self.bounds))
+        if self._ordered:
+            queues = [Queue(self.queue_depth) for _ in range(count)]
+        else:
+            queues = [Queue(self.queue_depth * self._workers)] * count
+        stopped = Event()
+        threads = [Thread(target=self._work, args=(pending, queues, stopped))
+                   for _ in range(min(self._workers, count))]
+        for thread in threads:
+            thread.start()
+        counts = [0] * count
+        try:
+            # in order, the next partition to consume; otherwise, the
+            # number of partitions complete
+            current = 0
+            while current < count:
+                k, content, complete, elapsed, error = queues[current].get()
+                if error is not None:
+                    raise error
+                counts[k] += len(content["data"])
+                lower, upper = self.bounds[k]
+                if complete:
+                    current += 1
+                    cypher_log.info("Scanned partition {0} in {1:.3f}s: {2} "
+                                   "entities".format(k, elapsed, counts[k]))
+                if self._progress:
+                    self._progress(ScanProgress(k, lower, upper, counts[k],
+                                                elapsed, complete))
+                for record in CypherResults._hydrated(content):
+                    yield record[0]
+        finally:
+            stopped.set()
+            for thread in threads:
+                thread.join()
+
+
 class Schema(Cacheable, Resource):
 
     def __init__(self, *args, **kwargs):
@@ -1289,9 +2092,12 @@ class _Entity(Resource):
     standard Python container handler methods.
     """
 
+    __slots__ = ("_properties", "_identity_map")
+
     def __init__(self, uri):
         Resource.__init__(self, uri)
         self._properties = {}
+        self._identity_map = None
 
     def __contains__(self, key):
         return key in self.get_properties()
@@ -1334,6 +2140,8 @@ class _Entity(Resource):
         """ Delete this entity from the database.
         """
         self._delete()
+        if self._identity_map is not None:
+            self._identity_map._discard(self)
 
     @property
     def exists(self):
@@ -1349,13 +2157,28 @@ class _Entity(Resource):
         else:
             return True
 
+    def _refill(self, data):
+        """ Replace metadata and properties with those from a fresh
+        representation of this entity.
+        """
+        if self._identity_map is not None:
+            self._identity_map._hydrated(self.__class__, data)
+        else:
+            self._metadata = ResourceMetadata._hydrated(data)
+            self._properties = data.get("data", {})
+
     def get_properties(self):
         """ Fetch all properties.
 
         :return: dictionary of properties
         """
-        if not self.is_abstract:
+        identity_map = self._identity_map
+        if self.is_abstract:
+            pass
+        elif identity_map is None or not identity_map._has_properties(self):
             self._properties = assembled(self._properties_resource._get()) or {}
+            if identity_map is not None:
+                identity_map._loaded_properties(self)
         return self._properties
 
     def set_properties(self, properties):
@@ -1364,7 +2187,11 @@ class _Entity(Resource):
         :param properties: dictionary of new properties
         """
         self._properties = dict(properties)
-        if not self.is_abstract:
+        if self.is_abstract:
+            pass
+        elif self._identity_map is not None:
+            self._identity_map._replace(self)
+        else:
             if self._properties:
                 self._properties_resource._put(compact(self._properties))
             else:
@@ -1414,12 +2241,17 @@ class Node(_Entity):
     :param uri: URI identifying this node
     """
 
+    __slots__ = ()
+
     signature = ("self",)
 
     @classmethod
     def _hydrated(cls, data):
+        identity_map = IdentityMap.current()
+        if identity_map is not None:
+            return identity_map._hydrated(cls, data)
         obj = cls(data["self"])
-        obj._metadata = ResourceMetadata(data)
+        obj._metadata = ResourceMetadata._hydrated(data)
         obj._properties = data.get("data", {})
         return obj
 
@@ -1658,6 +2490,8 @@ class Node(_Entity):
         if self.is_abstract:
             self._properties.update(properties)
             self._properties = compact(self._properties)
+        elif self._identity_map is not None:
+            self._identity_map._update(self, properties)
         else:
             query, params = ["START a=node({A})"], {"A": self._id}
             for i, (key, value) in enumerate(properties.items()):
@@ -1725,12 +2559,17 @@ class Relationship(_Entity):
     :param uri: URI identifying this relationship
     """
 
+    __slots__ = ("_start_node", "_type", "_end_node")
+
     signature = ("self", "type")
 
     @classmethod
     def _hydrated(cls, data):
+        identity_map = IdentityMap.current()
+        if identity_map is not None:
+            return identity_map._hydrated(cls, data)
         obj = cls(data["self"])
-        obj._metadata = ResourceMetadata(data)
+        obj._metadata = ResourceMetadata._hydrated(data)
         obj._properties = data.get("data", {})
         return obj
 
@@ -1848,6 +2687,8 @@ class Relationship(_Entity):
         if self.is_abstract:
             self._properties.update(properties)
             self._properties = compact(self._properties)
+        elif self._identity_map is not None:
+            self._identity_map._update(self, properties)
         else:
             query, params = ["START a=rel({A})"], {"A": self._id}
             for i, (key, value) in enumerate(properties.items()):
@@ -1929,9 +2770,23 @@ class Path(object):
     signature = ("length", "nodes", "relationships", "start", "end")
 
     @classmethod
-    def _hydrated(cls, data):
-        nodes = map(Node, data["nodes"])
-        rels = map(Relationship, data["relationships"])
+    def _hydrated(cls, data, entities=None):
+        if entities is None:
+            entities = _path_entities(data)
+        nodes = []
+        for uri in data["nodes"]:
+            if uri in entities:
+                nodes.append(Node._hydrated(entities[uri]))
+            else:
+                nodes.append(Node(uri))
+        rels = []
+        for uri in data["relationships"]:
+            if uri in entities:
+                rel = entities[uri]
+                rels.append(_UnboundRelationship(rel["type"],
+                                                 **(rel.get("data") or {})))
+            else:
+                rels.append(Relationship(uri))
         return Path(*round_robin(nodes, rels))
 
     def __init__(self, node, *rels_and_nodes):
@@ -2219,8 +3074,8 @@ class Index(Cacheable, Resource):
         ..
         """
         return [
-            _hydrated(assembled(result))
-            for i, result in grouped(self._searcher.expand(key=key, value=value)._get())
+            _hydrated(result)
+            for i, result in assembled_groups(self._searcher.expand(key=key, value=value)._get())
         ]
 
     def create(self, key, value, abstract):
@@ -2308,6 +3163,63 @@ class Index(Cacheable, Resource):
         else:
             return None
 
+    def get_many(self, pairs, chunk_size=1000):
+        """ Fetch the entities associated with each of a number of
+        `key`:`value` pairs, sending the lookups in batches of at most
+        `chunk_size` requests rather than one request per pair::
+
+            # obtain a reference to the "People" node index and
+            # look up several people at once
+            people = graph_db.get_or_create_index(neo4j.Node, "People")
+            found = people.get_many([("email", "alice@example.com"),
+                                     ("email", "bob@example.com")])
+            alices = found["email", "alice@example.com"]
+
+        :param pairs: iterable of `key`:`value` pairs
+        :param chunk_size: maximum number of lookups sent in each batch
+        :return: dictionary of entity lists keyed by `key`:`value` pair
+        """
+        pairs = list(OrderedDict.fromkeys(tuple(pair) for pair in pairs))
+        graph_db = self.service_root.graph_db
+        results = {}
+        for start in range(0, len(pairs), chunk_size):
+            chunk = pairs[start:start + chunk_size]
+            batch = ReadBatch(graph_db)
+            for key, value in chunk:
+                searcher = self._searcher.expand(key=key, value=value)
+                batch.append_get(batch._uri_for(searcher))
+            for pair, entities in zip(chunk, batch.submit()):
+                results[pair] = entities or []
+        return results
+
+    def get_or_create_many(self, entries, chunk_size=1000):
+        """ Fetch or create a uniquely indexed entity for each of a number of
+        `key`:`value` pairs, as for :py:meth:`get_or_create`, sending the
+        requests in batches of at most `chunk_size` requests::
+
+            contacts = graph_db.get_or_create_index(neo4j.Node, "Contacts")
+            found = contacts.get_or_create_many([
+                ("email", "alice@example.com", {"name": "Alice"}),
+                ("email", "bob@example.com", {"name": "Bob"}),
+            ])
+            alice = found["email", "alice@example.com"]
+
+        Where the same pair appears more than once, the first abstract
+        supplied is used.
+
+        :param entries: iterable of (`key`, `value`, `abstract`) triples
+        :param chunk_size: maximum number of requests sent in each batch
+        :return: dictionary of entities keyed by `key`:`value` pair
+        """
+        abstracts = OrderedDict()
+        for key, value, abstract in entries:
+            abstracts.setdefault((key, value), abstract)
+        batch = WriteBatch(self.service_root.graph_db, max_requests=chunk_size)
+        for (key, value), abstract in abstracts.items():
+            batch.get_or_create_in_index(self._content_type, self, key, value,
+                                         abstract)
+        return dict(zip(abstracts, batch.submit()))
+
     def remove(self, key=None, value=None, entity=None):
         """ Remove any entries from the index which match the parameters
         supplied. The allowed parameter combinations are:
@@ -2362,13 +3274,12 @@ class Index(Cacheable, Resource):
         should be Apache Lucene query syntax.
         """
         resource = self._query_template.expand(query=query)
-        for i, result in grouped(resource._get()):
-            yield _hydrated(assembled(result))
+        for i, result in assembled_groups(resource._get()):
+            yield _hydrated(result)
 
     def _query_with_score(self, query, order):
         resource = self._query_template.expand(query=query, order=order)
-        for i, result in grouped(resource._get()):
-            meta = assembled(result)
+        for i, meta in assembled_groups(resource._get()):
             yield _hydrated(meta), meta["score"]
 
     def query_by_index(self, query):
@@ -2381,6 +3292,186 @@ class Index(Cacheable, Resource):
         return self._query_with_score(query, "score")
 
 
+_identity_maps = local()
+
+
+class IdentityMap(object):
+    """ Session-scoped map holding a single :py:class:`Node` or
+    :py:class:`Relationship` object for each entity URI. While the map is
+    in use as a context manager, entities hydrated from server responses on
+    the current thread (as well as those fetched by ID from the graph
+    database) are drawn from the map. The properties of these entities are
+    cached so that repeated reads do not each need a request, and property
+    changes are held locally until :py:meth:`flush` is called or the block
+    exits, at which point they are sent in a single batch::
+
+        >>> with neo4j.IdentityMap(graph_db) as identity_map:
+        ...     alice = graph_db.node(1)
+        ...     alice["age"] = alice["age"] + 1  # a single GET, no PUT
+        ...     assert graph_db.node(1) is alice
+        ... # changes are written here
+
+    :param graph_db: the graph database to which changes are written
+    """
+
+    @classmethod
+    def current(cls):
+        """ The innermost identity map in use on the current thread, if any.
+        """
+        stack = getattr(_identity_maps, "stack", None)
+        if stack:
+            return stack[-1]
+        else:
+            return None
+
+    def __init__(self, graph_db):
+        self._graph_db = graph_db
+        self._entities = {}
+        self._loaded = set()
+        self._updates = {}
+        self._replaced = set()
+
+    def __enter__(self):
+        try:
+            _identity_maps.stack.append(self)
+        except AttributeError:
+            _identity_maps.stack = [self]
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        try:
+            if exc_type is None:
+                self.flush()
+        finally:
+            _identity_maps.stack.remove(self)
+            self.clear()
+
+    def __len__(self):
+        return len(self._entities)
+
+    def __contains__(self, entity):
+        return ustr(entity.__uri__) in self._entities
+
+    @property
+    def dirty(self):
+        """ List of entities with property changes not yet written.
+        """
+        keys = set(self._updates) | self._replaced
+        return [self._entities[key] for key in keys]
+
+    def add(self, entity):
+        """ Add an entity to this map, returning the entity already held for
+        the same URI if there is one.
+
+        :param entity: concrete node or relationship
+        :return: the entity held by this map
+        """
+        key = ustr(entity.__uri__)
+        held = self._entities.get(key)
+        if held is None:
+            self._entities[key] = held = entity
+            entity._identity_map = self
+        return held
+
+    def _hydrated(self, cls, data):
+        entity = self._entities.get(data["self"]) or self.add(cls(data["self"]))
+        entity._metadata = ResourceMetadata._hydrated(data)
+        key = ustr(entity.__uri__)
+        if "data" in data and key not in self._replaced:
+            entity._properties = dict(data["data"])
+            self._loaded_properties(entity)
+        return entity
+
+    def _has_properties(self, entity):
+        return ustr(entity.__uri__) in self._loaded
+
+    def _loaded_properties(self, entity):
+        # reapply any changes not yet written on top of those loaded
+        key = ustr(entity.__uri__)
+        if key in self._updates:
+            entity._properties.update(self._updates[key])
+            entity._properties = compact(entity._properties)
+        self._loaded.add(key)
+
+    def _update(self, entity, properties):
+        key = ustr(entity.__uri__)
+        if key not in self._replaced:
+            self._updates.setdefault(key, {}).update(properties)
+        if key in self._loaded:
+            entity._properties.update(properties)
+            entity._properties = compact(entity._properties)
+
+    def _replace(self, entity):
+        key = ustr(entity.__uri__)
+        self._updates.pop(key, None)
+        self._replaced.add(key)
+        self._loaded.add(key)
+
+    def _discard(self, entity):
+        key = ustr(entity.__uri__)
+        self._entities.pop(key, None)
+        self._loaded.discard(key)
+        self._updates.pop(key, None)
+        self._replaced.discard(key)
+        entity._identity_map = None
+
+    def flush(self):
+        """ Write all property changes held by this map in a single batch.
+        """
+        if not self._updates and not self._replaced:
+            return
+        batch = WriteBatch(self._graph_db)
+        for key in set(self._updates) | self._replaced:
+            entity = self._entities[key]
+            if key in self._loaded:
+                batch.set_properties(entity, entity._properties)
+            else:
+                for name, value in self._updates[key].items():
+                    batch.set_property(entity, name, value)
+        batch.run()
+        self._updates.clear()
+        self._replaced.clear()
+
+    def refresh(self, *entities):
+        """ Reload properties for the entities specified (or for all entities
+        with cached properties) in a single batch, discarding any changes
+        not yet written.
+        """
+        if not entities:
+            entities = [self._entities[key] for key in self._loaded]
+        for entity in entities:
+            key = ustr(entity.__uri__)
+            self._loaded.discard(key)
+            self._updates.pop(key, None)
+            self._replaced.discard(key)
+        for entity, properties in zip(entities,
+                                      self._graph_db.get_properties(*entities)):
+            entity._properties = properties
+            self._loaded.add(ustr(entity.__uri__))
+
+    def invalidate(self, *entities):
+        """ Discard the cached properties of the entities specified (or of
+        all entities) so that they are fetched again when next read. Changes
+        not yet written are kept and reapplied when properties are fetched.
+        """
+        if entities:
+            keys = set(ustr(entity.__uri__) for entity in entities)
+        else:
+            keys = set(self._loaded)
+        self._loaded -= keys - self._replaced
+
+    def clear(self):
+        """ Remove all entities from this map, discarding any changes not yet
+        written.
+        """
+        for entity in self._entities.values():
+            entity._identity_map = None
+        self._entities.clear()
+        self._loaded.clear()
+        self._updates.clear()
+        self._replaced.clear()
+
+
 def _cast(obj, cls=(Node, Relationship), abstract=None):
     if obj is None:
         return None
@@ -2447,9 +3538,12 @@ class BatchResponse(object):
 
     @property
     def hydrated(self):
+        return self._hydrate()
+
+    def _hydrate(self, path_entities=None):
         body = self.body
         if isinstance(body, dict) and has_all(body, CypherResults.signature):
-            records = CypherResults._hydrated(body)
+            records = CypherResults._hydrated(body, path_entities)
             if len(records) == 0:
                 return None
             elif len(records) == 1:
@@ -2460,11 +3554,15 @@ class BatchResponse(object):
             else:
                 return records
         else:
-            return _hydrated(body)
+            return _hydrated(body, path_entities)
 
 
 class BatchRequestList(object):
 
+    #: Number of requests above which a batch is streamed to the server
+    #: as it is serialised, rather than being sent as a single document.
+    stream_threshold = 1000
+
     def __init__(self, graph_db):
         self._graph_db = graph_db
         self._batch = graph_db._subresource("batch")
@@ -2556,14 +3654,23 @@ class BatchRequestList(object):
         return uri
 
     def _execute(self):
-        request_count = len(self)
+        return self._send(self._body)
+
+    def _payload(self, body):
+        if len(body) > self.stream_threshold:
+            return ChunkedJSON(body)
+        else:
+            return body
+
+    def _send(self, body):
+        request_count = len(body)
         request_text = "request" if request_count == 1 else "requests"
         batch_log.info("Executing batch with {0} {1}".format(request_count, request_text))
         if __debug__:
-            for id_, request in enumerate(self._requests):
-                batch_log.debug(">>> {{{0}}} {1} {2} {3}".format(id_, request.method, request.uri, request.body))
+            for request in body:
+                batch_log.debug(">>> {{{0}}} {1} {2} {3}".format(request["id"], request["method"], request["to"], request["body"]))
         try:
-            response = self._batch._post(self._body)
+            response = self._batch._post(self._payload(body))
         except (ClientError, ServerError) as e:
             if e.exception:
                 # A CustomBatchError is a dynamically created subclass of
@@ -2623,8 +3730,8 @@ class BatchResponseList(object):
         self._response = response
 
     def __iter__(self):
-        for i, result in grouped(self._response):
-            yield BatchResponse(assembled(result)).hydrated
+        for i, result in assembled_groups(self._response):
+            yield BatchResponse(result).hydrated
         self.close()
 
     @property
@@ -2657,18 +3764,243 @@ class ReadBatch(BatchRequestList):
         return self.append_get(self._uri_for(searcher))
 
 
+class _BatchReference(ustr):
+    """ A URI string referring to the result of an earlier request within a
+    batch, as produced by :py:meth:`WriteBatch._uri_for` for chunked batches.
+    """
+
+    def __new__(cls, value, position):
+        inst = ustr.__new__(cls, value)
+        inst.position = position
+        return inst
+
+
+def _resolved(value, offset, locations):
+    """ Rewrite batch references within a request URI or body for a chunk
+    starting at position `offset`. References to requests in the same chunk
+    are renumbered; references to requests in earlier chunks are replaced by
+    the locations returned for those requests.
+    """
+    if isinstance(value, _BatchReference):
+        tail = value[len("{{{0}}}".format(value.position)):]
+        if value.position >= offset:
+            return "{{{0}}}".format(value.position - offset) + tail
+        try:
+            return locations[value.position] + tail
+        except KeyError:
+            raise ValueError("Cannot resolve reference to request {0} in an "
+                             "earlier chunk".format(value.position))
+    elif isinstance(value, dict):
+        return dict((key, _resolved(item, offset, locations))
+                    for key, item in value.items())
+    elif isinstance(value, list):
+        return [_resolved(item, offset, locations) for item in value]
+    else:
+        return value
+
+
 class WriteBatch(BatchRequestList):
     """ Generic batch execution facility for data write requests. Most methods
     return a :py:class:`BatchRequest <py2neo.neo4j.BatchRequest>` object that
     can be used as a reference in other methods. See the
     :py:meth:`create <py2neo.neo4j.WriteBatch.create>` method for an example
     of this.
+
+    Very large batches may be split into chunks by specifying `max_requests`
+    and/or `max_bytes`. Each chunk is sent in a background thread as soon as
+    it is full while the next chunk is built, so that only two chunks are
+    ever held in memory. References to requests in earlier chunks are
+    resolved to the locations returned for those requests; such requests
+    must be referred to by request object rather than by position::
+
+        batch = WriteBatch(graph_db, max_requests=1000, keep_results=False)
+        for i in range(1000000):
+            batch.create(node(number=i))
+        batch.run()
+
+    .. note ::
+        Each chunk is executed within its own server transaction, so a chunked
+        batch is only atomic per chunk. If a chunk fails, no further chunks are
+        sent and the error is raised from the next call to the batch.
+
+    :param graph_db: the graph database against which to execute requests
+    :param max_requests: maximum number of requests per chunk
+    :param max_bytes: approximate maximum size of each chunk, in bytes
+    :param keep_results: whether to keep the results of chunks already sent
+        so that they can be returned from :py:meth:`submit`
     """
 
-    def __init__(self, graph_db):
+    def __init__(self, graph_db, max_requests=None, max_bytes=None,
+                 keep_results=True):
+        self.max_requests = max_requests
+        self.max_bytes = max_bytes
+        self.keep_results = keep_results
+        self._flusher = None
+        self._error = None
         BatchRequestList.__init__(self, graph_db)
         self.__new_uniqueness_modes = None
 
+    @property
+    def chunked(self):
+        """ Indicates whether or not this batch is split into chunks.
+        """
+        return bool(self.max_requests or self.max_bytes)
+
+    def clear(self):
+        """ Clear all requests from this batch, waiting for any chunk already
+        sent to complete.
+        """
+        self._join()
+        BatchRequestList.clear(self)
+        self._offset = 0
+        self._size = 0
+        self._positions = WeakKeyDictionary()
+        self._locations = WeakKeyDictionary()
+        self._external = {}
+        self._results = []
+        self._error = None
+
+    def append(self, request):
+        if not self.chunked:
+            return BatchRequestList.append(self, request)
+        if self.max_bytes:
+            size = len(json.dumps(request.body, cls=JSONEncoder,
+                                  separators=(",", ":"))) + \
+                len(request.uri) + 48
+            if self._requests and self._size + size > self.max_bytes:
+                requests, external = self._requests, self._external
+                offset = self._offset
+                self.flush()
+                # the references of this request were made for the chunk
+                # just sent, so must now be made external to the next one
+                for position in _batch_references([request.uri,
+                                                   request.body]):
+                    if position >= offset:
+                        self._external[position] = requests[position - offset]
+                    elif position in external:
+                        self._external[position] = external[position]
+            self._size += size
+        self._positions[request] = self._offset + len(self._requests)
+        BatchRequestList.append(self, request)
+        if self.max_requests and len(self._requests) >= self.max_requests:
+            self.flush()
+        return request
+
+    def find(self, request):
+        """ Find the position of a request within this batch.
+        """
+        if not self.chunked:
+            return BatchRequestList.find(self, request)
+        try:
+            return self._positions[request]
+        except KeyError:
+            raise ValueError("Request not found")
+
+    def _uri_for(self, resource, *segments, **kwargs):
+        if not (self.chunked and isinstance(resource, (int, BatchRequest))):
+            return BatchRequestList._uri_for(self, resource, *segments,
+                                             **kwargs)
+        if isinstance(resource, int):
+            position = resource
+            if position < self._offset:
+                raise ValueError("Request {0} has been sent in an earlier "
+                                 "chunk so can only be referred to by its "
+                                 "request object".format(position))
+        else:
+            position = self.find(resource)
+            if position < self._offset:
+                # keep the request alive until its location is needed
+                self._external[position] = resource
+        uri = BatchRequestList._uri_for(self, position, *segments, **kwargs)
+        return _BatchReference(uri, position)
+
+    def _join(self):
+        """ Wait for the chunk in progress, if any, to complete and raise any
+        error that occurred while executing it.
+        """
+        if self._flusher:
+            self._flusher.join()
+            self._flusher = None
+        error, self._error = self._error, None
+        if error:
+            raise error
+
+    def flush(self):
+        """ Send all pending requests as a chunk, without waiting for the
+        results. Chunks are executed one at a time and in order.
+        """
+        self._join()
+        requests, external = self._requests, self._external
+        offset, self._offset = self._offset, self._offset + len(requests)
+        self._requests, self._external, self._size = [], {}, 0
+        self._flusher = Thread(target=self._execute_chunk,
+                               args=(requests, external, offset))
+        self._flusher.start()
+
+    def _execute_chunk(self, requests, external, offset):
+        try:
+            graph_uri = str(self._graph_db.__uri__)
+            absolute, relative = {}, {}
+            for position, request in external.items():
+                location = self._locations.get(request)
+                if location:
+                    absolute[position] = str(location)
+                    relative[position] = str(location)[len(graph_uri):]
+            body = [
+                {
+                    "id": i,
+                    "method": request.method,
+                    "to": _resolved(request.uri, offset, relative),
+                    "body": _resolved(request.body, offset, absolute),
+                }
+                for i, request in enumerate(requests)
+            ]
+            response = self._send(body)
+            try:
+                for (i,), result in assembled_groups(response):
+                    rs = BatchResponse(result)
+                    if rs.location:
+                        self._locations[requests[i]] = rs.location
+                    if self.keep_results:
+                        self._results.append(rs.hydrated)
+            finally:
+                response.close()
+        except Exception as error:
+            self._error = error
+
+    def _finish(self):
+        if self._requests:
+            self.flush()
+        self._join()
+        results, self._results = self._results, []
+        return results
+
+    def run(self):
+        """ Execute the batch on the server and discard the results. If the
+        batch results are not required, this will generally be the fastest
+        execution method.
+        """
+        if not self.chunked:
+            return BatchRequestList.run(self)
+        self._finish()
+
+    def stream(self):
+        """ Execute the batch on the server and return iterable results. For a
+        chunked batch, the results of all chunks are collected first.
+        """
+        if not self.chunked:
+            return BatchRequestList.stream(self)
+        return iter(self._finish())
+
+    def submit(self):
+        """ Execute the batch on the server and return a list of results. For
+        a chunked batch, this includes results from chunks already sent unless
+        `keep_results` is disabled.
+        """
+        if not self.chunked:
+            return BatchRequestList.submit(self)
+        return self._finish()
+
     @property
     def supports_index_uniqueness_modes(self):
         return self._graph_db.supports_index_uniqueness_modes
@@ -3133,3 +4465,167 @@ class WriteBatch(BatchRequestList):
                                       relationship)
 
     ### END OF DEPRECATED METHODS ###
+
+
+_batch_reference = re.compile(r"^\{(\d+)\}")
+
+
+def _batch_references(value):
+    """ Yield the positions of all requests referred to within a batch
+    request URI or body.
+    """
+    if isinstance(value, (str, ustr)):
+        match = _batch_reference.match(value)
+        if match:
+            yield int(match.group(1))
+    elif isinstance(value, dict):
+        for item in value.values():
+            for position in _batch_references(item):
+                yield position
+    elif isinstance(value, list):
+        for item in value:
+            for position in _batch_references(item):
+                yield position
+
+
+def _renumbered(value, positions):
+    """ Rewrite the batch references within a request URI or body according
+    to a dictionary of old to new positions.
+    """
+    if isinstance(value, (str, ustr)):
+        return _batch_reference.sub(
+            lambda match: "{{{0}}}".format(positions[int(match.group(1))]),
+            value)
+    elif isinstance(value, dict):
+        return dict((key, _renumbered(item, positions))
+                    for key, item in value.items())
+    elif isinstance(value, list):
+        return [_renumbered(item, positions) for item in value]
+    else:
+        return value
+
+
+class ParallelBatchExecutor(object):
+    """ Executes the requests within a batch over several concurrent HTTP
+    calls. Requests which refer to one another (directly or indirectly) are
+    always sent together; otherwise, requests are spread across partitions of
+    roughly equal size which are executed in parallel by a pool of worker
+    threads. Results are returned in the order of the original requests::
+
+        batch = WriteBatch(graph_db)
+        for properties in people:
+            batch.create(properties)
+        executor = ParallelBatchExecutor(workers=8, max_requests=1000)
+        nodes = executor.submit(batch)
+
+    .. note ::
+        Each partition is executed within its own server transaction, so the
+        batch as a whole is not atomic. If any partitions fail, a
+        :py:class:`ParallelBatchError` is raised once all partitions have
+        completed, carrying the errors and the results of the remainder.
+
+    :param workers: number of partitions executed concurrently
+    :param max_requests: approximate maximum number of requests per partition
+    """
+
+    def __init__(self, workers=4, max_requests=None):
+        self.workers = workers
+        self.max_requests = max_requests
+
+    def partition(self, body):
+        """ Split a list of batch request entries into partitions with no
+        references between them, returning lists of request positions.
+        """
+        count = len(body)
+        parents = list(range(count))
+
+        def root(i):
+            while parents[i] != i:
+                parents[i] = parents[parents[i]]
+                i = parents[i]
+            return i
+
+        for i, request in enumerate(body):
+            for j in _batch_references([request["to"], request["body"]]):
+                if j < count:
+                    parents[root(i)] = root(j)
+        components = {}
+        for i in range(count):
+            components.setdefault(root(i), []).append(i)
+        partition_count = self.workers
+        if self.max_requests:
+            partition_count = max(partition_count,
+                                  -(-count // self.max_requests))
+        partition_count = min(partition_count, len(components))
+        # greedily place the largest components into the smallest partitions
+        loads = [(0, k) for k in range(partition_count)]
+        partitions = [[] for _ in range(partition_count)]
+        for component in sorted(components.values(), key=len, reverse=True):
+            load, k = heappop(loads)
+            partitions[k].extend(component)
+            heappush(loads, (load + len(component), k))
+        return [sorted(p) for p in partitions if p]
+
+    def _execute_partition(self, batch, body, positions):
+        local = dict((position, i) for i, position in enumerate(positions))
+        partition_body = [
+            {
+                "id": i,
+                "method": body[position]["method"],
+                "to": _renumbered(body[position]["to"], local),
+                "body": _renumbered(body[position]["body"], local),
+            }
+            for i, position in enumerate(positions)
+        ]
+        response = batch._send(partition_body)
+        try:
+            return [(positions[result["id"]], BatchResponse(result))
+                    for result in response.json]
+        finally:
+            response.close()
+
+    def execute(self, batch):
+        """ Execute all requests within a batch, returning a list of
+        :py:class:`BatchResponse` objects in request order.
+        """
+        body = batch._body
+        partitions = self.partition(body)
+        queue = deque(enumerate(partitions))
+        responses = [None] * len(body)
+        errors = {}
+
+        def work():
+            while True:
+                try:
+                    k, positions = queue.popleft()
+                except IndexError:
+                    return
+                try:
+                    for position, rs in self._execute_partition(batch, body,
+                                                                positions):
+                        responses[position] = rs
+                except Exception as error:
+                    batch_log.error("Batch partition {0} failed: {1}".format(
+                        k, error))
+                    errors[k] = error
+
+        threads = [Thread(target=work)
+                   for _ in range(min(self.workers, len(partitions)))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        if errors:
+            raise ParallelBatchError(errors, partitions, responses)
+        return responses
+
+    def run(self, batch):
+        """ Execute all requests within a batch and discard the results.
+        """
+        self.execute(batch)
+
+    def submit(self, batch):
+        """ Execute all requests within a batch and return a list of results
+        in request order.
+        """
+        return [rs.hydrated for rs in self.execute(batch)]
@@ -254,10 +254,14 @@ class Store(object):
             if not key.startswith("_"):
                 setattr(subj, key, value)
         subj.__rel__ = {}
-        for rel in subj.__node__.match():
-            if rel.type not in subj.__rel__:
-                subj.__rel__[rel.type] = []
-            subj.__rel__[rel.type].append((rel.get_properties(), rel.end_node))
+        # within an identity map, the properties returned with each matched
+        # relationship are used rather than fetched again one by one
+        with neo4j.IdentityMap(self.graph_db):
+            for rel in subj.__node__.match():
+                if rel.type not in subj.__rel__:
+                    subj.__rel__[rel.type] = []
+                subj.__rel__[rel.type].append((rel.get_properties(),
+                                               rel.end_node))
 
     def save(self, subj, node=None):
         """ Save an object to a database node.
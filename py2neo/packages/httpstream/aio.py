@@ -0,0 +1,549 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright 2013, Nigel Small
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+""" Asyncio HTTP/1.1 transport for HTTPStream.
+
+This module requires Python 3.5 or above and is therefore not imported by the
+package itself. Requests are described with the usual :py:class:`Request`
+objects; responses are :py:class:`AsyncResponse` objects which carry the same
+status and header properties as :py:class:`Response` but whose content is
+read with coroutines. Error responses are read in full and raised as the
+regular :py:class:`ClientError` and :py:class:`ServerError` exceptions.
+"""
+
+
+import asyncio
+from base64 import b64encode
+import codecs
+from io import BytesIO
+from socket import gaierror, herror
+from weakref import WeakKeyDictionary
+
+from .http import (NetworkAddressError, SocketError, RedirectionError,
+                   ChunkedJSON, Request, Response, Redirection, ClientError, ServerError,
+                   default_chunk_size, log, redirects, request_encodings)
+from .numbers import *
+from .uri import URI
+
+
+__all__ = ["AsyncConnectionPool", "AsyncResponse", "AsyncResource",
+           "submit_request"]
+
+
+class _ResponseHead(object):
+    """ Status line and headers of a response, providing the parts of the
+    `http.client.HTTPResponse` interface used by :py:class:`Response`.
+    """
+
+    def __init__(self, status, reason, headers):
+        self.status = status
+        self.reason = reason
+        self._headers = headers
+        self._index = {}
+        for key, value in headers:
+            key = key.lower()
+            if key in self._index:
+                self._index[key] += ", " + value
+            else:
+                self._index[key] = value
+
+    def getheader(self, name, default=None):
+        return self._index.get(name.lower(), default)
+
+    def getheaders(self):
+        return list(self._headers)
+
+    def read(self, size=None):
+        return b""
+
+
+class _BufferedBody(_ResponseHead):
+    """ A response head together with content held in memory.
+    """
+
+    def __init__(self, head, data):
+        _ResponseHead.__init__(self, head.status, head.reason, head._headers)
+        self._data = BytesIO(data)
+
+    def read(self, size=None):
+        if size is None:
+            return self._data.read()
+        else:
+            return self._data.read(size)
+
+
+class AsyncConnection(object):
+    """ A single HTTP/1.1 connection to a network location.
+    """
+
+    def __init__(self, scheme, host_port):
+        self.scheme = scheme
+        self.host_port = host_port
+        self.reader = None
+        self.writer = None
+
+    def __repr__(self):
+        return "<AsyncConnection {0}://{1}>".format(self.scheme,
+                                                    self.host_port)
+
+    @property
+    def connected(self):
+        return self.writer is not None
+
+    async def connect(self):
+        host, _, port = self.host_port.rpartition(":")
+        try:
+            self.reader, self.writer = await asyncio.open_connection(
+                host, int(port), ssl=(self.scheme == "https"))
+        except (gaierror, herror) as err:
+            raise NetworkAddressError(err.args[1], host_port=self.host_port)
+        except OSError as err:
+            raise SocketError(err.errno, host_port=self.host_port)
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+        self.reader, self.writer = None, None
+
+
+class AsyncConnectionPool(object):
+    """ Idle connections kept for reuse, held separately for each event loop
+    since asyncio streams cannot be shared between loops.
+    """
+
+    #: Maximum number of idle connections kept per network location
+    max_idle = 8
+
+    _pools = WeakKeyDictionary()
+
+    @classmethod
+    def _idle(cls, scheme, host_port):
+        loop = asyncio.get_event_loop()
+        try:
+            pool = cls._pools[loop]
+        except KeyError:
+            pool = cls._pools[loop] = {}
+        return pool.setdefault((scheme, host_port), [])
+
+    @classmethod
+    def acquire(cls, scheme, host_port):
+        """ Return an idle connection if one is available and still open,
+        otherwise a new, unconnected, connection.
+        """
+        idle = cls._idle(scheme, host_port)
+        while idle:
+            connection = idle.pop()
+            if connection.reader.at_eof():
+                connection.close()
+            else:
+                return connection
+        return AsyncConnection(scheme, host_port)
+
+    @classmethod
+    def release(cls, connection):
+        idle = cls._idle(connection.scheme, connection.host_port)
+        if connection.connected and len(idle) < cls.max_idle:
+            idle.append(connection)
+        else:
+            connection.close()
+
+    @classmethod
+    def discard(cls, connection):
+        connection.close()
+
+
+def _host_port(uri):
+    host_port = uri.host_port
+    if ":" not in host_port:
+        if uri.scheme == "https":
+            host_port += ":" + str(HTTPS_PORT)
+        else:
+            host_port += ":" + str(HTTP_PORT)
+    return host_port
+
+
+async def _read_head(reader):
+    """ Read a status line and headers, skipping any interim responses.
+    """
+    while True:
+        line = await reader.readline()
+        if not line:
+            raise ConnectionResetError("peer closed connection")
+        version, _, rest = line.decode("ISO-8859-1").strip().partition(" ")
+        status, _, reason = rest.partition(" ")
+        status = int(status)
+        headers = []
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            key, _, value = line.decode("ISO-8859-1").partition(":")
+            headers.append((key.strip(), value.strip()))
+        if status // 100 != 1:
+            return version, _ResponseHead(status, reason, headers)
+
+
+class _Body(object):
+    """ Incremental reader for response content delimited by length, by
+    chunked transfer coding or by closure of the connection. The connection
+    is returned to the pool once the content has been read in full.
+    """
+
+    def __init__(self, connection, version, head, method):
+        self._connection = connection
+        self._reader = connection.reader
+        self._keep_alive = version == "HTTP/1.1"
+        connection_header = (head.getheader("Connection") or "").lower()
+        if connection_header == "close":
+            self._keep_alive = False
+        elif connection_header == "keep-alive":
+            self._keep_alive = True
+        self._chunked = False
+        self._remaining = None
+        if (method == "HEAD" or head.status in (NO_CONTENT, NOT_MODIFIED) or
+                head.status // 100 == 1):
+            self._remaining = 0
+        elif "chunked" in (head.getheader("Transfer-Encoding") or "").lower():
+            self._chunked = True
+            self._remaining = 0
+        elif head.getheader("Content-Length") is not None:
+            self._remaining = int(head.getheader("Content-Length"))
+        else:
+            self._keep_alive = False
+        self.complete = False
+        if self._remaining == 0 and not self._chunked:
+            self._finish()
+
+    def _finish(self):
+        self.complete = True
+        if self._keep_alive:
+            AsyncConnectionPool.release(self._connection)
+        else:
+            AsyncConnectionPool.discard(self._connection)
+
+    def abandon(self):
+        """ Close the connection without reading any further content.
+        """
+        if not self.complete:
+            self.complete = True
+            AsyncConnectionPool.discard(self._connection)
+
+    async def _next_chunk(self):
+        line = await self._reader.readline()
+        size = int(line.split(b";")[0].strip() or b"0", 16)
+        if size == 0:
+            # discard trailers
+            while True:
+                line = await self._reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+        return size
+
+    async def read(self, size=None):
+        """ Read up to `size` bytes of content, or all remaining content if no
+        size is given. An empty result indicates the end of the content.
+        """
+        if self.complete:
+            return b""
+        if size is None:
+            data = []
+            while True:
+                chunk = await self.read(default_chunk_size * 16)
+                if not chunk:
+                    return b"".join(data)
+                data.append(chunk)
+        reader = self._reader
+        if self._chunked:
+            if self._remaining == 0:
+                self._remaining = await self._next_chunk()
+                if self._remaining == 0:
+                    self._finish()
+                    return b""
+            data = await reader.read(min(size, self._remaining))
+            if not data:
+                raise asyncio.IncompleteReadError(data, self._remaining)
+            self._remaining -= len(data)
+            if self._remaining == 0:
+                await reader.readexactly(2)
+            return data
+        elif self._remaining is None:
+            data = await reader.read(size)
+            if not data:
+                self._finish()
+            return data
+        else:
+            data = await reader.read(min(size, self._remaining))
+            if not data:
+                raise asyncio.IncompleteReadError(data, self._remaining)
+            self._remaining -= len(data)
+            if self._remaining == 0:
+                self._finish()
+            return data
+
+
+class AsyncResponse(Response):
+    """ Response whose content is consumed through coroutines. Status and
+    header properties behave exactly as for :py:class:`Response`.
+    """
+
+    def __init__(self, body, uri, request, head, **kwargs):
+        Response.__init__(self, body, uri, request, head, **kwargs)
+
+    @property
+    def closed(self):
+        return self._http.complete
+
+    def close(self):
+        """ Close the response. If content remains unread, the underlying
+        connection cannot be reused and is closed too.
+        """
+        self._http.abandon()
+
+    async def _read(self, size=None):
+        decoder = self._decoder
+        if decoder is None:
+            return await self._http.read(size)
+        while decoder.wants(size):
+            decoder.feed(await self._http.read(size))
+        return decoder.take(size)
+
+    async def read(self, size=None):
+        """ Fetch some or all of the response content, returning as a
+        bytearray. Content compressed with a supported content coding is
+        decoded.
+        """
+        return bytearray(await self._read(size))
+
+    async def buffered(self):
+        """ Fetch all content and return an equivalent :py:class:`Response`
+        holding that content in memory, for use with code built around
+        blocking responses.
+        """
+        data = await self._http.read()
+        return Response(None, self._uri, self._request,
+                        _BufferedBody(self._response, data),
+                        reason=self._reason, chunk_size=self.chunk_size)
+
+    async def json(self):
+        """ Fetch all content, decoding from JSON and returning the decoded
+        value.
+        """
+        return (await self.buffered()).json
+
+    async def text(self):
+        """ Fetch all content as a string.
+        """
+        return (await self.buffered()).text
+
+    async def content(self):
+        """ Fetch all content, returning a value appropriate for the content
+        type.
+        """
+        return (await self.buffered()).content
+
+    async def iter_chunks(self, chunk_size=None):
+        """ Iterate through the content as chunks of text. If no chunk size is
+        specified, chunks grow as for :py:meth:`Response.iter_chunks`.
+        """
+        if chunk_size:
+            size = limit = chunk_size
+        else:
+            size = self.chunk_size
+            limit = max(size, self.max_chunk_size)
+        decoder = codecs.getincrementaldecoder(self.encoding)()
+        try:
+            while True:
+                data = await self._read(size)
+                text = decoder.decode(data, not data)
+                if text:
+                    yield text
+                if not data:
+                    break
+                if len(data) >= size and size < limit:
+                    size = min(2 * size, limit)
+        finally:
+            self.close()
+
+
+async def _send(connection, method, uri, body, headers):
+    if not connection.connected:
+        await connection.connect()
+    lines = ["{0} {1} HTTP/1.1".format(method, uri.absolute_path_reference)]
+    for key, value in headers.items():
+        lines.append("{0}: {1}".format(key, value))
+    lines.append("")
+    lines.append("")
+    connection.writer.write("\r\n".join(lines).encode("ISO-8859-1"))
+    if isinstance(body, ChunkedJSON):
+        for data in body:
+            if data:
+                connection.writer.write("{0:X}\r\n".format(len(data))
+                                        .encode("ASCII") + data + b"\r\n")
+                await connection.writer.drain()
+        connection.writer.write(b"0\r\n\r\n")
+    elif body:
+        connection.writer.write(body)
+    await connection.writer.drain()
+    return await _read_head(connection.reader)
+
+
+async def submit(method, uri, body, headers):
+    """ Submit one HTTP request, returning the connection used along with the
+    HTTP version and head of the response.
+    """
+    uri = URI(uri)
+    headers["Host"] = uri.host_port
+    if uri.user_info:
+        credentials = uri.user_info.encode("UTF-8")
+        value = "Basic " + b64encode(credentials).decode("ASCII")
+        headers["Authorization"] = value
+    if isinstance(body, ChunkedJSON):
+        headers["Transfer-Encoding"] = "chunked"
+    else:
+        if body is not None and not isinstance(body, bytes):
+            body = body.encode("UTF-8")
+        headers["Content-Length"] = len(body) if body else 0
+    if uri.scheme not in ("http", "https"):
+        raise ValueError("Unsupported URI scheme " + repr(uri.scheme))
+    connection = AsyncConnectionPool.acquire(uri.scheme, _host_port(uri))
+    reused = connection.connected
+    if isinstance(body, ChunkedJSON):
+        log.info(">>> {0} {1} [chunked]".format(method, uri))
+    elif body:
+        log.info(">>> {0} {1} [{2}]".format(method, uri, len(body)))
+    else:
+        log.info(">>> {0} {1}".format(method, uri))
+    try:
+        try:
+            version, head = await _send(connection, method, uri, body,
+                                        headers)
+        except (ConnectionError, asyncio.IncompleteReadError) as err:
+            if not reused:
+                raise
+            # an idle connection may have been closed by the server
+            # between requests, so try once more on a fresh one
+            log.warn("<~> Reconnecting ({0})".format(err))
+            connection.close()
+            version, head = await _send(connection, method, uri, body,
+                                        headers)
+    except OSError as err:
+        AsyncConnectionPool.discard(connection)
+        if isinstance(err, (NetworkAddressError, SocketError)):
+            raise
+        raise SocketError(err.errno or 0, host_port=uri.host_port)
+    except BaseException:
+        AsyncConnectionPool.discard(connection)
+        raise
+    return _Body(connection, version, head, method), head
+
+
+async def submit_request(request, redirect_limit=0, product=None,
+                         **response_kwargs):
+    """ Submit a :py:class:`Request` and return an :py:class:`AsyncResponse`
+    object. Redirect and error handling mirrors :py:meth:`Request.submit`.
+    """
+    uri = URI(request.uri)
+    compress = True
+    while True:
+        body, headers, compressed = request._prepared(uri, product, compress)
+        http, head = await submit(request.method, uri, body, headers)
+        status_class = head.status // 100
+        if compressed and head.status == UNSUPPORTED_MEDIA_TYPE:
+            # the server has refused the compressed body after all, so send
+            # it again as it is
+            await http.read()
+            request_encodings.get((uri.scheme, uri.host_port),
+                                  set()).discard("gzip")
+            compress = False
+            continue
+        # a 304 response carries no redirection, only an empty body
+        if status_class == 3 and head.status != NOT_MODIFIED:
+            data = await http.read()
+            redirection = Redirection(None, uri, request,
+                                      _BufferedBody(head, data),
+                                      **response_kwargs)
+            if redirect_limit:
+                redirect_limit -= 1
+                location = URI.resolve(uri, head.getheader("Location"))
+                if location == uri:
+                    raise RedirectionError("Circular redirection")
+                if head.status in (MOVED_PERMANENTLY, PERMANENT_REDIRECT):
+                    redirects[uri] = location
+                uri = location
+            else:
+                return redirection
+        elif status_class in (4, 5):
+            data = await http.read()
+            error_class = ClientError if status_class == 4 else ServerError
+            raise error_class(None, uri, request, _BufferedBody(head, data),
+                              **response_kwargs)
+        else:
+            return AsyncResponse(http, uri, request, head, **response_kwargs)
+
+
+class AsyncResource(object):
+    """ A web resource identified by a URI, with coroutine methods.
+    """
+
+    def __init__(self, uri):
+        self._uri = URI(uri)
+
+    def __repr__(self):
+        return "{0}({1})".format(self.__class__.__name__,
+                                 repr(self._uri.string))
+
+    @property
+    def __uri__(self):
+        return self._uri
+
+    @property
+    def uri(self):
+        """ The URI of this resource.
+        """
+        return self._uri
+
+    async def get(self, headers=None, redirect_limit=5, **kwargs):
+        """ Issue a ``GET`` request to this resource.
+        """
+        rq = Request("GET", self._uri, None, headers)
+        return await submit_request(rq, redirect_limit=redirect_limit,
+                                    **kwargs)
+
+    async def put(self, body=None, headers=None, **kwargs):
+        """ Issue a ``PUT`` request to this resource.
+        """
+        rq = Request("PUT", self._uri, body, headers)
+        return await submit_request(rq, **kwargs)
+
+    async def post(self, body=None, headers=None, **kwargs):
+        """ Issue a ``POST`` request to this resource.
+        """
+        rq = Request("POST", self._uri, body, headers)
+        return await submit_request(rq, **kwargs)
+
+    async def delete(self, headers=None, **kwargs):
+        """ Issue a ``DELETE`` request to this resource.
+        """
+        rq = Request("DELETE", self._uri, None, headers)
+        return await submit_request(rq, **kwargs)
+
+    async def head(self, headers=None, redirect_limit=5, **kwargs):
+        """ Issue a ``HEAD`` request to this resource.
+        """
+        rq = Request("HEAD", self._uri, None, headers)
+        return await submit_request(rq, redirect_limit=redirect_limit,
+                                    **kwargs)
@@ -19,21 +19,25 @@
 from __future__ import unicode_literals
 
 from base64 import b64encode
+import codecs
 import errno
 try:
     from http.client import (BadStatusLine, CannotSendRequest, HTTPConnection,
-                             HTTPSConnection, HTTPException, ResponseNotReady,
-                             responses)
+                             HTTPSConnection, HTTPException, HTTPResponse,
+                             ResponseNotReady, responses)
 except ImportError:
     from httplib import (BadStatusLine, CannotSendRequest, HTTPConnection,
-                         HTTPSConnection, HTTPException, ResponseNotReady,
-                         responses)
+                         HTTPSConnection, HTTPException, HTTPResponse,
+                         ResponseNotReady, responses)
 import json
 import logging
 import os
+from select import select
 from socket import error, gaierror, herror, timeout
-from threading import local
+from threading import Condition, Lock
 import sys
+from time import time
+import zlib
 
 from . import __version__
 from .jsonencoder import JSONEncoder
@@ -42,12 +46,28 @@ from .numbers import *
 from .uri import URI, URITemplate
 
 
-__all__ = ["NetworkAddressError", "SocketError", "RedirectionError", "Request",
+__all__ = ["NetworkAddressError", "SocketError", "PoolExhausted",
+           "RedirectionError", "ChunkedJSON", "Request",
            "Response", "Redirection", "ClientError", "ServerError", "Resource",
-           "ResourceTemplate", "get", "put", "post", "delete", "head"]
+           "ResourceTemplate", "get", "put", "post", "delete", "head",
+           "pipeline"]
 
 default_encoding = "ISO-8859-1"
 default_chunk_size = 4096
+default_max_chunk_size = 65536
+
+#: Content codings advertised through the `Accept-Encoding` header of each
+#: request and decoded transparently when used for a response
+#: (:py:const:`None` to advertise nothing)
+accept_encoding = "gzip, deflate"
+
+#: Minimum size in bytes of a request body sent gzip-compressed to a server
+#: which has advertised support for this (:py:const:`None` to never compress)
+compression_threshold = 65536
+
+# Content codings accepted in requests by each network location, as
+# advertised through the `Accept-Encoding` header of its responses
+request_encodings = {}
 
 log = logging.getLogger(__name__)
 
@@ -124,10 +144,38 @@ class RedirectionError(Loggable, HTTPException):
         Loggable.__init__(self, self.__class__, args[0])
 
 
-class ConnectionPuddle(local):
+class PoolExhausted(Loggable, IOError):
+    """ Raised when no connection can be acquired from a
+    :py:class:`ConnectionPuddle` within the permitted limits.
+    """
+
+    def __init__(self, message, host_port=None):
+        self._host_port = host_port
+        IOError.__init__(self, message)
+        Loggable.__init__(self, self.__class__, message)
+
+    @property
+    def host_port(self):
+        return self._host_port
+
+
+class ConnectionPuddle(object):
     """ A collection of HTTP/HTTPS connections to a single network location
-    (i.e. host:port). Connections may be acquired and will be created if
-    necessary; after use, these must be released.
+    (i.e. host:port), shared between threads. Connections may be acquired and
+    will be created if necessary; after use, these must be released.
+
+    :param max_size: maximum number of connections (active and idle) that may
+        exist at any one time, or :py:const:`None` for no limit
+    :param max_idle: maximum number of idle connections kept for reuse
+    :param idle_timeout: number of seconds after which an idle connection is
+        discarded rather than reused, or :py:const:`None` for no limit
+    :param block: whether to wait for a connection to be released when the
+        puddle is exhausted, rather than raising :py:class:`PoolExhausted`
+    :param timeout: maximum number of seconds to wait when blocking, or
+        :py:const:`None` to wait indefinitely
+    :param pipeline_depth: maximum number of requests written back-to-back
+        on one connection by :py:func:`pipeline`, or :py:const:`None` to
+        send each request only once the previous response has been read
     """
 
     _http_classes = {
@@ -135,12 +183,27 @@ class ConnectionPuddle(local):
         "https": HTTPSConnection,
     }
 
-    def __init__(self, scheme, host_port):
-        local.__init__(self)
+    def __init__(self, scheme, host_port, max_size=None, max_idle=8,
+                 idle_timeout=None, block=True, timeout=None,
+                 pipeline_depth=None):
         self._scheme = scheme
         self._host_port = host_port
         self._active = []
         self._passive = []
+        self._condition = Condition(Lock())
+        self.max_size = max_size
+        self.max_idle = max_idle
+        self.idle_timeout = idle_timeout
+        self.block = block
+        self.timeout = timeout
+        self.pipeline_depth = pipeline_depth
+        #: Number of acquisitions satisfied by an open idle connection
+        self.hits = 0
+        #: Number of acquisitions which required a new connection
+        self.misses = 0
+        #: Number of connections closed by the puddle, either because too
+        #: many were idle or because they were found to be stale
+        self.evictions = 0
 
     @property
     def host_port(self):
@@ -160,31 +223,177 @@ class ConnectionPuddle(local):
     def __len__(self):
         return len(self._active) + len(self._passive)
 
+    @property
+    def stats(self):
+        """ Dictionary of usage counters for this puddle.
+        """
+        with self._condition:
+            return {
+                "active": len(self._active),
+                "idle": len(self._passive),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    def _is_stale(self, connection, released):
+        """ Check whether an idle connection has expired or has been closed
+        or otherwise disturbed by the peer while sitting in the puddle. An
+        open socket with nothing to read is the only usable state.
+        """
+        if self.idle_timeout is not None:
+            if time() - released > self.idle_timeout:
+                return True
+        try:
+            readable, _, _ = select([connection.sock], [], [], 0)
+        except (ValueError, error):
+            return True
+        return bool(readable)
+
+    def _evict(self, connection):
+        self.evictions += 1
+        connection.close()
+
     def acquire(self):
-        if self._passive:
-            connection = self._passive.pop()
-        else:
-            connection = self._http_classes[self.scheme](self.host_port)
-        self._active.append(connection)
-        return connection
+        """ Acquire a connection, reusing an idle one if possible.
+        """
+        deadline = None
+        with self._condition:
+            while True:
+                while self._passive:
+                    connection, released = self._passive.pop()
+                    if connection.sock is None:
+                        # closed after its last response; reconnect as new
+                        self.misses += 1
+                    elif self._is_stale(connection, released):
+                        self._evict(connection)
+                        continue
+                    else:
+                        self.hits += 1
+                    self._active.append(connection)
+                    return connection
+                if self.max_size is None or len(self._active) < self.max_size:
+                    self.misses += 1
+                    connection = self._http_classes[self.scheme](self.host_port)
+                    self._active.append(connection)
+                    return connection
+                if not self.block:
+                    raise PoolExhausted("No connections available",
+                                        host_port=self.host_port)
+                if self.timeout is None:
+                    self._condition.wait()
+                else:
+                    if deadline is None:
+                        deadline = time() + self.timeout
+                    remaining = deadline - time()
+                    if remaining <= 0:
+                        raise PoolExhausted("Timed out waiting for a "
+                                            "connection",
+                                            host_port=self.host_port)
+                    self._condition.wait(remaining)
 
     def release(self, connection):
-        try:
-            self._active.remove(connection)
-        except ValueError:
-            pass
-        if len(self._passive) < 2:
-            self._passive.append(connection)
-        else:
+        """ Return a connection to the puddle for reuse.
+        """
+        with self._condition:
+            try:
+                self._active.remove(connection)
+            except ValueError:
+                pass
+            if len(self._passive) < self.max_idle:
+                self._passive.append((connection, time()))
+            else:
+                self._evict(connection)
+            self._condition.notify()
+
+    def discard(self, connection):
+        """ Close a connection which is no longer usable and free its slot.
+        """
+        with self._condition:
+            try:
+                self._active.remove(connection)
+            except ValueError:
+                pass
             connection.close()
+            self._condition.notify()
+
+    def clear(self):
+        """ Close all idle connections.
+        """
+        with self._condition:
+            while self._passive:
+                connection, _ = self._passive.pop()
+                connection.close()
 
 
 class ConnectionPool(object):
     """ A collection of :py:class:`ConnectionPuddle` objects for various
-    network locations.
+    network locations. The class attributes below provide the settings for
+    each puddle and may be changed through :py:meth:`configure`.
     """
 
+    #: Maximum number of connections per network location (:py:const:`None`
+    #: for no limit)
+    max_size = None
+
+    #: Maximum number of idle connections kept per network location
+    max_idle = 8
+
+    #: Seconds after which an idle connection is no longer reused
+    #: (:py:const:`None` for no limit)
+    idle_timeout = None
+
+    #: Whether to wait for a connection when the limit is reached, rather
+    #: than raising :py:class:`PoolExhausted`
+    block = True
+
+    #: Maximum seconds to wait for a connection (:py:const:`None` for no
+    #: limit)
+    timeout = None
+
+    #: Maximum number of requests written back-to-back on one connection by
+    #: :py:func:`pipeline` (:py:const:`None` to disable pipelining)
+    pipeline_depth = None
+
+    _settings = ("max_size", "max_idle", "idle_timeout", "block", "timeout",
+                 "pipeline_depth")
     _puddles = {}
+    _lock = Lock()
+
+    @classmethod
+    def configure(cls, **settings):
+        """ Change pool settings, applying them to all existing puddles as
+        well as those created in future.
+        """
+        for key, value in settings.items():
+            if key not in cls._settings:
+                raise TypeError("Unknown pool setting " + repr(key))
+        with cls._lock:
+            for key, value in settings.items():
+                setattr(cls, key, value)
+            for puddle in cls._puddles.values():
+                with puddle._condition:
+                    for key, value in settings.items():
+                        setattr(puddle, key, value)
+                    puddle._condition.notify_all()
+
+    @classmethod
+    def stats(cls):
+        """ Return a dictionary of usage counters for each network location,
+        keyed by (scheme, host_port).
+        """
+        with cls._lock:
+            puddles = dict(cls._puddles)
+        return dict((key, puddle.stats) for key, puddle in puddles.items())
+
+    @classmethod
+    def clear(cls):
+        """ Close all idle connections.
+        """
+        with cls._lock:
+            puddles = list(cls._puddles.values())
+        for puddle in puddles:
+            puddle.clear()
 
     @classmethod
     def _get_puddle(cls, scheme, host_port):
@@ -196,17 +405,19 @@ class ConnectionPool(object):
             key = (scheme, host_port + ":" + str(HTTP_PORT))
         else:
             raise ValueError("Unknown scheme " + repr(scheme))
-        if key not in cls._puddles:
-            cls._puddles[key] = ConnectionPuddle(scheme, host_port)
-        return cls._puddles[key]
-
-    @classmethod
-    def acquire(cls, scheme, host_port):
-        puddle = cls._get_puddle(scheme, host_port)
-        return puddle.acquire()
+        try:
+            return cls._puddles[key]
+        except KeyError:
+            with cls._lock:
+                if key not in cls._puddles:
+                    settings = dict((name, getattr(cls, name))
+                                    for name in cls._settings)
+                    cls._puddles[key] = ConnectionPuddle(scheme, host_port,
+                                                         **settings)
+                return cls._puddles[key]
 
     @classmethod
-    def release(cls, connection):
+    def _puddle_for(cls, connection):
         if isinstance(connection, HTTPSConnection):
             schema = "https"
         elif isinstance(connection, HTTPConnection):
@@ -214,20 +425,56 @@ class ConnectionPool(object):
         else:
             raise TypeError("Unknown connection type " +
                             repr(connection.__class__))
-        puddle = cls._get_puddle(schema, "{0}:{1}".format(
+        return cls._get_puddle(schema, "{0}:{1}".format(
             connection.host, connection.port))
-        puddle.release(connection)
 
+    @classmethod
+    def acquire(cls, scheme, host_port):
+        puddle = cls._get_puddle(scheme, host_port)
+        return puddle.acquire()
 
-def submit(method, uri, body, headers):
-    """ Submit one HTTP request.
+    @classmethod
+    def release(cls, connection):
+        cls._puddle_for(connection).release(connection)
+
+    @classmethod
+    def discard(cls, connection):
+        cls._puddle_for(connection).discard(connection)
+
+
+def _send_chunked(http, method, path, body, headers):
+    """ Send a request with a body iterated piece by piece using chunked
+    transfer encoding.
+    """
+    http.putrequest(method, path, skip_host="Host" in headers,
+                    skip_accept_encoding="Accept-Encoding" in headers)
+    for key, value in headers.items():
+        http.putheader(key, value)
+    http.putheader("Transfer-Encoding", "chunked")
+    http.endheaders()
+    for data in body:
+        if data:
+            http.send("{0:X}\r\n".format(len(data)).encode("ASCII") +
+                      data + b"\r\n")
+    http.send(b"0\r\n\r\n")
+
+
+def _add_address_headers(uri, headers):
+    """ Add the `Host` header and, if the URI carries credentials, the
+    `Authorization` header required for a request to the URI given.
     """
-    uri = URI(uri)
     headers["Host"] = uri.host_port
     if uri.user_info:
         credentials = uri.user_info.encode("UTF-8")
         value = "Basic " + b64encode(credentials).decode("ASCII")
         headers["Authorization"] = value
+
+
+def submit(method, uri, body, headers):
+    """ Submit one HTTP request.
+    """
+    uri = URI(uri)
+    _add_address_headers(uri, headers)
     try:
         http = ConnectionPool.acquire(uri.scheme, uri.host_port)
     except KeyError:
@@ -240,6 +487,8 @@ def submit(method, uri, body, headers):
             http.connect()
         if method in ("GET", "DELETE") and not body:
             log.info(">>> {0} {1}".format(method, uri))
+        elif isinstance(body, ChunkedJSON):
+            log.info(">>> {0} {1} [chunked]".format(method, uri))
         elif body:
             log.info(">>> {0} {1} [{2}]".format(method, uri, len(body)))
         else:
@@ -247,7 +496,11 @@ def submit(method, uri, body, headers):
         if __debug__:
             for key, value in headers.items():
                 log.debug(">>> {0}: {1}".format(key, value))
-        http.request(method, uri.absolute_path_reference, body, headers)
+        if isinstance(body, ChunkedJSON):
+            _send_chunked(http, method, uri.absolute_path_reference, body,
+                          headers)
+        else:
+            http.request(method, uri.absolute_path_reference, body, headers)
         return http.getresponse()
 
     try:
@@ -272,8 +525,10 @@ def submit(method, uri, body, headers):
             else:
                 raise
     except (gaierror, herror) as err:
+        ConnectionPool.discard(http)
         raise NetworkAddressError(err.args[1], host_port=uri.host_port)
     except error as err:
+        ConnectionPool.discard(http)
         if isinstance(err.args[0], tuple):
             code = err.args[0][0]
         else:
@@ -287,10 +542,176 @@ def submit(method, uri, body, headers):
                                       host_port=uri.host_port)
         else:
             raise SocketError(code, host_port=uri.host_port)
+    except Exception:
+        # free the slot held by this connection, which may be left in
+        # an unknown state
+        ConnectionPool.discard(http)
+        raise
     else:
         return http, response
 
 
+class ChunkedJSON(object):
+    """ A JSON array request body serialised incrementally as it is sent,
+    using chunked transfer encoding, so that a full copy of the document is
+    never held in memory. The items are serialised afresh on each iteration
+    so that the request may be resent if necessary.
+
+    :param items: re-iterable collection of JSON-serialisable items
+    :param chunk_size: approximate number of bytes per chunk serialised
+    :param compressed: whether to compress the serialised document with gzip
+    """
+
+    def __init__(self, items, chunk_size=65536, compressed=False):
+        self.items = items
+        self.chunk_size = chunk_size
+        self.compressed = compressed
+
+    def __iter__(self):
+        if self.compressed:
+            return _gzip_chunks(self._chunks())
+        else:
+            return self._chunks()
+
+    def _chunks(self):
+        encode = JSONEncoder(separators=(",", ":")).encode
+        chunk_size = self.chunk_size
+        buffer, size, link = ["["], 1, ""
+        for item in self.items:
+            data = encode(item)
+            buffer.append(link)
+            buffer.append(data)
+            size += len(data) + 1
+            link = ","
+            if size >= chunk_size:
+                yield "".join(buffer).encode("UTF-8")
+                buffer, size = [], 0
+        buffer.append("]")
+        yield "".join(buffer).encode("UTF-8")
+
+
+def _gzip_compressor():
+    return zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+
+def _gzip_chunks(chunks):
+    compressor = _gzip_compressor()
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def _compressed(uri, body):
+    """ Return a gzip-compressed copy of a request body if it is large
+    enough to be worth compressing and the server is known to accept gzip,
+    otherwise :py:const:`None`.
+    """
+    if compression_threshold is None or not body:
+        return None
+    accepted = request_encodings.get((uri.scheme, uri.host_port), ())
+    if "gzip" not in accepted:
+        return None
+    if isinstance(body, ChunkedJSON):
+        if body.compressed:
+            return None
+        return ChunkedJSON(body.items, body.chunk_size, compressed=True)
+    elif isinstance(body, bytes) and len(body) >= compression_threshold:
+        compressor = _gzip_compressor()
+        return compressor.compress(body) + compressor.flush()
+    else:
+        return None
+
+
+def _note_request_encodings(uri, response):
+    """ Record the content codings a server accepts in requests, if its
+    response advertises them (as per RFC 7694).
+    """
+    value = response.getheader("Accept-Encoding")
+    if value is not None:
+        codings = set()
+        for part in value.split(","):
+            coding, _, param = part.partition(";")
+            name, _, weight = param.partition("=")
+            try:
+                weight = float(weight) if name.strip() == "q" else 1.0
+            except ValueError:
+                weight = 1.0
+            if weight > 0:
+                codings.add(coding.strip().lower())
+        request_encodings[(uri.scheme, uri.host_port)] = codings
+
+
+class ContentDecoder(object):
+    """ Incremental decoder for response content compressed with the `gzip`
+    or `deflate` content coding. Raw content is fed in as it arrives and
+    decoded content taken out in pieces of any size.
+    """
+
+    codings = ("gzip", "x-gzip", "deflate")
+
+    def __init__(self, coding):
+        coding = coding.strip().lower()
+        if coding not in self.codings:
+            raise ValueError("Unsupported content coding " + repr(coding))
+        self._coding = coding
+        if coding == "deflate":
+            self._decompressor = zlib.decompressobj()
+        else:
+            self._decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        self._started = False
+        self._pending = bytearray()
+        #: Whether all raw content has been fed in
+        self.finished = False
+
+    def wants(self, size=None):
+        """ Check whether more raw content is needed before `size` bytes (or
+        all content, if no size is given) can be taken.
+        """
+        return not self.finished and (size is None or
+                                      len(self._pending) < size)
+
+    def feed(self, data):
+        """ Decode a piece of raw content; an empty piece marks the end.
+        """
+        if data:
+            if not self._started and self._coding == "deflate":
+                # some servers send raw deflate data without the zlib
+                # wrapper that the content coding calls for
+                try:
+                    decoded = self._decompressor.decompress(data)
+                except zlib.error:
+                    self._decompressor = zlib.decompressobj(-zlib.MAX_WBITS)
+                    decoded = self._decompressor.decompress(data)
+            else:
+                decoded = self._decompressor.decompress(data)
+            self._started = True
+            self._pending.extend(decoded)
+        else:
+            self._pending.extend(self._decompressor.flush())
+            self.finished = True
+
+    def take(self, size=None):
+        """ Take up to `size` bytes of decoded content, or all decoded
+        content if no size is given.
+        """
+        if size is None or size >= len(self._pending):
+            data, self._pending = bytes(self._pending), bytearray()
+        else:
+            data = bytes(self._pending[:size])
+            del self._pending[:size]
+        return data
+
+
+def _content_decoder(response):
+    coding = response.getheader("Content-Encoding")
+    if coding and coding.strip().lower() in ContentDecoder.codings:
+        return ContentDecoder(coding)
+    else:
+        return None
+
+
 class Request(object):
 
     def __init__(self, method, uri, body=None, headers=None):
@@ -318,37 +739,79 @@ class Request(object):
 
     @property
     def body(self):
-        """ Content of the request.
+        """ Content of the request. Values to be sent as JSON are serialised
+        on first access only, so should not be modified after that point.
         """
         if isinstance(self._body, (dict, list, tuple)):
-            return json.dumps(self._body, cls=JSONEncoder,
-                              separators=(",", ":"))
+            if self._serialised is None:
+                self._serialised = json.dumps(self._body, cls=JSONEncoder,
+                                              separators=(",", ":"))
+            return self._serialised
         else:
             return self._body
 
     @body.setter
     def body(self, value):
         self._body = value
+        self._serialised = None
+        self._encoded = None
+
+    @property
+    def _payload(self):
+        """ Content of the request as sent, with text encoded as UTF-8.
+        """
+        if self._encoded is None:
+            body = self.body
+            if isinstance(body, type("")):
+                self._encoded = body.encode("UTF-8")
+            else:
+                return body
+        return self._encoded
 
     @property
     def headers(self):
         """ Dictionary of headers attached to the request.
         """
-        if isinstance(self._body, (dict, list, tuple)):
+        if isinstance(self._body, (dict, list, tuple, ChunkedJSON)):
             self._headers.setdefault("Content-Type", "application/json")
         return self._headers
 
+    def _prepared(self, uri, product=None, compress=True):
+        """ Return the body and headers to send for this request to the URI
+        given, along with whether the body has been compressed.
+        """
+        body = self._payload
+        headers = dict(self.headers)
+        headers.setdefault("User-Agent", user_agent(product))
+        if accept_encoding:
+            headers.setdefault("Accept-Encoding", accept_encoding)
+        if compress and "Content-Encoding" not in headers:
+            compressed = _compressed(uri, body)
+            if compressed is not None:
+                headers["Content-Encoding"] = "gzip"
+                return compressed, headers, True
+        return body, headers, False
+
     def submit(self, redirect_limit=0, product=None, **response_kwargs):
         """ Submit this request and return a
         :py:class:`Response <httpstream.Response>` object.
         """
         uri = URI(self.uri)
-        headers = dict(self.headers)
-        headers.setdefault("User-Agent", user_agent(product))
+        compress = True
         while True:
-            http, rs = submit(self.method, uri, self.body, headers)
+            body, headers, compressed = self._prepared(uri, product, compress)
+            http, rs = submit(self.method, uri, body, headers)
             status_class = rs.status // 100
-            if status_class == 3:
+            if compressed and rs.status == UNSUPPORTED_MEDIA_TYPE:
+                # the server has refused the compressed body after all, so
+                # send it again as it is
+                Response(http, uri, self, rs, **response_kwargs).close()
+                request_encodings.get((uri.scheme, uri.host_port),
+                                      set()).discard("gzip")
+                compress = False
+                continue
+            # a 304 response carries no redirection, only an empty body
+            if status_class == 3 and rs.status != NOT_MODIFIED:
                 redirection = Redirection(http, uri, self, rs,
                                           **response_kwargs)
                 if redirect_limit:
@@ -380,12 +843,18 @@ class Response(object):
         self._request = request
         self._response = response
         self._reason = kwargs.get("reason")
+        self._decoder = _content_decoder(response)
         #: Default chunk size for this response
         self.chunk_size = kwargs.get("chunk_size", default_chunk_size)
+        #: Size to which the default chunk size may grow while content
+        #: arrives faster than it is read
+        self.max_chunk_size = kwargs.get("max_chunk_size",
+                                         default_max_chunk_size)
         log.info("<<< {0}".format(self))
         if __debug__:
             for key, value in self._response.getheaders():
                 log.debug("<<< {0}: {1}".format(key, value))
+        _note_request_encodings(self._uri, response)
 
     def __del__(self):
         self.close()
@@ -423,8 +892,9 @@ class Response(object):
             try:
                 self._response.read()
             except HTTPException:
-                pass
-            ConnectionPool.release(self._http)
+                ConnectionPool.discard(self._http)
+            else:
+                ConnectionPool.release(self._http)
             self._http = None
 
     @property
@@ -518,7 +988,7 @@ class Response(object):
         """
         if not self.is_json:
             raise TypeError("Content is not JSON")
-        return json.loads(self.read().decode(self.encoding))
+        return json.loads(self._read().decode(self.encoding))
 
     @property
     def is_text(self):
@@ -532,7 +1002,7 @@ class Response(object):
         """
         if not self.is_text:
             raise TypeError("Content is not text")
-        return self.read().decode(self.encoding)
+        return self._read().decode(self.encoding)
 
     @property
     def is_tsj(self):
@@ -549,7 +1019,7 @@ class Response(object):
             raise TypeError("Content is not tab-separated JSON")
         return [
             [json.loads(value) for value in line.split("\t")]
-            for line in self.read().decode(self.encoding).splitlines()
+            for line in self._read().decode(self.encoding).splitlines()
         ]
 
     @property
@@ -568,45 +1038,89 @@ class Response(object):
         else:
             return self.read()
 
-    def read(self, size=None):
-        """ Fetch some or all of the response content, returning as a bytearray.
+    def _read(self, size=None):
+        """ Fetch some or all of the response content as bytes, decoding
+        content compressed with a supported content coding.
         """
         completed = False
         try:
-            if size is None:
+            if self._decoder is not None:
+                decoder = self._decoder
+                while decoder.wants(size):
+                    if size is None:
+                        decoder.feed(self._response.read())
+                    else:
+                        decoder.feed(self._response.read(size))
+                data = decoder.take(size)
+                completed = size is None or bool(size and not data)
+            elif size is None:
                 data = self._response.read()
                 completed = True
             else:
                 data = self._response.read(size)
                 completed = bool(size and not data)
-            return bytearray(data)
+            return data
         finally:
             if completed:
                 self.close()
 
+    def read(self, size=None):
+        """ Fetch some or all of the response content, returning as a bytearray.
+        Content compressed with a supported content coding is decoded.
+        """
+        return bytearray(self._read(size))
+
+    def _iter_bytes(self, chunk_size=None):
+        """ Iterate through the content as pieces of bytes. Where possible,
+        these are read into a single buffer reused from piece to piece, so
+        each is only valid until the next is requested. If no chunk size is
+        specified, pieces start at the default chunk size for this response
+        and double in size, up to `max_chunk_size`, while each read fills
+        the piece completely.
+        """
+        if chunk_size:
+            size = limit = chunk_size
+        else:
+            size = self.chunk_size
+            limit = max(size, self.max_chunk_size)
+        readinto = None
+        if self._decoder is None:
+            readinto = getattr(self._response, "readinto", None)
+        if readinto is None:
+            while True:
+                data = self._read(size)
+                if not data:
+                    break
+                yield data
+                if len(data) >= size and size < limit:
+                    size = min(2 * size, limit)
+        else:
+            view = memoryview(bytearray(size))
+            while True:
+                count = readinto(view)
+                if not count:
+                    break
+                yield view[:count]
+                if count == size and size < limit:
+                    size = min(2 * size, limit)
+                    view = memoryview(bytearray(size))
+
     def iter_chunks(self, chunk_size=None):
         """ Iterate through the content as chunks of text. Chunk sizes may vary
         slightly from that specified due to multi-byte characters. If no chunk
-        size is specified, a default of 4096 is used.
+        size is specified, chunks start at the default chunk size for this
+        response (4096 unless otherwise set) and grow while content arrives
+        faster than it is read.
         """
         try:
-            if not chunk_size:
-                chunk_size = self.chunk_size
-            pending = bytearray()
-            data = True
-            while data:
-                data = self.read(chunk_size)
-                pending.extend(data)
-                decoded = None
-                while data and not decoded:
-                    try:
-                        decoded = pending.decode(self.encoding)
-                    except UnicodeDecodeError:
-                        data = self.read(1)
-                        pending.extend(data)
-                    else:
-                        del pending[:]
-                        yield decoded
+            decoder = codecs.getincrementaldecoder(self.encoding)()
+            for data in self._iter_bytes(chunk_size):
+                text = decoder.decode(data)
+                if text:
+                    yield text
+            text = decoder.decode(b"", True)
+            if text:
+                yield text
         finally:
             self.close()
 
@@ -809,6 +1323,216 @@ class ResourceTemplate(object):
         return Resource(self._uri_template.expand(**values))
 
 
+class _SharedReader(object):
+    """ Buffered reader for a socket carrying pipelined responses. Each
+    response in turn takes this as its socket file, so that bytes buffered
+    beyond the end of one response remain available to the next. Closing
+    it from a response has no effect.
+    """
+
+    def __init__(self, fp):
+        self._fp = fp
+
+    def __getattr__(self, name):
+        return getattr(self._fp, name)
+
+    def makefile(self, *args, **kwargs):
+        return self
+
+    def close(self):
+        pass
+
+
+class _BufferedResponse(object):
+    """ Stand-in for an HTTP response whose content has been read in full,
+    leaving the connection free for the next response.
+    """
+
+    def __init__(self, response, content):
+        self.status = response.status
+        self.reason = response.reason
+        self._headers = response.getheaders()
+        self._content = content
+        self._position = 0
+
+    def getheader(self, name, default=None):
+        name = name.lower()
+        values = [value for key, value in self._headers
+                  if key.lower() == name]
+        if values:
+            return ", ".join(values)
+        else:
+            return default
+
+    def getheaders(self):
+        return list(self._headers)
+
+    def read(self, size=None):
+        start = self._position
+        if size is None or size < 0:
+            end = len(self._content)
+        else:
+            end = min(start + size, len(self._content))
+        self._position = end
+        return self._content[start:end]
+
+
+# Only requests which may safely be sent again are pipelined, since those
+# left unanswered when a server closes the connection are resent.
+_pipelined_methods = ("GET", "HEAD", "PUT", "DELETE", "OPTIONS")
+
+
+def _buffered(uri, request, response, content, response_kwargs):
+    response = _BufferedResponse(response, content)
+    status_class = response.status // 100
+    if status_class == 3 and response.status != NOT_MODIFIED:
+        cls = Redirection
+    elif status_class == 4:
+        cls = ClientError
+    elif status_class == 5:
+        cls = ServerError
+    else:
+        cls = Response
+    return cls(None, uri, request, response, **response_kwargs)
+
+
+def _serialised(method, uri, body, headers):
+    lines = ["{0} {1} HTTP/1.1".format(method, uri.absolute_path_reference)]
+    for key, value in headers.items():
+        lines.append("{0}: {1}".format(key, value))
+    if body:
+        lines.append("Content-Length: {0}".format(len(body)))
+    elif method in ("POST", "PUT"):
+        lines.append("Content-Length: 0")
+    lines.append("\r\n")
+    return "\r\n".join(lines).encode(default_encoding) + (body or b"")
+
+
+def _exchange(http, items, responses, response_kwargs):
+    """ Write a run of requests back-to-back on one connection, then read
+    their responses in order. Return the number of requests answered; if
+    fewer than all, the server has closed the connection early and the
+    connection is closed here too.
+    """
+    data = []
+    for index, request, uri, body, headers in items:
+        log.info(">>> {0} {1} [pipelined]".format(request.method, uri))
+        data.append(_serialised(request.method, uri, body, headers))
+    answered = 0
+    closing = False
+    fp = None
+    try:
+        http.sock.sendall(b"".join(data))
+        fp = http.sock.makefile("rb")
+        reader = _SharedReader(fp)
+        for index, request, uri, body, headers in items:
+            rs = HTTPResponse(reader, method=request.method)
+            rs.begin()
+            content = rs.read()
+            responses[index] = _buffered(uri, request, rs, content,
+                                         response_kwargs)
+            answered += 1
+            if rs.will_close:
+                closing = True
+                break
+    except (HTTPException, error) as err:
+        log.warn("<~> Pipeline interrupted after {0} of {1} responses "
+                 "({2})".format(answered, len(items), err))
+        closing = True
+    finally:
+        if fp is not None:
+            fp.close()
+    if closing:
+        http.close()
+    return answered
+
+
+def _pipeline(puddle, items, responses, response_kwargs):
+    """ Submit requests to a single network location over one connection,
+    writing up to `pipeline_depth` of them at a time. Requests left
+    unanswered by a server that closes the connection early are resent on
+    a new connection; those that remain when a server closes a connection
+    without answering anything are returned to be submitted one by one.
+    """
+    http = puddle.acquire()
+    try:
+        while items:
+            if http.sock is None:
+                http.connect()
+            run = items[:puddle.pipeline_depth]
+            answered = _exchange(http, run, responses, response_kwargs)
+            if not answered:
+                break
+            items = items[answered:]
+    except Exception:
+        puddle.discard(http)
+        raise
+    else:
+        puddle.release(http)
+    return items
+
+
+def _submit_in_turn(items, responses, response_kwargs):
+    for index, request, uri, body, headers in items:
+        http, rs = submit(request.method, uri, body, headers)
+        try:
+            content = rs.read()
+        except HTTPException:
+            ConnectionPool.discard(http)
+            raise
+        else:
+            ConnectionPool.release(http)
+        responses[index] = _buffered(uri, request, rs, content,
+                                     response_kwargs)
+
+
+def pipeline(requests, product=None, **response_kwargs):
+    """ Submit a sequence of :py:class:`Request` objects, returning a list of
+    responses in the same order, each with its content already read.
+
+    Consecutive GET, HEAD, PUT, DELETE and OPTIONS requests to a network
+    location whose puddle has a `pipeline_depth` (see
+    :py:meth:`ConnectionPool.configure`) are written back-to-back on a single
+    connection and their responses read in order. If the server closes the
+    connection early, any requests left unanswered are sent again. All other
+    requests are submitted one at a time as usual.
+
+    Unlike :py:meth:`Request.submit`, redirects are not followed and error
+    responses are returned rather than raised.
+    """
+    responses = [None] * len(requests)
+    run, run_key = [], None
+
+    def flush():
+        if len(run) > 1:
+            puddle = ConnectionPool._get_puddle(*run_key)
+            remaining = _pipeline(puddle, run, responses, response_kwargs)
+        else:
+            remaining = run
+        _submit_in_turn(remaining, responses, response_kwargs)
+
+    for index, request in enumerate(requests):
+        uri = URI(request.uri)
+        body, headers, _ = request._prepared(uri, product)
+        item = (index, request, uri, body, headers)
+        if (request.method in _pipelined_methods and
+                not isinstance(body, ChunkedJSON)):
+            key = (uri.scheme, uri.host_port)
+            puddle = ConnectionPool._get_puddle(*key)
+            if puddle.pipeline_depth and puddle.pipeline_depth > 1:
+                if key != run_key:
+                    flush()
+                    run, run_key = [], key
+                _add_address_headers(uri, headers)
+                run.append(item)
+                continue
+        flush()
+        run, run_key = [], None
+        _submit_in_turn([item], responses, response_kwargs)
+    flush()
+    return responses
+
+
 def get(uri, headers=None, redirect_limit=5, **kwargs):
     return Resource(uri).get(headers, redirect_limit, **kwargs)
 
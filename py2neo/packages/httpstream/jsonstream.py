@@ -27,10 +27,28 @@ except ImportError:
     from __builtin__ import unichr as _chr
 from io import StringIO
 from itertools import groupby
+from json.decoder import JSONDecoder, scanstring
+import re
 from string import whitespace
+import sys
 
 
-__all__ = ["JSONStream", "assembled", "grouped"]
+if sys.version_info >= (3,):
+    def _scanstring(s, end):
+        """ Decode the JSON string starting after the quote at `end` - 1,
+        allowing control characters within it, and return it along with
+        the position after its closing quote.
+        """
+        return scanstring(s, end, False)
+else:
+    def _scanstring(s, end):
+        # the Python 2 signature includes an encoding, and neither version
+        # accepts keyword arguments from the C implementation
+        return scanstring(s, end, None, False)
+
+
+__all__ = ["JSONStream", "JSONEnvelopeStream", "Assembler", "assembled",
+           "assembled_groups", "grouped"]
 
 
 class AwaitingData(BaseException):
@@ -264,6 +282,119 @@ class Tokeniser(object):
             raise UnexpectedCharacter(ch)
 
 
+class BufferedTokeniser(object):
+    """ Tokeniser which scans whole chunks of buffered data using a compiled
+    regular expression and the C-level string scanner from the standard
+    library `json` module. This produces exactly the same tokens as the
+    character-at-a-time :py:class:`Tokeniser` but with far less overhead per
+    character.
+    """
+
+    TOKEN = re.compile(r"[" + whitespace + r"]*(?:"
+                       r"([-0-9][-+.0-9Ee]*)|"  # number (validated below)
+                       r"(null|true|false)|"
+                       r"([^" + whitespace + r"]))")
+    NUMBER = re.compile(r"-?(?:0|[1-9][0-9]*)(\.[0-9]+)?([Ee][-+]?[0-9]+)?$")
+    STRING = re.compile(r'"(?:[^"\\]|\\.)*"', re.DOTALL)
+    LITERALS = {
+        'null': None,
+        'true': True,
+        'false': False,
+    }
+
+    def __init__(self):
+        self.start()
+
+    def _assert_writable(self):
+        if not self._writable:
+            raise IOError("Stream is not writable")
+
+    def write(self, data):
+        """Write raw JSON data to the decoder stream.
+        """
+        self._assert_writable()
+        if self._pos:
+            # discard everything already consumed
+            self._buffer = self._buffer[self._pos:] + data
+            self._pos = 0
+        else:
+            self._buffer += data
+
+    def start(self):
+        self._buffer = ""
+        self._pos = 0
+        self._writable = True
+
+    def end(self):
+        self._writable = False
+
+    def _incomplete(self):
+        """Signal that the token at the current position cannot be completed
+        with the data currently available.
+        """
+        if self._writable:
+            raise AwaitingData()
+        else:
+            raise EndOfStream()
+
+    def _read_string(self, buffer, pos):
+        try:
+            value, end = _scanstring(buffer, pos + 1)
+        except ValueError:
+            if self.STRING.match(buffer, pos):
+                # string is terminated, so must contain a bad escape sequence
+                raise UnexpectedCharacter(buffer[pos:])
+            self._incomplete()
+        self._pos = end
+        return buffer[pos:end], value
+
+    def _read_number(self, src):
+        number = self.NUMBER.match(src)
+        if not number:
+            raise UnexpectedCharacter(src)
+        if number.group(1) or number.group(2):
+            return src, float(src)
+        else:
+            return src, int(src)
+
+    def read(self):
+        buffer = self._buffer
+        token = self.TOKEN.match(buffer, self._pos)
+        if not token:
+            # nothing but whitespace remains
+            self._pos = len(buffer)
+            self._incomplete()
+        kind, end = token.lastindex, token.end()
+        src = token.group(kind)
+        if kind == 3:
+            if src in ',:[]{}':
+                self._pos = end
+                return src, None
+            elif src == '"':
+                return self._read_string(buffer, end - 1)
+            elif (src in 'ntf' and self._writable and
+                    "nulltruefalse".find(buffer[end - 1:]) >= 0):
+                # literal potentially incomplete
+                self._pos = end - 1
+                raise AwaitingData()
+            else:
+                raise UnexpectedCharacter(src)
+        elif end == len(buffer) and self._writable:
+            # token potentially incomplete: need to wait for
+            # further data or end of stream
+            self._pos = token.start(kind)
+            raise AwaitingData()
+        self._pos = end
+        if kind == 2:
+            return src, self.LITERALS[src]
+        else:
+            return self._read_number(src)
+
+
+#: Tokeniser class used by :py:class:`JSONStream` unless otherwise specified
+default_tokeniser = BufferedTokeniser
+
+
 # Token constants used for expectation management
 VALUE = 0x01
 OPENING_BRACKET = 0x02
@@ -277,10 +408,15 @@ COLON = 0x40
 class JSONStream(object):
     """ Streaming JSON decoder. This class both expects Unicode input and will
     produce Unicode output.
+
+    :param source: iterable source of Unicode text chunks
+    :param tokeniser: tokeniser class to use (optional, defaults to
+        :py:data:`default_tokeniser`); the original character-at-a-time
+        :py:class:`Tokeniser` remains available as a fallback
     """
 
-    def __init__(self, source):
-        self.tokeniser = Tokeniser()
+    def __init__(self, source, tokeniser=None):
+        self.tokeniser = (tokeniser or default_tokeniser)()
         self.source = iter(source)
         self.path = []
         self._expectation = VALUE | OPENING_BRACKET | OPENING_BRACE
@@ -309,25 +445,26 @@ class JSONStream(object):
 
     def _next_value(self, src, value):
         self._assert_expecting(VALUE, src)
-        if self._in_array():
+        path = self.path
+        if not path:
+            # simple value
+            return (), value
+        top = path[-1]
+        if isinstance(top, int):
             # array value
-            out = tuple(self.path), value
-            self.path[-1] += 1
+            out = tuple(path), value
+            path[-1] = top + 1
             self._expectation = COMMA | CLOSING_BRACKET
-        elif self._in_object():
-            if self._has_key():
-                # object value
-                out = tuple(self.path), value
-                self.path[-1] = None
-                self._expectation = COMMA | CLOSING_BRACE
-            else:
-                # object key
-                out = None
-                self.path[-1] = value
-                self._expectation = COLON
+        elif top is None:
+            # object key
+            out = None
+            path[-1] = value
+            self._expectation = COLON
         else:
-            # simple value
-            out = tuple(self.path), value
+            # object value
+            out = tuple(path), value
+            path[-1] = None
+            self._expectation = COMMA | CLOSING_BRACE
         return out
 
     def _handle_comma(self, src):
@@ -374,6 +511,7 @@ class JSONStream(object):
             self._expectation = VALUE | OPENING_BRACKET | OPENING_BRACE
 
     def __iter__(self):
+        read = self.tokeniser.read
         while True:
             try:
                 try:
@@ -382,7 +520,7 @@ class JSONStream(object):
                     self.tokeniser.end()
                 while True:
                     try:
-                        src, value = self.tokeniser.read()
+                        src, value = read()
                         if src == ',':
                             self._handle_comma(src)
                         elif src == ':':
@@ -407,49 +545,234 @@ class JSONStream(object):
                 break
 
 
-def _merged(obj, key, value):
-    """ Returns object with value merged at a position described by iterable
-    key. The key describes a navigable path through the object hierarchy with
-    integer items describing list indexes and other types of items describing
-    dictionary keys.
-
-        >>> obj = None
-        >>> obj = _merged(obj, ("drink",), "lemonade")
-        >>> obj
-        {'drink': 'lemonade'}
-        >>> obj = _merged(obj, ("cutlery", 0), "knife")
-        >>> obj = _merged(obj, ("cutlery", 1), "fork")
-        >>> obj = _merged(obj, ("cutlery", 2), "spoon")
-        >>> obj
-        {'cutlery': ['knife', 'fork', 'spoon'], 'drink': 'lemonade'}
+# Decoder states used by JSONEnvelopeStream
+_OPEN = 0
+_KEY_OR_CLOSE = 1
+_KEY = 2
+_COLON = 3
+_VALUE = 4
+_COMMA_OR_CLOSE = 5
+_ELEMENT_OR_CLOSE = 6
+_ELEMENT = 7
+_COMMA_OR_CLOSE_ARRAY = 8
+_CLOSED = 9
+
+
+class JSONEnvelopeStream(object):
+    """ Streaming decoder for a JSON object envelope which wraps a potentially
+    very large array, such as the ``{"columns": [...], "data": [[...], ...]}``
+    document returned from a Cypher query. Rather than producing an event for
+    every scalar, each element of the array held under `key` is decoded in one
+    go as a complete JSON value by the C-level decoder and yielded as soon as
+    it has been fully received. All other members of the envelope are decoded
+    whole.
+
+    Events take the same ``(path, value)`` form as those produced by
+    :py:class:`JSONStream`, only at a coarser grain::
+
+        >>> list(JSONEnvelopeStream(['{"columns":["a"],"da', 'ta":[[1],[2]]}']))
+        [(('columns',), ['a']), (('data', 0), [1]), (('data', 1), [2])]
+
+    A document consisting of a bare array, such as a batch response, is
+    streamed element by element in the same way::
+
+        >>> list(JSONEnvelopeStream(['[{"id":0},', '{"id":1}]']))
+        [((0,), {'id': 0}), ((1,), {'id': 1})]
+
+    :param source: iterable source of Unicode text chunks
+    :param key: name of the member holding the array to be streamed
+    """
+
+    WHITESPACE = re.compile("[" + whitespace + "]*")
+
+    def __init__(self, source, key="data"):
+        self.source = iter(source)
+        self.key = key
+        self._decoder = JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._writable = True
+        self._state = _OPEN
+        self._member = None
+        self._path = ()
+        self._index = 0
+
+    def write(self, data):
+        """Write raw JSON data to the decoder stream.
+        """
+        if not self._writable:
+            raise IOError("Stream is not writable")
+        if self._pos:
+            # discard everything already consumed
+            self._buffer = self._buffer[self._pos:] + data
+            self._pos = 0
+        else:
+            self._buffer += data
+
+    def end(self):
+        self._writable = False
+
+    def _incomplete(self):
+        if self._writable:
+            raise AwaitingData()
+        else:
+            raise EndOfStream()
+
+    def _decode(self, pos):
+        """Decode a complete value starting at `pos`, returning the value and
+        the position immediately after it.
+        """
+        buffer = self._buffer
+        try:
+            value, end = self._decoder.raw_decode(buffer, pos)
+        except ValueError:
+            if self._writable:
+                raise AwaitingData()
+            raise UnexpectedCharacter(buffer[pos:pos + 20])
+        # A value is only known to be complete (i.e. not a truncated number
+        # or literal) once the character following it has been received.
+        if (self.WHITESPACE.match(buffer, end).end() == len(buffer) and
+                self._writable):
+            raise AwaitingData()
+        return value, end
+
+    def _after_array(self):
+        return _COMMA_OR_CLOSE if self._path else _CLOSED
+
+    def _expect(self, ch, expected):
+        if ch not in expected:
+            raise UnexpectedCharacter(ch)
+
+    def read(self):
+        """Read the next complete event from the buffered data.
+        """
+        while True:
+            buffer = self._buffer
+            pos = self._pos = self.WHITESPACE.match(buffer, self._pos).end()
+            if pos == len(buffer):
+                self._incomplete()
+            ch, state = buffer[pos], self._state
+            if state == _ELEMENT_OR_CLOSE or state == _ELEMENT:
+                if ch == ']' and state == _ELEMENT_OR_CLOSE:
+                    self._pos, self._state = pos + 1, self._after_array()
+                else:
+                    value, self._pos = self._decode(pos)
+                    self._state = _COMMA_OR_CLOSE_ARRAY
+                    out = self._path + (self._index,), value
+                    self._index += 1
+                    return out
+            elif state == _COMMA_OR_CLOSE_ARRAY:
+                self._expect(ch, ',]')
+                self._pos = pos + 1
+                self._state = _ELEMENT if ch == ',' else self._after_array()
+            elif state == _VALUE:
+                if ch == '[' and self._member == self.key:
+                    self._pos, self._state = pos + 1, _ELEMENT_OR_CLOSE
+                    self._path, self._index = (self._member,), 0
+                else:
+                    value, self._pos = self._decode(pos)
+                    self._state = _COMMA_OR_CLOSE
+                    return (self._member,), value
+            elif state == _KEY_OR_CLOSE or state == _KEY:
+                if ch == '}' and state == _KEY_OR_CLOSE:
+                    self._pos, self._state = pos + 1, _CLOSED
+                else:
+                    self._expect(ch, '"')
+                    try:
+                        self._member, end = _scanstring(buffer, pos + 1)
+                    except ValueError:
+                        self._incomplete()
+                    self._pos, self._state = end, _COLON
+            elif state == _COLON:
+                self._expect(ch, ':')
+                self._pos, self._state = pos + 1, _VALUE
+            elif state == _COMMA_OR_CLOSE:
+                self._expect(ch, ',}')
+                self._pos = pos + 1
+                self._state = _KEY if ch == ',' else _CLOSED
+            elif state == _OPEN:
+                self._expect(ch, '{[')
+                self._pos = pos + 1
+                self._state = _KEY_OR_CLOSE if ch == '{' else _ELEMENT_OR_CLOSE
+            else:
+                raise UnexpectedCharacter(ch)
+
+    def __iter__(self):
+        while True:
+            try:
+                try:
+                    self.write(next(self.source))
+                except StopIteration:
+                    self.end()
+                while True:
+                    try:
+                        yield self.read()
+                    except AwaitingData:
+                        break
+            except EndOfStream:
+                break
+
+
+class Assembler(object):
+    """ Incremental builder for a JSON-derived value from the key-value pairs
+    produced by the JSONStream process. The key of each pair describes a
+    navigable path through the object hierarchy with integer items describing
+    list indexes and other types of items describing dictionary keys. A single
+    value is mutated in place as pairs are added, so that assembly takes time
+    linear in the number of pairs.
+
+        >>> assembler = Assembler()
+        >>> assembler.add(("drink",), "lemonade")
+        >>> assembler.add(("cutlery", 0), "knife")
+        >>> assembler.add(("cutlery", 1), "fork")
+        >>> assembler.value
+        {'cutlery': ['knife', 'fork'], 'drink': 'lemonade'}
 
     """
-    if key:
+
+    def __init__(self):
+        self.value = None
+
+    def add(self, key, value):
+        """ Merge a value into the position described by iterable key.
+        """
+        if value == [] or value == {}:
+            # containers announced as empty will be filled by later pairs
+            # so must not be shared with the caller
+            value = type(value)()
+        if not key:
+            self.value = value
+            return
         k = key[0]
+        obj = self.value
         if isinstance(k, int):
-            if isinstance(obj, list):
-                obj = list(obj)
-            else:
-                obj = []
-            while len(obj) <= k:
-                obj.append(None)
-        else:
-            if isinstance(obj, dict):
-                obj = dict(obj)
+            if not isinstance(obj, list):
+                obj = self.value = []
+        elif not isinstance(obj, dict):
+            obj = self.value = {}
+        for next_k in key[1:]:
+            if isinstance(k, int):
+                if len(obj) <= k:
+                    obj.extend([None] * (k + 1 - len(obj)))
+                child = obj[k]
             else:
-                obj = {}
-            obj.setdefault(k, None)
-        obj[k] = _merged(obj[k], key[1:], value)
-        return obj
-    else:
-        return value
+                child = obj.get(k)
+            if isinstance(next_k, int):
+                if not isinstance(child, list):
+                    child = obj[k] = []
+            elif not isinstance(child, dict):
+                child = obj[k] = {}
+            obj, k = child, next_k
+        if isinstance(k, int) and len(obj) <= k:
+            obj.extend([None] * (k + 1 - len(obj)))
+        obj[k] = value
 
 
 def assembled(iterable):
     """ Returns a JSON-derived value from a set of key-value pairs as produced
     by the JSONStream process. This operates in a similar way to the built-in
-    `dict` function. Internally, this uses the `merged` function on each pair
-    to build the return value.
+    `dict` function. Internally, this uses an :py:class:`Assembler` to build
+    the return value.
 
         >>> data = [
         ...     (("drink",), "lemonade"),
@@ -462,10 +785,43 @@ def assembled(iterable):
 
     :param iterable: key-value pairs to be merged into assembled value
     """
-    obj = None
+    assembler = Assembler()
+    add = assembler.add
+    for key, value in iterable:
+        add(key, value)
+    return assembler.value
+
+
+def assembled_groups(iterable, level=1):
+    """ Assemble key-value pairs grouped by the first `level` items of each
+    key, yielding each group key together with its assembled value as soon as
+    that group is complete. This is equivalent to, but cheaper than, calling
+    `assembled` on each group produced by `grouped`.
+
+        >>> data = [
+        ...     ((0, "name"), "Alice"),
+        ...     ((1, "name"), "Bob"),
+        ... ]
+        >>> list(assembled_groups(data))
+        [((0,), {'name': 'Alice'}), ((1,), {'name': 'Bob'})]
+
+    :param iterable: key-value pairs to be grouped and assembled
+    :param level: number of key items that identify a group
+    """
+    group, assembler = None, None
     for key, value in iterable:
-        obj = _merged(obj, key, value)
-    return obj
+        if len(key) < level:
+            if assembler is not None:
+                yield group, assembler.value
+            group, assembler = None, None
+            continue
+        if key[:level] != group:
+            if assembler is not None:
+                yield group, assembler.value
+            group, assembler = key[:level], Assembler()
+        assembler.add(key[level:], value)
+    if assembler is not None:
+        yield group, assembler.value
 
 
 def _group(iterable, level):
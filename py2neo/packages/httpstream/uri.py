@@ -42,6 +42,20 @@ unreserved = ("ABCDEFGHIJKLMNOPQRSTUVWXYZ"
               "0123456789-._~")
 
 
+# Patterns matching the characters that must be encoded, keyed by the
+# characters to be kept unencoded
+_unsafe_patterns = {}
+
+
+def _unsafe_pattern(safe):
+    try:
+        return _unsafe_patterns[safe]
+    except KeyError:
+        chars = (unreserved + safe).replace("%", "")
+        return _unsafe_patterns.setdefault(
+            safe, re.compile("[^" + re.escape(chars) + "]"))
+
+
 def percent_encode(data, safe=None):
     """ Percent encode a string of data, optionally keeping certain characters
     unencoded.
@@ -61,6 +75,11 @@ def percent_encode(data, safe=None):
         )
     if not safe:
         safe = ""
+    try:
+        if _unsafe_pattern(safe).search(data) is None:
+            return data
+    except TypeError:
+        pass
     try:
         chars = list(data)
     except TypeError:
@@ -72,17 +91,24 @@ def percent_encode(data, safe=None):
     return "".join(chars)
 
 
+_percent_code = re.compile("(%[0-9A-Fa-f]{2})")
+
+
 def percent_decode(data):
     """ Percent decode a string of data.
 
     """
     if data is None:
         return None
-    percent_code = re.compile("(%[0-9A-Fa-f]{2})")
     try:
-        bits = percent_code.split(data)
+        if "%" not in data:
+            return data
     except TypeError:
-        bits = percent_code.split(str(data))
+        pass
+    try:
+        bits = _percent_code.split(data)
+    except TypeError:
+        bits = _percent_code.split(str(data))
     out = bytearray()
     for bit in bits:
         if bit.startswith("%"):
@@ -489,9 +515,43 @@ class Query(_Part):
             return self._query_dict[key]
 
 
+# URI strings made only of a scheme, a host, an optional port and a path of
+# unreserved characters are already in the canonical form produced by
+# `URI.string`, so can be used as such without being parsed
+_CANONICAL_URI = re.compile(r"[A-Za-z][A-Za-z0-9.\-]*://[A-Za-z0-9.\-]+"
+                            r"(?::[1-9][0-9]*)?(?:/[A-Za-z0-9._~\-]*)*\Z")
+
+# Shared URIs, keyed by string and optional reference; see `URI.interned`
+_interned = {}
+_INTERNED_LIMIT = 1024
+
+
+def _parsed_component(name):
+    """ Property giving access to a URI component, parsing the URI on first
+    access and discarding any memoised string on change.
+    """
+    attr = "_parsed_" + name
+
+    def fget(self):
+        if self._source is not None:
+            self._parse()
+        return getattr(self, attr)
+
+    def fset(self, value):
+        if self._source is not None:
+            self._parse()
+        setattr(self, attr, value)
+        self._string = None
+
+    return property(fget, fset)
+
+
 class URI(_Part):
     """ Uniform Resource Identifier.
 
+    The string value supplied is only split into its components when one of
+    those is first required, and the full string value is memoised.
+
     .. seealso::
         `RFC 3986`_
 
@@ -507,63 +567,92 @@ class URI(_Part):
         else:
             return cls(str(obj))
 
+    @classmethod
+    def interned(cls, value, reference=None):
+        """ Fetch a URI shared between all callers for a string value that
+        is used repeatedly, such as a service base URI, optionally resolved
+        against a reference. Interned URIs must not be modified.
+
+        :param value: URI string
+        :param reference: relative reference to resolve (optional)
+        """
+        key = (value, reference)
+        try:
+            return _interned[key]
+        except KeyError:
+            uri = cls(value)
+            if reference is not None:
+                uri = uri.resolve(reference)
+            uri.string
+            if len(_interned) >= _INTERNED_LIMIT:
+                _interned.clear()
+            return _interned.setdefault(key, uri)
+
+    _scheme = _parsed_component("scheme")
+    _authority = _parsed_component("authority")
+    _path = _parsed_component("path")
+    _query = _parsed_component("query")
+    _fragment = _parsed_component("fragment")
+
     def __init__(self, value):
         super(URI, self).__init__()
+        self._source = None
+        self._string = None
+        self._parsed_scheme = None
+        self._parsed_authority = None
+        self._parsed_path = None
+        self._parsed_query = None
+        self._parsed_fragment = None
         try:
             if value.__uri__ is None:
-                self._scheme = None
-                self._authority = None
-                self._path = None
-                self._query = None
-                self._fragment = None
                 return
         except AttributeError:
             pass
-        if value is None:
-            self._scheme = None
-            self._authority = None
-            self._path = None
-            self._query = None
-            self._fragment = None
-        else:
+        if value is not None:
             try:
                 value = str(value.__uri__)
             except AttributeError:
                 value = str(value)
-            # scheme
-            if ":" in value:
-                self._scheme, value = value.partition(":")[0::2]
-                self._scheme = percent_decode(self._scheme)
-            else:
-                self._scheme = None
-            # fragment
-            if "#" in value:
-                value, self._fragment = value.partition("#")[0::2]
-                self._fragment = percent_decode(self._fragment)
+            self._source = value
+            if _CANONICAL_URI.match(value):
+                self._string = value
+
+    def _parse(self):
+        value, self._source = self._source, None
+        # scheme
+        if ":" in value:
+            scheme, value = value.partition(":")[0::2]
+            self._parsed_scheme = percent_decode(scheme)
+        # fragment
+        if "#" in value:
+            value, fragment = value.partition("#")[0::2]
+            self._parsed_fragment = percent_decode(fragment)
+        # query
+        if "?" in value:
+            value, query = value.partition("?")[0::2]
+            self._parsed_query = Query(query)
+        # hierarchical part
+        if value.startswith("//"):
+            value = value[2:]
+            slash = value.find("/")
+            if slash >= 0:
+                self._parsed_authority = Authority(value[:slash])
+                self._parsed_path = Path(value[slash:])
             else:
-                self._fragment = None
-            # query
-            if "?" in value:
-                value, self._query = value.partition("?")[0::2]
-                self._query = Query(self._query)
-            else:
-                self._query = None
-            # hierarchical part
-            if value.startswith("//"):
-                value = value[2:]
-                slash = value.find("/")
-                if slash >= 0:
-                    self._authority = Authority(value[:slash])
-                    self._path = Path(value[slash:])
-                else:
-                    self._authority = Authority(value)
-                    self._path = Path("")
-            else:
-                self._authority = None
-                self._path = Path(value)
+                self._parsed_authority = Authority(value)
+                self._parsed_path = Path("")
+        else:
+            self._parsed_path = Path(value)
 
     def __eq__(self, other):
         other = self._cast(other)
+        if self._source is not None and other._source is not None:
+            # both unparsed: equal strings give equal components and
+            # distinct canonical strings give distinct components
+            if self._source == other._source:
+                return True
+            elif self._string is not None and other._string is not None:
+                return False
         return (self._scheme == other._scheme and
                 self._authority == other._authority and
                 self._path == other._path and
@@ -571,12 +660,7 @@ class URI(_Part):
                 self._fragment == other._fragment)
 
     def __ne__(self, other):
-        other = self._cast(other)
-        return (self._scheme != other._scheme or
-                self._authority != other._authority or
-                self._path != other._path or
-                self._query != other._query or
-                self._fragment != other._fragment)
+        return not self.__eq__(other)
 
     def __hash__(self):
         return hash(self.string)
@@ -618,6 +702,8 @@ class URI(_Part):
             string, even when the URI is undefined; in this case, an empty
             string is returned instead of :py:const:`None`.
         """
+        if self._string is not None:
+            return self._string
         if self._path is None:
             return None
         u = []
@@ -630,7 +716,8 @@ class URI(_Part):
             u += ["?", str(self._query)]
         if self._fragment is not None:
             u += ["#", percent_encode(self._fragment)]
-        return "".join(u)
+        self._string = "".join(u)
+        return self._string
 
     @property
     def scheme(self):
@@ -944,11 +1031,123 @@ class URI(_Part):
         return target
 
 
+def _encoder(safe):
+    """ Build a percent-encoding function for the safe characters given. Strings
+    that need no encoding are detected with a single regular expression search
+    and returned unchanged.
+    """
+    unsafe = _unsafe_pattern(safe or "")
+
+    def encode(data):
+        try:
+            if unsafe.search(data) is None:
+                return data
+        except TypeError:
+            pass
+        return percent_encode(data, safe)
+
+    return encode
+
+
+_encode = _encoder(None)
+_encode_reserved = _encoder(reserved)
+
+
+class _TemplateExpression(object):
+    """ A single compiled expression from a URI template, holding the
+    variables to be expanded along with the encoder, prefix and separator
+    defined by its operator.
+    """
+
+    # operator: (encoder, prefix, separator, with_keys, trim_empty_equals)
+    _operators = {
+        "+": (_encode_reserved, "", ",", False, False),
+        "#": (_encode_reserved, "#", ",", False, False),
+        ".": (_encode, ".", ".", False, False),
+        "/": (_encode, "/", "/", False, False),
+        ";": (_encode, ";", ";", True, True),
+        "?": (_encode, "?", "&", True, False),
+        "&": (_encode, "&", "&", True, False),
+    }
+
+    def __init__(self, expression):
+        if expression[:1] in self._operators:
+            operator, expression = expression[0], expression[1:]
+        else:
+            operator = None
+        (self.encode, self.prefix, self.separator, self.with_keys,
+         self.trim_empty_equals) = self._operators.get(
+            operator, (_encode, "", ",", False, False))
+        self.variables = []
+        for key in expression.split(","):
+            if key.endswith("*"):
+                key, explode = key[:-1], True
+            else:
+                explode = False
+            if ":" in key:
+                key, max_length = key.partition(":")[0::2]
+                max_length = int(max_length)
+            else:
+                max_length = None
+            self.variables.append((key, explode, max_length, self.encode(key)))
+
+    def _keyed(self, encoded_key, item):
+        if not self.with_keys:
+            return item
+        elif item == "" and self.trim_empty_equals:
+            return encoded_key
+        else:
+            return encoded_key + "=" + item
+
+    def expand(self, values):
+        encode = self.encode
+        out = []
+        for key, explode, max_length, encoded_key in self.variables:
+            value = values.get(key)
+            if value is None:
+                continue
+            if isinstance(value, dict):
+                if not value:
+                    continue
+                elif explode:
+                    out.extend("=".join(map(encode, item))
+                               for item in value.items())
+                    continue
+                item = ",".join(",".join(map(encode, item))
+                                for item in value.items())
+            elif isinstance(value, (tuple, list)):
+                if explode:
+                    for item in value:
+                        if isinstance(item, tuple):
+                            out.append("=".join(map(encode, item)))
+                        elif item is not None:
+                            out.append(self._keyed(encoded_key, encode(item)))
+                    continue
+                item = ",".join(map(encode, value))
+            elif max_length is not None:
+                item = encode(value[:max_length])
+            else:
+                item = encode(value)
+            out.append(self._keyed(encoded_key, item))
+        if out:
+            return self.prefix + self.separator.join(out)
+        else:
+            return ""
+
+
+# Compiled templates shared between `URITemplate` instances, keyed by
+# template string
+_compiled_templates = {}
+_COMPILED_TEMPLATE_LIMIT = 1024
+
+
 class URITemplate(_Part):
     """A URI Template is a compact sequence of characters for describing a
     range of Uniform Resource Identifiers through variable expansion.
     
-    This class exposes a full implementation of RFC6570.
+    This class exposes a full implementation of RFC6570. Each template is
+    compiled once into a sequence of literal strings and expressions and
+    the compiled form is shared between all templates with the same text.
     """
 
     @classmethod
@@ -960,106 +1159,34 @@ class URITemplate(_Part):
         else:
             return cls(str(obj))
 
-    class _Expander(object):
-
-        _operators = set("+#./;?&")
-
-        def __init__(self, values):
-            self.values = values
-
-        def collect(self, *keys):
-            """ Fetch a list of all values matching the keys supplied,
-            returning (key, value) pairs for each.
-            """
-            items = []
-            for key in keys:
-                if key.endswith("*"):
-                    key, explode = key[:-1], True
-                else:
-                    explode = False
-                if ":" in key:
-                    key, max_length = key.partition(":")[0::2]
-                    max_length = int(max_length)
-                else:
-                    max_length = None
-                value = self.values.get(key)
-                if isinstance(value, dict):
-                    if not value:
-                        items.append((key, None))
-                    elif explode:
-                        items.extend((key, _) for _ in value.items())
-                    else:
-                        items.append((key, value))
-                elif isinstance(value, (tuple, list)):
-                    if explode:
-                        items.extend((key, _) for _ in value)
-                    else:
-                        items.append((key, list(value)))
-                elif max_length is not None:
-                    items.append((key, value[:max_length]))
-                else:
-                    items.append((key, value))
-            return [(key, value) for key, value in items if value is not None]
-
-        def _expand(self, expression, safe=None, prefix="", separator=",",
-                    with_keys=False, trim_empty_equals=False):
-            items = self.collect(*expression.split(","))
-            encode = lambda x: percent_encode(x, safe)
-            for i, (key, value) in enumerate(items):
-                if isinstance(value, tuple):
-                    items[i] = "=".join(map(encode, value))
-                else:
-                    if isinstance(value, dict):
-                        items[i] = ",".join(",".join(map(encode, item))
-                                            for item in value.items())
-                    elif isinstance(value, list):
-                        items[i] = ",".join(map(encode, value))
-                    else:
-                        items[i] = encode(value)
-                    if with_keys:
-                        if items[i] is None or (items[i] == "" and
-                                                trim_empty_equals):
-                            items[i] = encode(key)
-                        else:
-                            items[i] = encode(key) + "=" + (items[i] or "")
-            out = []
-            for i, item in enumerate(items):
-                out.append(prefix if i == 0 else separator)
-                out.append(item)
-            return "".join(out)
-
-        def expand(self, expression):
-            """ Dispatch to the correct expansion method.
-            """
-            if not expression:
-                return ""
-            if expression[0] in self._operators:
-                operator, expression = expression[0], expression[1:]
-                if operator == "+":
-                    return self._expand(expression, reserved)
-                elif operator == "#":
-                    return self._expand(expression, reserved, prefix="#")
-                elif operator == ".":
-                    return self._expand(expression, prefix=".", separator=".")
-                elif operator == "/":
-                    return self._expand(expression, prefix="/", separator="/")
-                elif operator == ";":
-                    return self._expand(expression, prefix=";", separator=";",
-                                        with_keys=True, trim_empty_equals=True)
-                elif operator == "?":
-                    return self._expand(expression, prefix="?", separator="&",
-                                        with_keys=True)
-                elif operator == "&":
-                    return self._expand(expression, prefix="&", separator="&",
-                                        with_keys=True)
-            else:
-                return self._expand(expression)
+    @classmethod
+    def _compile(cls, template):
+        try:
+            return _compiled_templates[template]
+        except KeyError:
+            pass
+        tokens = cls._tokeniser.split(template)
+        parts = []
+        while tokens:
+            token = tokens.pop(0)
+            if token == "{":
+                expression = tokens.pop(0)
+                tokens.pop(0)
+                if expression:
+                    parts.append(_TemplateExpression(expression))
+            elif token:
+                parts.append(token)
+        parts = tuple(parts)
+        if len(_compiled_templates) >= _COMPILED_TEMPLATE_LIMIT:
+            _compiled_templates.clear()
+        return _compiled_templates.setdefault(template, parts)
 
     _tokeniser = re.compile("(\{)([^{}]*)(\})")
 
     def __init__(self, template):
         super(URITemplate, self).__init__()
         self._template = template
+        self._parts = None
 
     def __eq__(self, other):
         other = self._cast(other)
@@ -1083,15 +1210,13 @@ class URITemplate(_Part):
         """
         if self._template is None:
             return URI(None)
-        tokens = self._tokeniser.split(self._template)
-        expander = URITemplate._Expander(values)
+        parts = self._parts
+        if parts is None:
+            parts = self._parts = self._compile(self._template)
         out = []
-        while tokens:
-            token = tokens.pop(0)
-            if token == "{":
-                expression = tokens.pop(0)
-                tokens.pop(0)
-                out.append(expander.expand(expression))
+        for part in parts:
+            if isinstance(part, _TemplateExpression):
+                out.append(part.expand(values))
             else:
-                out.append(token)
+                out.append(part)
         return URI("".join(out))
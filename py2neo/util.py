@@ -22,14 +22,16 @@ Utility module
 
 from __future__ import unicode_literals
 
+from collections import OrderedDict
 from itertools import cycle, islice
 import re
+from threading import RLock
 import warnings
 
 
 __all__ = ["numberise", "compact", "flatten", "round_robin", "deprecated",
            "version_tuple", "is_collection", "has_all", "ustr", "pendulate",
-           "Record"]
+           "Record", "RecordProducer", "LRUCache"]
 
 
 def numberise(n):
@@ -155,20 +157,150 @@ def pendulate(collection):
     count = len(collection)
     for i in range(count):
         if i % 2 == 0:
-            index = i / 2
+            index = i // 2
         else:
-            index = count - ((i + 1) / 2)
+            index = count - ((i + 1) // 2)
         yield index, collection[index]
 
 
+class LRUCache(object):
+    """ A thread-safe mapping holding at most `capacity` items, discarding
+    the least recently used item when full.
+
+    :param capacity: maximum number of items held
+    """
+
+    def __init__(self, capacity):
+        self._capacity = capacity
+        self._items = OrderedDict()
+        self._lock = RLock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, key):
+        return key in self._items
+
+    @property
+    def capacity(self):
+        """ Maximum number of items held. Lowering this discards the least
+        recently used items at once.
+        """
+        return self._capacity
+
+    @capacity.setter
+    def capacity(self, capacity):
+        with self._lock:
+            self._capacity = capacity
+            self._trim()
+
+    def _trim(self):
+        while len(self._items) > self._capacity:
+            self._items.popitem(last=False)
+            self._evictions += 1
+
+    def get(self, key, default=None):
+        """ Fetch an item, marking it as most recently used.
+        """
+        with self._lock:
+            try:
+                value = self._items.pop(key)
+            except KeyError:
+                self._misses += 1
+                return default
+            else:
+                self._items[key] = value
+                self._hits += 1
+                return value
+
+    def put(self, key, value):
+        """ Store an item, evicting the least recently used if necessary.
+        """
+        with self._lock:
+            self._items.pop(key, None)
+            self._items[key] = value
+            self._trim()
+
+    def setdefault(self, key, value):
+        """ Store an item unless one is already held for this key, returning
+        the item held.
+        """
+        with self._lock:
+            if key in self._items:
+                return self._items[key]
+            self.put(key, value)
+            return value
+
+    def pop(self, key, default=None):
+        """ Remove and return an item.
+        """
+        with self._lock:
+            return self._items.pop(key, default)
+
+    def clear(self):
+        """ Remove all items.
+        """
+        with self._lock:
+            self._items.clear()
+
+    @property
+    def stats(self):
+        """ Dictionary of hit, miss and eviction counts along with the
+        current size and capacity.
+        """
+        with self._lock:
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "size": len(self._items),
+                "capacity": self.capacity,
+            }
+
+
+class RecordProducer(object):
+    """ Factory for the :py:class:`Record` objects of a single result set,
+    all of which share one set of column names and one column index.
+
+    :param columns: column names
+    """
+
+    def __init__(self, columns):
+        self._columns = tuple(columns)
+        self._column_indexes = dict((b, a) for a, b in enumerate(columns))
+
+    @property
+    def columns(self):
+        """ The column names shared by all records produced.
+
+        :return: tuple of column names
+        """
+        return self._columns
+
+    def produce(self, values):
+        """ Produce a record holding the values supplied.
+
+        :param values: sequence of values, one for each column
+        :rtype: :py:class:`Record`
+        """
+        return Record(self._columns, values, self._column_indexes)
+
+
 class Record(object):
     """ A single row of a Cypher execution result, holding a sequence of named
     values.
     """
 
-    def __init__(self, columns, values):
+    __slots__ = ("_columns", "_column_indexes", "_values")
+
+    def __init__(self, columns, values, column_indexes=None):
         self._columns = tuple(columns)
-        self._column_indexes = dict((b, a) for a, b in enumerate(columns))
+        if column_indexes is None:
+            column_indexes = dict((b, a) for a, b in enumerate(columns))
+        self._column_indexes = column_indexes
         self._values = tuple(values)
     
     def __repr__(self):
@@ -0,0 +1,310 @@
+#/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright 2011-2013, Nigel Small
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import json
+import zlib
+
+from py2neo import neo4j
+from py2neo.aio import AsyncCypherQuery, AsyncReadBatch, AsyncTransaction
+from py2neo.exceptions import CypherError
+from py2neo.neo4j import Resource
+from py2neo.packages.httpstream import ClientError, Request
+from py2neo.packages.httpstream.aio import submit_request
+
+
+CYPHER_RESULT = json.dumps({
+    "columns": ["name", "age"],
+    "data": [["Alice", 33], ["Bob", 44], ["Carol", 55]],
+}).encode("UTF-8")
+
+BATCH_RESULT = json.dumps([
+    {"id": 0, "from": "/cypher", "body": {"columns": ["x"], "data": [[1]]}},
+    {"id": 1, "from": "/cypher", "body": {"columns": ["x"], "data": [[2]]}},
+]).encode("UTF-8")
+
+CYPHER_ERROR = json.dumps({
+    "message": "Unknown identifier `x`.",
+    "exception": "SyntaxException",
+    "stacktrace": [],
+}).encode("UTF-8")
+
+
+def chunked(data, size=7):
+    out = []
+    for i in range(0, len(data), size):
+        piece = data[i:i + size]
+        out.append("{0:x}\r\n".format(len(piece)).encode("ASCII"))
+        out.append(piece + b"\r\n")
+    out.append(b"0\r\n\r\n")
+    return b"".join(out)
+
+
+class FakeServer(object):
+    """ Minimal HTTP/1.1 server returning canned responses by path.
+    """
+
+    def __init__(self):
+        self.connections = 0
+        self.requests = []
+        self.responses = {}
+
+    async def start(self):
+        self.server = await asyncio.start_server(self.handle, "127.0.0.1", 0)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self
+
+    def uri(self, path):
+        return "http://127.0.0.1:{0}{1}".format(self.port, path)
+
+    async def handle(self, reader, writer):
+        self.connections += 1
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            method, path, _ = line.decode("ASCII").split(" ")
+            length = 0
+            while True:
+                line = await reader.readline()
+                if line == b"\r\n":
+                    break
+                key, _, value = line.decode("ASCII").partition(":")
+                if key.lower() == "content-length":
+                    length = int(value)
+            body = await reader.readexactly(length)
+            self.requests.append((method, path, body))
+            head = "HTTP/1.1 {0}\r\nContent-Type: application/json\r\n"
+            if (method, path) in self.responses:
+                data = json.dumps(self.responses[method, path]).encode("UTF-8")
+                writer.write((head.format("200 OK") +
+                              "Content-Length: {0}\r\n\r\n".format(
+                                  len(data))).encode())
+                writer.write(data)
+            elif path == "/chunked":
+                writer.write((head.format("200 OK") +
+                              "Transfer-Encoding: chunked\r\n\r\n").encode())
+                writer.write(chunked(CYPHER_RESULT))
+            elif path == "/gzip":
+                compressor = zlib.compressobj(6, zlib.DEFLATED,
+                                              16 + zlib.MAX_WBITS)
+                data = compressor.compress(CYPHER_RESULT) + compressor.flush()
+                writer.write((head.format("200 OK") +
+                              "Content-Encoding: gzip\r\n"
+                              "Transfer-Encoding: chunked\r\n\r\n").encode())
+                writer.write(chunked(data))
+            elif path == "/batch":
+                writer.write((head.format("200 OK") +
+                              "Transfer-Encoding: chunked\r\n\r\n").encode())
+                writer.write(chunked(BATCH_RESULT))
+            elif path == "/error":
+                writer.write((head.format("400 Bad Request") +
+                              "Content-Length: {0}\r\n\r\n".format(
+                                  len(CYPHER_ERROR))).encode())
+                writer.write(CYPHER_ERROR)
+            else:
+                writer.write((head.format("200 OK") +
+                              "Content-Length: {0}\r\n\r\n".format(
+                                  len(CYPHER_RESULT))).encode())
+                writer.write(CYPHER_RESULT)
+            await writer.drain()
+        writer.close()
+
+
+def run(coroutine_function):
+    async def main():
+        server = await FakeServer().start()
+        try:
+            return await coroutine_function(server)
+        finally:
+            server.server.close()
+    return asyncio.run(main())
+
+
+def query(server, path):
+    q = AsyncCypherQuery.__new__(AsyncCypherQuery)
+    q._cypher = Resource(server.uri(path))
+    q._query = "START n=node(*) RETURN n.name, n.age"
+    return q
+
+
+def test_content_length_response_reuses_connection():
+    async def go(server):
+        values = []
+        for i in range(3):
+            rs = await submit_request(Request("GET", server.uri("/")))
+            values.append(await rs.json())
+        return server, values
+    server, values = run(go)
+    assert values == [json.loads(CYPHER_RESULT.decode("UTF-8"))] * 3
+    assert server.connections == 1
+
+
+def test_chunked_response_is_streamed():
+    async def go(server):
+        rs = await submit_request(Request("GET", server.uri("/chunked")))
+        return "".join([chunk async for chunk in rs.iter_chunks(5)])
+    assert run(go) == CYPHER_RESULT.decode("UTF-8")
+
+
+def test_gzip_response_is_decoded_as_streamed():
+    async def go(server):
+        rs = await submit_request(Request("GET", server.uri("/gzip")))
+        streamed = "".join([chunk async for chunk in rs.iter_chunks(5)])
+        rs = await submit_request(Request("GET", server.uri("/gzip")))
+        return streamed, await rs.json()
+    streamed, value = run(go)
+    assert streamed == CYPHER_RESULT.decode("UTF-8")
+    assert value == json.loads(CYPHER_RESULT.decode("UTF-8"))
+
+
+def test_error_response_is_raised():
+    async def go(server):
+        try:
+            await submit_request(Request("POST", server.uri("/error"), {}))
+        except ClientError as error:
+            return error
+    error = run(go)
+    assert error.status_code == 400
+    assert error.json["exception"] == "SyntaxException"
+
+
+def test_cypher_query_execute():
+    async def go(server):
+        return await query(server, "/").execute(x=1)
+    results = run(go)
+    assert results.columns == ("name", "age")
+    assert [tuple(record) for record in results] == [
+        ("Alice", 33), ("Bob", 44), ("Carol", 55)]
+
+
+def test_cypher_query_stream():
+    async def go(server):
+        async with await query(server, "/chunked").stream() as results:
+            return results.columns, [record.name async for record in results]
+    assert run(go) == (("name", "age"), ["Alice", "Bob", "Carol"])
+
+
+def test_cypher_query_error():
+    async def go(server):
+        try:
+            await query(server, "/error").execute()
+        except CypherError as error:
+            return error
+    error = run(go)
+    assert error.__class__.__name__ == "SyntaxException"
+    assert error.message == "Unknown identifier `x`."
+
+
+def test_many_queries_in_flight():
+    async def go(server):
+        return await asyncio.gather(*[query(server, "/").execute_one()
+                                      for _ in range(50)])
+    assert run(go) == ["Alice"] * 50
+
+
+def batch(server):
+    b = AsyncReadBatch.__new__(AsyncReadBatch)
+    b._batch = Resource(server.uri("/batch"))
+    b.clear()
+    return b
+
+
+def test_batch_submit():
+    async def go(server):
+        return await batch(server).submit()
+    assert run(go) == [1, 2]
+
+
+def test_batch_stream():
+    async def go(server):
+        return [result async for result in await batch(server).stream()]
+    assert run(go) == [1, 2]
+
+
+def serve_paths(server):
+    """ Add responses holding a path, and those needed to fetch its members,
+    to a fake server.
+    """
+    uri = server.uri
+    path = {
+        "start": uri("/db/data/node/0"),
+        "nodes": [uri("/db/data/node/0"), uri("/db/data/node/1")],
+        "relationships": [uri("/db/data/relationship/0")],
+        "end": uri("/db/data/node/1"),
+        "length": 1,
+    }
+    cypher = {"columns": ["p"], "data": [[path]]}
+    server.responses.update({
+        ("GET", "/"): {"data": uri("/db/data/")},
+        ("GET", "/db/data/"): {"batch": uri("/db/data/batch"),
+                               "cypher": uri("/db/data/cypher")},
+        ("POST", "/db/data/batch"): [
+            {"id": 0, "body": {"self": uri("/db/data/node/0"),
+                               "data": {"name": "Alice"}}},
+            {"id": 1, "body": {"self": uri("/db/data/node/1"),
+                               "data": {"name": "Bob"}}},
+            {"id": 2, "body": {"self": uri("/db/data/relationship/0"),
+                               "type": "KNOWS", "data": {}}},
+        ],
+        ("POST", "/paths"): cypher,
+        ("POST", "/paths/batch"): [{"id": 0, "body": cypher},
+                                   {"id": 1, "body": path}],
+        ("POST", "/paths/transaction"): {
+            "results": [{"columns": ["p"], "data": [{"rest": [path]}]}],
+            "errors": [],
+        },
+    })
+
+
+def test_paths_are_hydrated_without_blocking_requests():
+
+    def blocking(*args, **kwargs):
+        raise AssertionError("Blocking request made from a coroutine")
+
+    async def go(server):
+        serve_paths(server)
+        # discover the batch resource up front, as the first blocking use
+        # of a graph database would
+        await asyncio.get_running_loop().run_in_executor(
+            None, lambda: Resource(server.uri("/db/data/node/0"))
+                          .graph_db._subresource("batch"))
+        b = batch(server)
+        b._batch = Resource(server.uri("/paths/batch"))
+        tx = AsyncTransaction(server.uri("/paths/transaction"))
+        tx.append("START p=node(0) RETURN p")
+        return [
+            (await query(server, "/paths").execute()).data[0][0],
+            (await tx.execute())[0][0][0],
+        ] + await b.submit() + [
+            result async for result in await b.stream()
+        ]
+
+    path_entities = neo4j._path_entities
+    fetch_entities = neo4j.GraphDatabaseService._fetch_entities
+    neo4j._path_entities = blocking
+    neo4j.GraphDatabaseService._fetch_entities = blocking
+    try:
+        paths = run(go)
+    finally:
+        neo4j._path_entities = path_entities
+        neo4j.GraphDatabaseService._fetch_entities = fetch_entities
+    assert len(paths) == 6
+    for path in paths:
+        assert [node._properties for node in path.nodes] == [
+            {"name": "Alice"}, {"name": "Bob"}]
+        assert [rel.type for rel in path.relationships] == ["KNOWS"]
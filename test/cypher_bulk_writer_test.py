@@ -0,0 +1,196 @@
+#/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright 2011-2013, Nigel Small
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import unicode_literals
+
+from datetime import date
+
+from py2neo import cypher
+from py2neo.exceptions import ServerError
+from py2neo.packages.httpstream import SocketError
+
+
+class FakeTransaction(object):
+    """ Records the statements sent by a writer in place of a server.
+    """
+
+    def __init__(self, session):
+        self._session = session
+        self._statements = []
+        self.sent = []
+        self.finished = False
+
+    def append(self, statement, parameters=None):
+        self._statements.append((statement, parameters))
+
+    def _post(self):
+        self._session.attempts += 1
+        if self._session.attempts in self._session.failures:
+            raise SocketError(104, host_port="localhost:7474")
+        self.sent.append(self._statements)
+        self._session.requests.append(len(self._statements))
+        self._statements = []
+
+    def execute(self):
+        self._post()
+
+    def commit(self):
+        self._post()
+        self.finished = True
+        self._session.committed.extend(s for sent in self.sent for s in sent)
+
+    def rollback(self):
+        self.finished = True
+        self._session.rollbacks += 1
+
+
+class FakeSession(object):
+
+    def __init__(self, failures=()):
+        self.failures = set(failures)
+        self.attempts = 0
+        self.requests = []
+        self.committed = []
+        self.rollbacks = 0
+
+    def create_transaction(self):
+        return FakeTransaction(self)
+
+
+def _statements(count):
+    return [("CREATE (a {n:{N}})", {"N": i}) for i in range(count)]
+
+
+def test_writer_flushes_and_commits_in_bounded_units():
+    session = FakeSession()
+    writer = cypher.BulkTransactionWriter(session, flush_every=3,
+                                          commit_every=7)
+    stats = writer.write_all(iter(_statements(20)))
+    assert session.committed == _statements(20)
+    assert max(session.requests) <= 3
+    assert stats["statements"] == 20
+    assert stats["transactions"] == 3
+    assert stats["replays"] == 0
+
+
+def test_writer_flushes_by_size():
+    session = FakeSession()
+    writer = cypher.BulkTransactionWriter(session, flush_every=100,
+                                          flush_bytes=60, commit_every=100)
+    writer.write_all(_statements(10))
+    assert session.committed == _statements(10)
+    assert len(session.requests) > 1
+
+
+def test_writer_sizes_any_encodable_parameters():
+    session = FakeSession()
+    writer = cypher.BulkTransactionWriter(session, flush_every=100,
+                                          flush_bytes=60, commit_every=100)
+    statements = [("CREATE (a {born:{B}})", {"B": date(2000, 1, i + 1)})
+                  for i in range(5)]
+    writer.write_all(statements)
+    assert session.committed == statements
+    assert len(session.requests) > 1
+
+
+def test_writer_replays_transaction_after_transient_error():
+    session = FakeSession(failures=[2, 5])
+    writer = cypher.BulkTransactionWriter(session, flush_every=2,
+                                          commit_every=5, retry_delay=0)
+    stats = writer.write_all(_statements(12))
+    assert session.committed == _statements(12)
+    assert stats["replays"] == 2
+    # the second failure is a commit, which is rolled back in case the
+    # server has kept the transaction open
+    assert session.rollbacks == 2
+
+
+def test_writer_gives_up_after_retries():
+    session = FakeSession(failures=[1, 2, 3])
+    writer = cypher.BulkTransactionWriter(session, flush_every=2,
+                                          retries=2, retry_delay=0)
+    try:
+        writer.write_all(_statements(2))
+    except SocketError:
+        assert session.committed == []
+    else:
+        assert False
+
+
+class FakeEndpoint(object):
+
+    def __init__(self, session):
+        self._session = session
+
+    def _delete(self):
+        self._session.deletes += 1
+
+
+class FinishingTransaction(FakeTransaction):
+    """ Marks itself finished whether or not a commit succeeds, as a
+    :py:class:`cypher.Transaction` does.
+    """
+
+    def __init__(self, session):
+        FakeTransaction.__init__(self, session)
+        self._execute = FakeEndpoint(session)
+
+    def commit(self):
+        try:
+            FakeTransaction.commit(self)
+        finally:
+            self.finished = True
+
+
+class FinishingSession(FakeSession):
+
+    def __init__(self, failures=()):
+        FakeSession.__init__(self, failures)
+        self.deletes = 0
+
+    def create_transaction(self):
+        return FinishingTransaction(self)
+
+
+class FakeResponse(Exception):
+    """ Stands in for the HTTP error from which a server error is raised.
+    """
+
+    is_json = False
+
+    def __init__(self, status_code):
+        Exception.__init__(self, "HTTP {0}".format(status_code))
+        self.status_code = status_code
+
+
+def test_writer_discards_transaction_after_failed_commit():
+    session = FinishingSession(failures=[2])
+    writer = cypher.BulkTransactionWriter(session, flush_every=2,
+                                          commit_every=3, retry_delay=0)
+    writer.write_all(_statements(3))
+    assert session.committed == _statements(3)
+    assert session.deletes == 1
+
+
+def test_only_gateway_and_availability_server_errors_are_transient():
+    is_transient = cypher.BulkTransactionWriter._is_transient
+    assert is_transient(ServerError(FakeResponse(503)))
+    assert is_transient(ServerError(FakeResponse(504)))
+    assert not is_transient(ServerError(FakeResponse(500)))
+    assert is_transient(cypher.TransactionError(
+        "Neo.TransientError.Transaction.DeadlockDetected", 409, "Deadlock"))
+    assert not is_transient(cypher.TransactionError(
+        "Neo.ClientError.Statement.InvalidSyntax", 400, "Syntax"))
@@ -0,0 +1,89 @@
+#/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright 2011-2013, Nigel Small
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import unicode_literals
+
+from py2neo import cypher
+
+
+TRANSACTION_URI = "http://localhost:7474/db/data/transaction"
+
+
+class FakeResponse(object):
+
+    def __init__(self, results):
+        self.headers = {}
+        self.json = {"results": results, "errors": []}
+
+    def close(self):
+        pass
+
+
+def test_repeated_statements_are_grouped():
+    tx = cypher.Transaction(TRANSACTION_URI, group=True)
+    for name in ("Alice", "Bob", "Carol"):
+        tx.append("CREATE (a:Person {name:{N}}) RETURN a.name", {"N": name})
+    tx.append("MATCH (a) RETURN count(a)")
+    statements = tx._body()["statements"]
+    assert len(statements) == 2
+    assert statements[0]["statement"] == (
+        "UNWIND {_rows} AS _row CREATE (a:Person {name:_row.`N`}) "
+        "RETURN a.name, _row._i AS _i")
+    assert statements[0]["parameters"] == {"_rows": [
+        {"N": "Alice", "_i": 0}, {"N": "Bob", "_i": 1}, {"N": "Carol", "_i": 2},
+    ]}
+    assert statements[1]["statement"] == "MATCH (a) RETURN count(a)"
+
+
+def test_grouped_results_are_fanned_out():
+    tx = cypher.Transaction(TRANSACTION_URI, group=True)
+    for name in ("Alice", "Bob", "Carol"):
+        tx.append("MATCH (a {name:{N}}) RETURN a.age", {"N": name})
+    tx.append("RETURN 1")
+    tx._body()
+    results = tx._results(FakeResponse([
+        {"columns": ["a.age", "_i"], "data": [
+            {"rest": [33, 0]}, {"rest": [44, 2]}, {"rest": [55, 2]},
+        ]},
+        {"columns": ["1"], "data": [{"rest": [1]}]},
+    ]))
+    assert [[tuple(record) for record in result] for result in results] == [
+        [(33,)], [], [(44,), (55,)], [(1,)],
+    ]
+    assert results[0][0].columns == ("a.age",)
+
+
+def test_unsafe_statements_are_not_grouped():
+    for statement in [
+        "CREATE (a {P})",
+        "MATCH (a) WHERE a.x = {P} WITH a RETURN a",
+        "MATCH (a) WHERE a.x = {P} RETURN count(a)",
+        "MATCH (a) WHERE a.x = {P} RETURN a ORDER BY a.y",
+        "START a=node({P}) RETURN a",
+    ]:
+        tx = cypher.Transaction(TRANSACTION_URI, group=True)
+        tx.append(statement, {"P": 1})
+        tx.append(statement, {"P": 2})
+        assert [s["statement"] for s in tx._body()["statements"]] == \
+            [statement, statement]
+
+
+def test_string_literals_are_not_rewritten():
+    tx = cypher.Transaction(TRANSACTION_URI, group=True)
+    tx.append("CREATE (a {name:{N}, note:'{N}'})", {"N": 1})
+    tx.append("CREATE (a {name:{N}, note:'{N}'})", {"N": 2})
+    assert tx._body()["statements"][0]["statement"] == (
+        "UNWIND {_rows} AS _row CREATE (a {name:_row.`N`, note:'{N}'})")
@@ -0,0 +1,122 @@
+#/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright 2011-2013, Nigel Small
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import unicode_literals
+
+import json
+
+try:
+    from http.server import BaseHTTPRequestHandler
+except ImportError:
+    from BaseHTTPServer import BaseHTTPRequestHandler
+
+from py2neo.packages.httpstream.http import ChunkedJSON, Request, Resource
+
+from .util import serve
+
+
+class EchoHandler(BaseHTTPRequestHandler):
+    """ Returns the decoded request body along with the framing used.
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        if self.headers.get("Transfer-Encoding") == "chunked":
+            framing, data = "chunked", b""
+            while True:
+                size = int(self.rfile.readline().strip(), 16)
+                if size == 0:
+                    self.rfile.readline()
+                    break
+                data += self.rfile.read(size)
+                self.rfile.readline()
+        else:
+            framing = "length"
+            data = self.rfile.read(int(self.headers.get("Content-Length")))
+        content = json.dumps({
+            "framing": framing,
+            "body": json.loads(data.decode("UTF-8")),
+        }).encode("UTF-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+
+def test_json_body_is_serialised_once():
+    body = {"query": "RETURN 1"}
+    request = Request("POST", "http://localhost:7474/", body)
+    first = request.body
+    body["query"] = "RETURN 2"
+    assert request.body is first
+    request.body = body
+    assert json.loads(request.body) == {"query": "RETURN 2"}
+
+
+def test_chunked_json_pieces_join_to_document():
+    items = [{"id": i, "to": "/node", "body": {"name": "é" * i}}
+             for i in range(50)]
+    for chunk_size in (1, 20, 65536):
+        pieces = list(ChunkedJSON(items, chunk_size))
+        assert all(isinstance(piece, bytes) for piece in pieces)
+        assert json.loads(b"".join(pieces).decode("UTF-8")) == items
+    assert b"".join(ChunkedJSON([])) == b"[]"
+
+
+def test_chunked_json_is_sent_with_chunked_encoding():
+    server, uri = serve(EchoHandler)
+    try:
+        items = [{"id": i, "method": "POST"} for i in range(100)]
+        response = Resource(uri).post(ChunkedJSON(items, 64))
+        assert response.content == {"framing": "chunked", "body": items}
+        response = Resource(uri).post(items)
+        assert response.content == {"framing": "length", "body": items}
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_chunks_do_not_split_multibyte_characters():
+    server, uri = serve(EchoHandler)
+    try:
+        items = ["é€" * i for i in range(100)]
+        for chunk_size in (1, 3, 1000):
+            response = Resource(uri).post(items)
+            text = "".join(response.iter_chunks(chunk_size))
+            assert json.loads(text)["body"] == items
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_default_chunk_size_grows_with_content():
+    server, uri = serve(EchoHandler)
+    try:
+        items = ["x" * i for i in range(200)]
+        response = Resource(uri).post(items, chunk_size=16,
+                                      max_chunk_size=1024)
+        sizes = [len(chunk) for chunk in response.iter_chunks()]
+        assert sizes[:4] == [16, 32, 64, 128]
+        assert max(sizes) == 1024
+        assert response.closed
+    finally:
+        server.shutdown()
+        server.server_close()
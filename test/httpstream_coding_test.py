@@ -0,0 +1,174 @@
+#/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright 2011-2013, Nigel Small
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import unicode_literals
+
+import json
+import zlib
+
+try:
+    from http.server import BaseHTTPRequestHandler
+except ImportError:
+    from BaseHTTPServer import BaseHTTPRequestHandler
+
+from py2neo.packages.httpstream.http import (ChunkedJSON, ContentDecoder,
+                                             Resource)
+
+from .util import serve
+
+
+DOCUMENT = [{"name": "Person #{0}".format(i), "age": i % 100}
+            for i in range(3000)]
+
+
+def gzipped(data):
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    return compressor.compress(data) + compressor.flush()
+
+
+class CodingHandler(BaseHTTPRequestHandler):
+    """ Returns a fixed document for GET, gzipped if the client accepts
+    that, and reports the coding of each POST body together with the body
+    itself. Responses advertise that gzipped request bodies are accepted,
+    except at `/refuse`, which answers 415 to any gzipped body.
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def respond(self, status, content, headers=()):
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        for key, value in headers:
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(content)
+
+    def do_GET(self):
+        content = json.dumps(DOCUMENT).encode("UTF-8")
+        if "gzip" in self.headers.get("Accept-Encoding", ""):
+            self.respond(200, gzipped(content),
+                         [("Content-Encoding", "gzip")])
+        else:
+            self.respond(200, content)
+
+    def do_POST(self):
+        if self.headers.get("Transfer-Encoding") == "chunked":
+            framing, data = "chunked", b""
+            while True:
+                size = int(self.rfile.readline().strip(), 16)
+                if size == 0:
+                    self.rfile.readline()
+                    break
+                data += self.rfile.read(size)
+                self.rfile.readline()
+        else:
+            framing = "length"
+            data = self.rfile.read(int(self.headers.get("Content-Length")))
+        coding = self.headers.get("Content-Encoding", "identity")
+        if coding == "gzip":
+            if self.path == "/refuse":
+                self.respond(415, b"{}", [("Accept-Encoding", "identity")])
+                return
+            data = zlib.decompress(data, 16 + zlib.MAX_WBITS)
+        content = json.dumps({
+            "framing": framing,
+            "coding": coding,
+            "body": json.loads(data.decode("UTF-8")),
+        }).encode("UTF-8")
+        if self.path == "/refuse":
+            self.respond(200, content)
+        else:
+            self.respond(200, content, [("Accept-Encoding", "gzip")])
+
+
+def test_gzip_response_is_decoded():
+    server, uri = serve(CodingHandler)
+    try:
+        response = Resource(uri).get()
+        assert response["Content-Encoding"] == "gzip"
+        assert response.content == DOCUMENT
+        response = Resource(uri).get()
+        text = "".join(response.iter_chunks(5))
+        assert json.loads(text) == DOCUMENT
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_decoder_yields_content_as_it_arrives():
+    content = json.dumps(DOCUMENT).encode("UTF-8")
+    data = gzipped(content)
+    decoder = ContentDecoder("gzip")
+    decoded = []
+    for i in range(0, len(data), 64):
+        decoder.feed(data[i:i + 64])
+        decoded.append(decoder.take())
+    decoder.feed(b"")
+    decoded.append(decoder.take())
+    assert b"".join(decoded) == content
+    assert len([piece for piece in decoded if piece]) > 1
+
+
+def test_decoder_accepts_wrapped_and_raw_deflate():
+    content = json.dumps(DOCUMENT).encode("UTF-8")
+    raw = zlib.compressobj(6, zlib.DEFLATED, -zlib.MAX_WBITS)
+    for data in (zlib.compress(content), raw.compress(content) + raw.flush()):
+        decoder = ContentDecoder("deflate")
+        while decoder.wants(100):
+            decoder.feed(data[:10])
+            data = data[10:]
+        first = decoder.take(100)
+        assert first == content[:100]
+        while decoder.wants():
+            decoder.feed(data[:10])
+            data = data[10:]
+        assert first + decoder.take() == content
+
+
+def test_large_body_is_compressed_once_server_advertises_gzip():
+    server, uri = serve(CodingHandler)
+    try:
+        resource = Resource(uri)
+        response = resource.post(DOCUMENT)
+        assert response.content["coding"] == "identity"
+        response = resource.post(DOCUMENT)
+        assert response.content == {"framing": "length", "coding": "gzip",
+                                    "body": DOCUMENT}
+        response = resource.post(DOCUMENT[:1])
+        assert response.content["coding"] == "identity"
+        response = resource.post(ChunkedJSON(DOCUMENT, 1024))
+        assert response.content == {"framing": "chunked", "coding": "gzip",
+                                    "body": DOCUMENT}
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_refused_compressed_body_is_sent_again_as_it_is():
+    server, uri = serve(CodingHandler)
+    try:
+        Resource(uri).post(DOCUMENT)
+        response = Resource(uri + "refuse").post(DOCUMENT)
+        assert response.content["coding"] == "identity"
+        response = Resource(uri).post(DOCUMENT)
+        assert response.content["coding"] == "identity"
+    finally:
+        server.shutdown()
+        server.server_close()
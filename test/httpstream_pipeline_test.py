@@ -0,0 +1,138 @@
+#/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright 2011-2013, Nigel Small
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import unicode_literals
+
+try:
+    from http.server import BaseHTTPRequestHandler
+except ImportError:
+    from BaseHTTPServer import BaseHTTPRequestHandler
+
+from py2neo.packages.httpstream.http import (ClientError, ConnectionPool,
+                                             Request, pipeline)
+
+from .util import serve
+
+
+class PathHandler(BaseHTTPRequestHandler):
+    """ Returns the request path as text, closing each connection after
+    `server.requests_per_connection` requests where this is set.
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def setup(self):
+        BaseHTTPRequestHandler.setup(self)
+        self.served = 0
+        self.server.connections += 1
+
+    def do_GET(self):
+        self.served += 1
+        limit = self.server.requests_per_connection
+        content = self.path.encode("UTF-8")
+        self.send_response(404 if self.path == "/missing" else 200)
+        self.send_header("Content-Type", "text/plain")
+        self.send_header("Content-Length", str(len(content)))
+        if limit and self.served >= limit:
+            self.send_header("Connection", "close")
+            self.close_connection = True
+        self.end_headers()
+        self.wfile.write(content)
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length")))
+        self.do_GET()
+
+
+def _serve_paths(requests_per_connection=None):
+    server, uri = serve(PathHandler, connections=0,
+                        requests_per_connection=requests_per_connection)
+    # request paths are given with their leading slash
+    return server, uri.rstrip("/")
+
+
+def _pipeline(requests, depth):
+    ConnectionPool.configure(pipeline_depth=depth)
+    try:
+        return pipeline(requests)
+    finally:
+        ConnectionPool.configure(pipeline_depth=None)
+        ConnectionPool.clear()
+
+
+def _paths(count):
+    return ["/node/{0}".format(i) for i in range(count)]
+
+
+def test_pipelined_responses_arrive_in_order_on_one_connection():
+    server, uri = _serve_paths()
+    try:
+        paths = _paths(50)
+        responses = _pipeline([Request("GET", uri + path) for path in paths],
+                              depth=16)
+        assert [response.text for response in responses] == paths
+        assert server.connections == 1
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_unanswered_requests_are_resent_after_early_close():
+    server, uri = _serve_paths(requests_per_connection=3)
+    try:
+        paths = _paths(20)
+        responses = _pipeline([Request("GET", uri + path) for path in paths],
+                              depth=8)
+        assert [response.text for response in responses] == paths
+        assert server.connections == 7
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_mixed_requests_keep_their_order():
+    server, uri = _serve_paths()
+    try:
+        requests = [
+            Request("GET", uri + "/a"),
+            Request("GET", uri + "/missing"),
+            Request("POST", uri + "/b", {"name": "Alice"}),
+            Request("GET", uri + "/c"),
+            Request("GET", uri + "/d"),
+        ]
+        responses = _pipeline(requests, depth=4)
+        assert isinstance(responses[1], ClientError)
+        assert responses[1].status_code == 404
+        assert [response.text for response in responses] == \
+            ["/a", "/missing", "/b", "/c", "/d"]
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_requests_are_sent_in_turn_when_pipelining_is_disabled():
+    server, uri = _serve_paths()
+    try:
+        paths = _paths(5)
+        responses = _pipeline([Request("GET", uri + path) for path in paths],
+                              depth=None)
+        assert [response.text for response in responses] == paths
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,119 @@
+#/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright 2011-2013, Nigel Small
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import unicode_literals
+
+import socket
+import threading
+import time
+
+from py2neo.packages.httpstream.http import ConnectionPuddle, PoolExhausted
+
+
+class FakeConnection(object):
+    """ Stands in for an HTTPConnection holding an open socket, with the
+    peer end kept for tests to poke at.
+    """
+
+    def __init__(self, host_port):
+        self.sock, self.peer = socket.socketpair()
+
+    def close(self):
+        if self.sock:
+            self.sock.close()
+            self.peer.close()
+            self.sock = None
+
+
+class FakePuddle(ConnectionPuddle):
+    _http_classes = {"http": FakeConnection}
+
+
+def test_idle_connection_is_reused():
+    puddle = FakePuddle("http", "localhost:7474")
+    first = puddle.acquire()
+    puddle.release(first)
+    assert puddle.acquire() is first
+    assert puddle.stats["hits"] == 1
+    assert puddle.stats["misses"] == 1
+
+
+def test_connection_closed_by_peer_is_evicted():
+    puddle = FakePuddle("http", "localhost:7474")
+    first = puddle.acquire()
+    puddle.release(first)
+    first.peer.close()
+    second = puddle.acquire()
+    assert second is not first
+    assert puddle.stats["evictions"] == 1
+
+
+def test_expired_connection_is_evicted():
+    puddle = FakePuddle("http", "localhost:7474", idle_timeout=0)
+    first = puddle.acquire()
+    puddle.release(first)
+    time.sleep(0.01)
+    assert puddle.acquire() is not first
+    assert puddle.stats["evictions"] == 1
+
+
+def test_excess_idle_connections_are_closed():
+    puddle = FakePuddle("http", "localhost:7474", max_idle=1)
+    connections = [puddle.acquire() for _ in range(3)]
+    for connection in connections:
+        puddle.release(connection)
+    assert puddle.stats["idle"] == 1
+    assert puddle.stats["evictions"] == 2
+
+
+def test_exhausted_puddle_fails_fast_when_not_blocking():
+    puddle = FakePuddle("http", "localhost:7474", max_size=1, block=False)
+    puddle.acquire()
+    try:
+        puddle.acquire()
+    except PoolExhausted:
+        assert True
+    else:
+        assert False
+
+
+def test_exhausted_puddle_times_out_when_blocking():
+    puddle = FakePuddle("http", "localhost:7474", max_size=1, timeout=0.05)
+    puddle.acquire()
+    try:
+        puddle.acquire()
+    except PoolExhausted:
+        assert True
+    else:
+        assert False
+
+
+def test_blocked_acquire_receives_released_connection():
+    puddle = FakePuddle("http", "localhost:7474", max_size=1, timeout=5)
+    first = puddle.acquire()
+    timer = threading.Timer(0.05, puddle.release, [first])
+    timer.start()
+    assert puddle.acquire() is first
+    timer.join()
+
+
+def test_discarded_connection_frees_slot():
+    puddle = FakePuddle("http", "localhost:7474", max_size=1, block=False)
+    first = puddle.acquire()
+    puddle.discard(first)
+    assert first.sock is None
+    assert puddle.acquire() is not first
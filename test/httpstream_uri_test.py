@@ -0,0 +1,93 @@
+#/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright 2011-2013, Nigel Small
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import unicode_literals
+
+from py2neo.packages.httpstream.uri import URI, URITemplate
+
+
+def test_canonical_uri_is_not_parsed_for_string():
+    uri = URI("http://localhost:7474/db/data/node/1")
+    assert uri.string == "http://localhost:7474/db/data/node/1"
+    assert hash(uri) == hash("http://localhost:7474/db/data/node/1")
+    assert uri._source is not None
+
+
+def test_uri_is_parsed_on_component_access():
+    uri = URI("http://bob@example.com:8080/data/report.html?date=2000-12-25#summary")
+    assert uri.host == "example.com"
+    assert uri.port == 8080
+    assert uri.user_info == "bob"
+    assert uri.path.segments == ["", "data", "report.html"]
+    assert uri.fragment == "summary"
+    assert uri.string == "http://bob@example.com:8080/data/report.html?date=2000-12-25#summary"
+
+
+def test_non_canonical_uri_string_is_encoded():
+    assert URI("http://example.com/a b").string == "http://example.com/a%20b"
+
+
+def test_changing_component_discards_memoised_string():
+    uri = URI("http://localhost:7474/db/data/")
+    assert uri.string == "http://localhost:7474/db/data/"
+    uri._scheme = "https"
+    assert uri.string == "https://localhost:7474/db/data/"
+
+
+def test_equality():
+    assert URI("http://example.com/a") == URI("http://example.com/a")
+    assert URI("http://example.com/a") != URI("http://example.com/b")
+    assert URI("http://example.com/a b") == URI("http://example.com/a%20b")
+    assert URI(None) == URI(None)
+    assert URI(None) != URI("")
+
+
+def test_interned_uri_is_shared():
+    base = "http://localhost:7474/db/data/"
+    first = URI.interned(base, "node/")
+    assert first.string == "http://localhost:7474/db/data/node/"
+    assert URI.interned(base, "node/") is first
+    assert URI.interned(base) is not first
+
+
+def test_template_expansion():
+    values = {"var": "value", "hello": "Hello World!", "path": "/foo/bar",
+              "list": ["red", "green", "blue"],
+              "keys": {"semi": ";", "dot": ".", "comma": ","},
+              "x": "1024", "y": "768", "empty": ""}
+    expected = {
+        "{var}": "value",
+        "{hello}": "Hello%20World%21",
+        "{+path}/here": "/foo/bar/here",
+        "X{.list*}": "X.red.green.blue",
+        "{/var,x}/here": "/value/1024/here",
+        "{;x,y,empty}": ";x=1024;y=768;empty",
+        "{?x,y,undef}": "?x=1024&y=768",
+        "{&keys*}": "&semi=%3B&dot=.&comma=%2C",
+        "{var:3}": "val",
+        "{?undef:3}": "",
+    }
+    for template, uri in expected.items():
+        assert URITemplate(template).expand(**values) == URI(uri)
+
+
+def test_compiled_template_is_shared():
+    first = URITemplate("http://localhost:7474/db/data/index/node/{key}/{value}")
+    second = URITemplate("http://localhost:7474/db/data/index/node/{key}/{value}")
+    assert first.expand(key="name", value="Alice").string == \
+        "http://localhost:7474/db/data/index/node/name/Alice"
+    second.expand(key="name", value="Bob")
+    assert first._parts is second._parts
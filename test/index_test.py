@@ -181,6 +181,31 @@ class NodeIndexTestCase(unittest.TestCase):
             alice = self.index.create_if_none("surname", "Smith", {"name": "Alice Smith"})
             self.assertTrue(alice is None)
 
+    def test_get_many(self):
+        alice, bob = self.graph_db.create({"name": "Alice"}, {"name": "Bob"})
+        self.index.add("name", "Alice", alice)
+        self.index.add("name", "Bob", bob)
+        found = self.index.get_many([("name", "Alice"), ("name", "Bob"),
+                                     ("name", "Carol"), ("name", "Alice")],
+                                    chunk_size=2)
+        self.assertEqual(3, len(found))
+        self.assertEqual([alice], found["name", "Alice"])
+        self.assertEqual([bob], found["name", "Bob"])
+        self.assertEqual([], found["name", "Carol"])
+
+    def test_get_or_create_many(self):
+        alice = self.index.get_or_create("name", "Alice", {"name": "Alice"})
+        found = self.index.get_or_create_many([
+            ("name", "Alice", {"name": "Alice Smith"}),
+            ("name", "Bob", {"name": "Bob"}),
+            ("name", "Carol", {"name": "Carol"}),
+        ], chunk_size=2)
+        self.assertEqual(3, len(found))
+        self.assertEqual(alice, found["name", "Alice"])
+        self.assertEqual("Alice", found["name", "Alice"]["name"])
+        self.assertEqual("Bob", found["name", "Bob"]["name"])
+        self.assertEqual([found["name", "Carol"]], self.index.get("name", "Carol"))
+
     def test_add_node_if_none(self):
         alice, bob = self.graph_db.create(
             {"name": "Alice Smith"}, {"name": "Bob Smith"}
@@ -0,0 +1,174 @@
+#/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright 2011-2013, Nigel Small
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import unicode_literals
+
+import json
+
+from py2neo.packages.httpstream.jsonstream import (JSONStream, Tokeniser,
+                                                   BufferedTokeniser,
+                                                   JSONEnvelopeStream,
+                                                   UnexpectedCharacter,
+                                                   assembled,
+                                                   assembled_groups, grouped)
+
+
+DOCUMENTS = [
+    '{}',
+    '[]',
+    '"hello, world"',
+    '42',
+    '[1, -2, 3.5, -0.25, 1e3, 2.5E-2, 0]',
+    '[true, false, null]',
+    '{"columns":["n","r"],"data":[[{"self":"http://localhost:7474/db/data/node/1","data":{"name":"Alice"}},null]]}',
+    '{"escapes": "tab\\there \\"quoted\\" back\\\\slash \\/ \\u00e9\\u263a"}',
+    '  {  "a" : [ 1 , [ 2 , { "b" : [ ] } ] , { } ] , "c" : "d"  }  ',
+    '{"unicode": "Ärger über café ☺"}',
+]
+
+
+def _events(document, tokeniser, chunk_size):
+    chunks = [document[i:i + chunk_size]
+              for i in range(0, len(document), chunk_size)]
+    return list(JSONStream(chunks, tokeniser=tokeniser))
+
+
+def test_buffered_tokeniser_matches_original_for_whole_documents():
+    for document in DOCUMENTS:
+        expected = _events(document, Tokeniser, len(document))
+        actual = _events(document, BufferedTokeniser, len(document))
+        assert actual == expected
+
+
+def test_buffered_tokeniser_matches_original_across_chunk_boundaries():
+    for document in DOCUMENTS:
+        expected = _events(document, Tokeniser, len(document))
+        for chunk_size in range(1, len(document) + 1):
+            assert _events(document, BufferedTokeniser, chunk_size) == expected
+
+
+def test_numbers_split_across_chunks_are_not_truncated():
+    events = list(JSONStream(["[12", "34.", "5e", "1", "]"]))
+    assert events == [((), []), ((0,), 12345.0)]
+
+
+def test_buffered_tokeniser_decodes_string_keys_and_values():
+    document = '{"name": "Alice", "escaped \\u00e9": "tab\\tnew\nline"}'
+    assert list(JSONStream([document])) == [
+        ((), {}),
+        (("name",), "Alice"),
+        (("escaped \u00e9",), "tab\tnew\nline"),
+    ]
+
+
+def test_buffered_tokeniser_rejects_bad_escape():
+    try:
+        list(JSONStream(['["bad \\q escape"]']))
+    except UnexpectedCharacter:
+        assert True
+    else:
+        assert False
+
+
+def test_buffered_tokeniser_rejects_bad_literal():
+    try:
+        list(JSONStream(["[nope]"]))
+    except UnexpectedCharacter:
+        assert True
+    else:
+        assert False
+
+
+ENVELOPE = ('{"columns": ["n", "x"], "data": [[{"data": {"name": "Alice"}}, '
+            '12.5], [null, -3], [true, "\\"]]]"]], "stats": {}}')
+
+ENVELOPE_EVENTS = [
+    (("columns",), ["n", "x"]),
+    (("data", 0), [{"data": {"name": "Alice"}}, 12.5]),
+    (("data", 1), [None, -3]),
+    (("data", 2), [True, "\"]]]"]),
+    (("stats",), {}),
+]
+
+
+def test_envelope_stream_yields_whole_rows():
+    assert list(JSONEnvelopeStream([ENVELOPE])) == ENVELOPE_EVENTS
+
+
+def test_envelope_stream_across_chunk_boundaries():
+    for chunk_size in range(1, len(ENVELOPE) + 1):
+        chunks = [ENVELOPE[i:i + chunk_size]
+                  for i in range(0, len(ENVELOPE), chunk_size)]
+        assert list(JSONEnvelopeStream(chunks)) == ENVELOPE_EVENTS
+
+
+def test_envelope_stream_decodes_member_keys():
+    document = '{"col\\u00fcmns": ["n"], "da\\"ta": [[1]]}'
+    for chunk_size in range(1, len(document) + 1):
+        chunks = [document[i:i + chunk_size]
+                  for i in range(0, len(document), chunk_size)]
+        assert list(JSONEnvelopeStream(chunks)) == [
+            (("col\u00fcmns",), ["n"]),
+            (("da\"ta",), [[1]]),
+        ]
+
+
+def test_envelope_stream_with_empty_data():
+    events = list(JSONEnvelopeStream(['{"data":[],"columns":[]}']))
+    assert events == [(("columns",), [])]
+
+
+def test_envelope_stream_with_bare_array():
+    document = '[{"id": 0, "body": [1]}, {"id": 1}, []]'
+    for chunk_size in range(1, len(document) + 1):
+        chunks = [document[i:i + chunk_size]
+                  for i in range(0, len(document), chunk_size)]
+        assert list(JSONEnvelopeStream(chunks)) == [
+            ((0,), {"id": 0, "body": [1]}), ((1,), {"id": 1}), ((2,), [])]
+
+
+def test_envelope_stream_rejects_non_container():
+    try:
+        list(JSONEnvelopeStream(['"data"']))
+    except UnexpectedCharacter:
+        assert True
+    else:
+        assert False
+
+
+def test_assembled_rebuilds_documents():
+    for document in DOCUMENTS:
+        assert assembled(JSONStream([document])) == json.loads(document)
+
+
+def test_assembled_pads_sparse_lists():
+    assert assembled([((2,), "c"), ((0,), "a")]) == ["a", None, "c"]
+
+
+def test_assembled_does_not_share_empty_containers():
+    empty = []
+    assert assembled([((), empty), ((0,), 1)]) == [1]
+    assert empty == []
+
+
+def test_assembled_groups_matches_grouped():
+    document = '[{"a": [1, 2]}, [], {"b": {"c": null}}, 4]'
+    for level in (1, 2):
+        expected = [(key, assembled(group))
+                    for key, group in grouped(JSONStream([document]), level)]
+        actual = list(assembled_groups(JSONStream([document]), level))
+        assert actual == expected
@@ -0,0 +1,83 @@
+#/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright 2011-2013, Nigel Small
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import unicode_literals
+
+from py2neo.neo4j import Cacheable
+from py2neo.util import LRUCache
+
+
+class Thing(Cacheable):
+    cache_size = 2
+
+    def __init__(self, uri):
+        self.uri = uri
+
+
+class OtherThing(Cacheable):
+
+    def __init__(self, uri):
+        self.uri = uri
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert "b" not in cache
+    assert cache.get("b") is None
+    assert cache.stats == {"hits": 1, "misses": 1, "evictions": 1,
+                           "size": 2, "capacity": 2}
+
+
+def test_lru_cache_lowering_capacity_evicts_at_once():
+    cache = LRUCache(3)
+    for key in "abc":
+        cache.put(key, key)
+    cache.capacity = 1
+    assert len(cache) == 1
+    assert "c" in cache
+    assert cache.stats["evictions"] == 2
+
+
+def test_lru_cache_setdefault_keeps_existing_item():
+    cache = LRUCache(2)
+    assert cache.setdefault("a", 1) == 1
+    assert cache.setdefault("a", 2) == 1
+
+
+def test_registries_are_per_class_and_bounded():
+    Cacheable.invalidate()
+    a = Thing.get_instance("http://localhost:7474/a")
+    assert Thing.get_instance("http://localhost:7474/a") is a
+    assert OtherThing.get_instance("http://localhost:7474/a") is not a
+    Thing.get_instance("http://localhost:7474/b")
+    Thing.get_instance("http://localhost:7474/c")
+    assert Thing.get_instance("http://localhost:7474/a") is not a
+    stats = Thing.cache_stats()
+    assert stats["size"] == 2
+    assert stats["evictions"] == 2
+
+
+def test_invalidation():
+    a = Thing.get_instance("http://localhost:7474/a")
+    Thing.invalidate("http://localhost:7474/a")
+    assert Thing.get_instance("http://localhost:7474/a") is not a
+    b = OtherThing.get_instance("http://localhost:7474/b")
+    Cacheable.invalidate()
+    assert OtherThing.get_instance("http://localhost:7474/b") is not b
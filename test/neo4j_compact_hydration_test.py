@@ -0,0 +1,98 @@
+#/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright 2011-2013, Nigel Small
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import unicode_literals
+
+from py2neo import neo4j
+from py2neo.util import Record, RecordProducer
+
+
+BASE = "http://localhost:7474/db/data/"
+
+
+def node_data(id_):
+    uri = BASE + "node/" + str(id_)
+    return {
+        "extensions": {},
+        "labels": uri + "/labels",
+        "self": uri,
+        "properties": uri + "/properties",
+        "property": uri + "/properties/{key}",
+        "data": {"name": "Alice"},
+    }
+
+
+def rel_data(id_):
+    uri = BASE + "relationship/" + str(id_)
+    return {
+        "extensions": {},
+        "start": BASE + "node/1",
+        "self": uri,
+        "properties": uri + "/properties",
+        "type": "KNOWS",
+        "end": BASE + "node/2",
+        "data": {"since": 1999},
+    }
+
+
+def test_hydrated_metadata_matches_server_data():
+    for data in (node_data(1), rel_data(7)):
+        metadata = neo4j.ResourceMetadata._hydrated(data)
+        assert dict(metadata) == data
+        for key, value in data.items():
+            assert key in metadata
+            assert metadata[key] == value
+        assert "foo" not in metadata
+
+
+def test_hydrated_metadata_shares_layout():
+    first = neo4j.ResourceMetadata._hydrated(node_data(1))
+    second = neo4j.ResourceMetadata._hydrated(node_data(2))
+    assert first._layout is second._layout
+
+
+def test_hydrated_node_keeps_uri_as_string():
+    node = neo4j.Node._hydrated(node_data(1))
+    assert node._http_resource is None
+    assert not node.is_abstract
+    assert node == neo4j.Node(BASE + "node/1")
+    assert node != neo4j.Node(BASE + "node/2")
+    assert node._id == 1
+    assert node._properties_resource.__uri__ == BASE + "node/1/properties"
+
+
+def test_hydrated_entities_have_no_instance_dict():
+    node = neo4j.Node._hydrated(node_data(1))
+    rel = neo4j.Relationship._hydrated(rel_data(7))
+    assert not hasattr(node, "__dict__")
+    assert not hasattr(rel, "__dict__")
+
+
+def test_records_from_producer_share_column_index():
+    producer = RecordProducer(["a", "b"])
+    first = producer.produce([1, 2])
+    second = producer.produce([3, 4])
+    assert first._column_indexes is second._column_indexes
+    assert first.columns == ("a", "b")
+    assert second.b == 4
+    assert second["a"] == 3
+
+
+def test_standalone_record():
+    record = Record(["a", "b"], [1, 2])
+    assert record.a == 1
+    assert record[1] == 2
+    assert record.values == (1, 2)
@@ -0,0 +1,114 @@
+#/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright 2011-2013, Nigel Small
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import unicode_literals
+
+import json
+
+from py2neo import neo4j
+from py2neo.packages.httpstream.uri import URI
+
+
+class FakeGraph(object):
+    """ Stands in for a GraphDatabaseService, counting metadata fetches.
+    """
+
+    def __init__(self, uri):
+        self.__uri__ = URI(uri)
+        self.fetches = 0
+
+    @property
+    def __metadata__(self):
+        self.fetches += 1
+        return {"cypher": self.__uri__.string + "cypher"}
+
+
+class FakeEndpoint(object):
+
+    def __init__(self):
+        self.posted = []
+
+    def _post(self, body=None, headers=None):
+        self.posted.append((body, headers))
+
+
+def setup_function(function):
+    neo4j.CypherQuery.invalidate()
+
+
+def test_query_is_prepared_once_per_graph_and_text():
+    graph_db = FakeGraph("http://localhost:7474/db/data/")
+    text = "START n=node({N}) RETURN n"
+    first = neo4j.CypherQuery(graph_db, text)
+    second = neo4j.CypherQuery(graph_db, "".join(text))
+    assert graph_db.fetches == 1
+    assert second._cypher is first._cypher
+    assert second._query is first._query
+    stats = neo4j.CypherQuery.cache_stats()
+    assert stats["hits"] >= 1
+    assert stats["size"] == 1
+
+
+def test_queries_are_prepared_separately_for_each_graph():
+    first = neo4j.CypherQuery(FakeGraph("http://alpha:7474/db/data/"), "RETURN 1")
+    second = neo4j.CypherQuery(FakeGraph("http://beta:7474/db/data/"), "RETURN 1")
+    assert first._cypher.__uri__ != second._cypher.__uri__
+    assert neo4j.CypherQuery.cache_stats()["size"] == 2
+
+
+def test_execution_sends_query_and_params_as_json():
+    query = neo4j.CypherQuery(FakeGraph("http://localhost:7474/db/data/"),
+                              "START n=node({N}) WHERE n.name = {name} RETURN n")
+    query._cypher = endpoint = FakeEndpoint()
+    query._execute(N=1, name="Alice \"Smith\"")
+    body, headers = endpoint.posted[0]
+    assert json.loads(body) == {
+        "query": "START n=node({N}) WHERE n.name = {name} RETURN n",
+        "params": {"N": 1, "name": "Alice \"Smith\""},
+    }
+    assert headers["Content-Type"] == "application/json"
+
+
+def test_cache_is_bounded():
+    graph_db = FakeGraph("http://localhost:7474/db/data/")
+    cache_size = neo4j.CypherQuery.cache_size
+    neo4j.CypherQuery.cache_size = 2
+    try:
+        for i in range(3):
+            neo4j.CypherQuery(graph_db, "RETURN {0}".format(i))
+        stats = neo4j.CypherQuery.cache_stats()
+        assert stats["size"] == 2
+        assert stats["evictions"] >= 1
+    finally:
+        neo4j.CypherQuery.cache_size = cache_size
+
+
+def test_lowering_cache_size_trims_cache_at_once():
+    graph_db = FakeGraph("http://localhost:7474/db/data/")
+    for i in range(3):
+        neo4j.CypherQuery(graph_db, "RETURN {0}".format(i))
+    cache_size = neo4j.CypherQuery.cache_size
+    neo4j.CypherQuery.cache_size = 1
+    try:
+        stats = neo4j.CypherQuery.cache_stats()
+        assert stats["size"] == 1
+        assert stats["capacity"] == 1
+        # the most recently used query is the one kept
+        neo4j.CypherQuery(graph_db, "RETURN 2")
+        assert graph_db.fetches == 3
+    finally:
+        neo4j.CypherQuery.cache_size = cache_size
+    assert neo4j.CypherQuery.cache_stats()["capacity"] == cache_size
@@ -36,3 +36,25 @@ def test_can_find_nodes_with_label_and_property():
     nodes = list(graph_db.find("Person", "name", "Alice"))
     assert nodes == [alice]
 
+
+def test_can_find_nodes_with_label_in_pages():
+    graph_db = neo4j.GraphDatabaseService()
+    graph_db.clear()
+    people = graph_db.create(*[{"number": i} for i in range(5)])
+    for person in people:
+        person.add_labels("Person")
+    nodes = graph_db.find("Person", page_size=2)
+    first = next(nodes)
+    rest = list(graph_db.find("Person", page_size=2,
+                              resume_from=nodes.checkpoint))
+    assert [first] + rest == sorted(people, key=lambda node: node._id)
+
+
+def test_can_find_nodes_with_label_and_property_in_pages():
+    graph_db = neo4j.GraphDatabaseService()
+    graph_db.clear()
+    alice, bob = graph_db.create({"name": "Alice"}, {"name": "Bob"})
+    alice.add_labels("Person")
+    bob.add_labels("Person")
+    nodes = list(graph_db.find("Person", "name", "Alice", page_size=1))
+    assert nodes == [alice]
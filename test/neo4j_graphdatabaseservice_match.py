@@ -143,6 +143,25 @@ class MatchTestCase(unittest.TestCase):
                                                                     "KNOWS"))
         assert len(rels) == 2
 
+    def test_can_match_in_pages(self):
+        rels = list(self.graph_db.match(page_size=4))
+        assert len(rels) == 6
+        assert len(set(rels)) == 6
+
+    def test_can_bidi_match_in_pages_without_duplicates(self):
+        rels = list(self.graph_db.match(start_node=self.bob,
+                                        bidirectional=True, page_size=2))
+        assert len(rels) == 6
+        assert len(set(rels)) == 6
+
+    def test_can_resume_paged_match(self):
+        rels = self.graph_db.match(rel_type="KNOWS", page_size=2)
+        first = [next(rels), next(rels), next(rels)]
+        rest = list(self.graph_db.match(rel_type="KNOWS", page_size=2,
+                                        resume_from=rels.checkpoint))
+        assert len(rest) == 1
+        assert set(first + rest) == set(self.graph_db.match(rel_type="KNOWS"))
+
 
 if __name__ == '__main__':
     unittest.main()
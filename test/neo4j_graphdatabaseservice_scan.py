@@ -0,0 +1,42 @@
+#/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright 2011-2013, Nigel Small
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from py2neo import neo4j
+
+
+def test_can_scan_all_nodes():
+    graph_db = neo4j.GraphDatabaseService()
+    graph_db.clear()
+    nodes = graph_db.create(*[{"number": i} for i in range(25)])
+    scanned = list(graph_db.scan_nodes(partitions=4, workers=2,
+                                       page_size=3, ordered=True))
+    assert scanned == sorted(nodes, key=lambda node: node._id)
+
+
+def test_can_scan_all_relationships():
+    graph_db = neo4j.GraphDatabaseService()
+    graph_db.clear()
+    entities = graph_db.create({}, {}, (0, "KNOWS", 1), (1, "KNOWS", 0))
+    scanned = list(graph_db.scan_relationships(partitions=3, page_size=1))
+    assert set(scanned) == set(entities[2:])
+
+
+def test_can_scan_empty_graph():
+    graph_db = neo4j.GraphDatabaseService()
+    graph_db.clear()
+    assert list(graph_db.scan_nodes()) == []
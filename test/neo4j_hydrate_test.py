@@ -0,0 +1,82 @@
+#/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright 2011-2013, Nigel Small
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import unicode_literals
+
+from py2neo import neo4j
+
+
+graph_db = neo4j.GraphDatabaseService()
+
+
+def test_hydrate_fills_relationship_metadata():
+    alice, bob, knows = graph_db.create(
+        {"name": "Alice"}, {"name": "Bob"}, (0, "KNOWS", 1, {"since": 1999}))
+    rel = neo4j.Relationship(str(knows.__uri__))
+    assert graph_db.hydrate(rel) == [rel]
+    assert rel._metadata is not None
+    assert rel.type == "KNOWS"
+    assert rel.start_node == alice
+    assert rel.end_node == bob
+
+
+def test_hydrated_properties_are_kept_in_identity_map():
+    alice, = graph_db.create({"name": "Alice"})
+    with neo4j.IdentityMap(graph_db):
+        node = graph_db.node(alice._id)
+        graph_db.hydrate(node, neo4j.Node.abstract(name="Bob"))
+        alice["name"] = "Carol"
+        assert node["name"] == "Alice"
+
+
+def test_path_relationships_are_fetched_together():
+    path = neo4j.Path({"name": "Alice"}, ("KNOWS", {"since": 1999}),
+                      {"name": "Bob"}, "LIKES", {"name": "Carol"})
+    path = path.create(graph_db)
+    query = neo4j.CypherQuery(graph_db, "START a=node({a}) "
+                                        "MATCH p=a-[:KNOWS]->()-[:LIKES]->() "
+                                        "RETURN p")
+    found = query.execute_one(a=path.nodes[0]._id)
+    assert found._relationships[0]._type == "KNOWS"
+    assert found._relationships[0]._properties == {"since": 1999}
+    assert found._relationships[1]._type == "LIKES"
+    assert found.nodes == path.nodes
+
+
+def test_path_results_are_fully_hydrated_in_one_batch():
+    path = neo4j.Path({"name": "Alice"}, "KNOWS", {"name": "Bob"},
+                      "KNOWS", {"name": "Carol"}).create(graph_db)
+    fetches = []
+    fetch_entities = neo4j.GraphDatabaseService._fetch_entities
+
+    def counted(self, entities):
+        fetches.append(len(entities))
+        return fetch_entities(self, entities)
+
+    neo4j.GraphDatabaseService._fetch_entities = counted
+    try:
+        query = neo4j.CypherQuery(graph_db, "START a=node({a}) "
+                                            "MATCH p=a-[:KNOWS*1..2]->() "
+                                            "RETURN p")
+        paths = [record.p for record in query.execute(a=path.nodes[0]._id)]
+    finally:
+        neo4j.GraphDatabaseService._fetch_entities = fetch_entities
+    assert fetches == [5]
+    assert sorted(len(p) for p in paths) == [1, 2]
+    longest = max(paths, key=len)
+    assert [node._properties["name"] for node in longest.nodes] == \
+        ["Alice", "Bob", "Carol"]
+    assert longest.relationships[1].type == "KNOWS"
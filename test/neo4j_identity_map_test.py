@@ -0,0 +1,77 @@
+#/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright 2011-2013, Nigel Small
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import unicode_literals
+
+from py2neo import neo4j
+
+
+graph_db = neo4j.GraphDatabaseService()
+
+
+def test_same_object_is_returned_for_each_uri():
+    alice, = graph_db.create({"name": "Alice"})
+    with neo4j.IdentityMap(graph_db) as identity_map:
+        first = graph_db.node(alice._id)
+        assert graph_db.node(alice._id) is first
+        assert first in identity_map
+
+
+def test_properties_are_cached_and_changes_written_on_exit():
+    alice, = graph_db.create({"name": "Alice", "age": 33})
+    with neo4j.IdentityMap(graph_db) as identity_map:
+        node = graph_db.node(alice._id)
+        node["age"] = node["age"] + 1
+        del node["name"]
+        assert node.get_properties() == {"age": 34}
+        assert identity_map.dirty == [node]
+        assert alice.get_properties() == {"name": "Alice", "age": 33}
+    assert alice.get_properties() == {"age": 34}
+    assert not identity_map.dirty
+
+
+def test_changes_to_unread_entity_are_written():
+    alice, = graph_db.create({"name": "Alice"})
+    with neo4j.IdentityMap(graph_db):
+        graph_db.node(alice._id)["age"] = 33
+    assert alice.get_properties() == {"name": "Alice", "age": 33}
+
+
+def test_refresh_discards_changes():
+    alice, = graph_db.create({"name": "Alice"})
+    with neo4j.IdentityMap(graph_db) as identity_map:
+        node = graph_db.node(alice._id)
+        node["name"] = "Bob"
+        identity_map.refresh(node)
+        assert node["name"] == "Alice"
+        batch = neo4j.WriteBatch(graph_db)
+        batch.set_property(alice, "name", "Carol")
+        batch.run()
+        assert node["name"] == "Alice"
+        identity_map.invalidate(node)
+        assert node["name"] == "Carol"
+    assert alice["name"] == "Carol"
+
+
+def test_changes_are_discarded_on_error():
+    alice, = graph_db.create({"name": "Alice"})
+    try:
+        with neo4j.IdentityMap(graph_db):
+            graph_db.node(alice._id)["name"] = "Bob"
+            raise RuntimeError()
+    except RuntimeError:
+        pass
+    assert alice["name"] == "Alice"
@@ -0,0 +1,98 @@
+#/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright 2011-2013, Nigel Small
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import unicode_literals
+
+import json
+
+try:
+    from http.server import BaseHTTPRequestHandler
+except ImportError:
+    from BaseHTTPServer import BaseHTTPRequestHandler
+
+from py2neo import neo4j
+
+from .util import serve
+
+
+class MetadataHandler(BaseHTTPRequestHandler):
+    """ Serves a fixed document with an ETag, honouring If-None-Match. The
+    ETag is repeated on 304 responses only if `server.etag_on_304` is set.
+    """
+
+    protocol_version = "HTTP/1.1"
+    requests = []
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        etag = '"v1"'
+        self.requests.append(self.headers.get("If-None-Match"))
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            if self.server.etag_on_304:
+                self.send_header("ETag", etag)
+            self.end_headers()
+        else:
+            content = json.dumps({"version": 1}).encode("UTF-8")
+            self.send_response(200)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(content)))
+            self.end_headers()
+            self.wfile.write(content)
+
+
+def test_metadata_is_shared_and_revalidated():
+    server, uri = serve(MetadataHandler, etag_on_304=True)
+    MetadataHandler.requests = []
+    cache = neo4j.MetadataCache(ttl=None)
+
+    class CachedResource(neo4j.Resource):
+        _metadata_cache = cache
+
+    try:
+        for i in range(3):
+            assert CachedResource(uri).__metadata__["version"] == 1
+        assert MetadataHandler.requests == [None]
+        cache.ttl = 0
+        cache.invalidate()
+        CachedResource(uri).__metadata__
+        assert CachedResource(uri).__metadata__["version"] == 1
+        assert MetadataHandler.requests == [None, None, '"v1"']
+        assert cache.stats["revalidations"] == 1
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_validator_is_kept_after_304_without_etag():
+    server, uri = serve(MetadataHandler, etag_on_304=False)
+    MetadataHandler.requests = []
+    cache = neo4j.MetadataCache(ttl=0)
+
+    class CachedResource(neo4j.Resource):
+        _metadata_cache = cache
+
+    try:
+        for i in range(3):
+            assert CachedResource(uri).__metadata__["version"] == 1
+        assert MetadataHandler.requests == [None, '"v1"', '"v1"']
+        assert cache.stats["revalidations"] == 2
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,96 @@
+#/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright 2011-2013, Nigel Small
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import unicode_literals
+
+from socket import error as SocketError
+
+from py2neo import neo4j
+
+
+class FakePagedResults(neo4j.PagedResults):
+    """ Pages through IDs 0 to `count` - 1, each standing for itself,
+    recording each page requested. The first request for a page starting
+    after any ID in `fail_after` fails.
+    """
+
+    def __init__(self, count, page_size, limit=None, resume_from=None,
+                 fail_after=()):
+        self.count = count
+        self.requests = []
+        self.fail_after = set(fail_after)
+        neo4j.PagedResults.__init__(self, None, "", {}, page_size, limit,
+                                    resume_from)
+
+    def _fetch_page(self, after, size):
+        self.requests.append((after, size))
+        if after in self.fail_after:
+            self.fail_after.remove(after)
+            raise SocketError("connection reset")
+        ids = range(after + 1, min(after + 1 + size, self.count))
+        return {"columns": ["n", "id(n)"], "data": [[i, i] for i in ids]}
+
+
+def test_iterates_all_pages():
+    results = FakePagedResults(7, 3)
+    assert list(results) == [0, 1, 2, 3, 4, 5, 6]
+    assert results.requests == [(-1, 3), (2, 3), (5, 3)]
+    assert results.checkpoint == "6"
+
+
+def test_full_last_page_is_followed_by_empty_page():
+    results = FakePagedResults(6, 3)
+    assert list(results) == [0, 1, 2, 3, 4, 5]
+    assert results.requests == [(-1, 3), (2, 3), (5, 3)]
+
+
+def test_limit_caps_page_sizes():
+    results = FakePagedResults(10, 3, limit=5)
+    assert list(results) == [0, 1, 2, 3, 4]
+    assert results.requests == [(-1, 3), (2, 2)]
+
+
+def test_checkpoint_follows_consumer_not_prefetch():
+    results = FakePagedResults(10, 2)
+    assert results.checkpoint is None
+    assert [next(results), next(results), next(results)] == [0, 1, 2]
+    assert results.checkpoint == "2"
+    resumed = FakePagedResults(10, 2, resume_from=results.checkpoint)
+    assert list(resumed) == [3, 4, 5, 6, 7, 8, 9]
+    assert resumed.requests[0] == (2, 2)
+
+
+def test_failed_page_is_raised_then_retried():
+    results = FakePagedResults(4, 2, fail_after=[1])
+    assert [next(results), next(results)] == [0, 1]
+    try:
+        next(results)
+    except SocketError:
+        pass
+    else:
+        assert False, "page failure not raised"
+    assert results.checkpoint == "1"
+    assert list(results) == [2, 3]
+    assert results.requests == [(-1, 2), (1, 2), (1, 2), (3, 2)]
+
+
+def test_page_size_must_be_positive():
+    try:
+        FakePagedResults(4, 0)
+    except ValueError:
+        pass
+    else:
+        assert False, "zero page size accepted"
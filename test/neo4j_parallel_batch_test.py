@@ -0,0 +1,73 @@
+#/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright 2011-2013, Nigel Small
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from py2neo import neo4j
+
+
+def _create(to, body=None):
+    return {"method": "POST", "to": to, "body": body or {}}
+
+
+def test_partitions_keep_referenced_requests_together():
+    body = [_create("node") for _ in range(6)]
+    body.append(_create("{0}/relationships", {"type": "KNOWS", "to": "{3}"}))
+    executor = neo4j.ParallelBatchExecutor(workers=3)
+    partitions = executor.partition(body)
+    assert sorted(sum(partitions, [])) == list(range(7))
+    assert [0, 3, 6] in partitions
+
+
+def test_partitions_respect_max_requests():
+    body = [_create("node") for _ in range(10)]
+    executor = neo4j.ParallelBatchExecutor(workers=2, max_requests=3)
+    partitions = executor.partition(body)
+    assert len(partitions) == 4
+    assert all(len(partition) <= 3 for partition in partitions)
+
+
+def test_can_create_in_parallel():
+    graph_db = neo4j.GraphDatabaseService()
+    abstracts = [{"number": i} for i in range(100)]
+    abstracts.append((0, "KNOWS", 1))
+    results = graph_db.create(*abstracts, workers=4)
+    assert [n["number"] for n in results[:100]] == list(range(100))
+    assert results[100].start_node == results[0]
+    assert results[100].end_node == results[1]
+
+
+def test_can_get_properties_in_parallel():
+    graph_db = neo4j.GraphDatabaseService()
+    nodes = graph_db.create(*[{"number": i} for i in range(20)])
+    properties = graph_db.get_properties(*nodes, workers=4)
+    assert properties == [{"number": i} for i in range(20)]
+
+
+def test_failed_partitions_are_reported():
+    graph_db = neo4j.GraphDatabaseService()
+    alice, bob = graph_db.create({"name": "Alice"}, {"name": "Bob"})
+    graph_db.delete(bob)
+    batch = neo4j.BatchRequestList(graph_db)
+    batch.append_get(batch._uri_for(alice, "properties"))
+    batch.append_get(batch._uri_for(bob, "properties"))
+    executor = neo4j.ParallelBatchExecutor(workers=2)
+    try:
+        executor.execute(batch)
+    except neo4j.ParallelBatchError as error:
+        assert len(error.errors) == 1
+        assert error.results[0].body == {"name": "Alice"}
+        assert error.results[1] is None
+    else:
+        assert False
@@ -0,0 +1,105 @@
+#/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright 2011-2013, Nigel Small
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import unicode_literals
+
+from socket import error as SocketError
+from threading import Event, Lock
+
+from py2neo import neo4j
+
+
+class FakeScanResults(neo4j.ScanResults):
+    """ Scans IDs in `ids`, each standing for itself, recording each page
+    requested. Requests for pages starting after any ID in `fail_after`
+    fail. If `hold_first` is set, requests within the first range wait
+    until `release` is set.
+    """
+
+    def __init__(self, ids, bounds, page_size, workers=4, ordered=False,
+                 progress=None, fail_after=(), hold_first=False):
+        self.ids = sorted(ids)
+        self.requests = []
+        self.lock = Lock()
+        self.fail_after = set(fail_after)
+        self.hold_first = hold_first
+        self.release = Event()
+        neo4j.ScanResults.__init__(self, None, "", bounds, page_size,
+                                   workers, ordered, progress)
+
+    def _fetch_page(self, after, upper, size):
+        with self.lock:
+            self.requests.append((after, upper))
+        if after in self.fail_after:
+            raise SocketError("connection reset")
+        if self.hold_first and after < self.bounds[0][1]:
+            self.release.wait()
+        ids = [i for i in self.ids if after < i < upper][:size]
+        return {"columns": ["n", "id(n)"], "data": [[i, i] for i in ids]}
+
+
+def test_unordered_scan_returns_every_entity():
+    ids = [0, 1, 2, 5, 8, 9, 10, 11, 15]
+    results = FakeScanResults(ids, [(0, 4), (4, 8), (8, 12), (12, 16)], 2,
+                              hold_first=True)
+    scanned = iter(results)
+    try:
+        # entities from later ranges are returned while the first is held up
+        first = next(scanned)
+        assert first > 2
+    finally:
+        results.release.set()
+    assert sorted([first] + list(scanned)) == ids
+
+
+def test_ordered_scan_returns_entities_in_id_order():
+    ids = [0, 1, 2, 5, 8, 9, 10, 11, 15]
+    results = FakeScanResults(ids, [(0, 4), (4, 8), (8, 12), (12, 16)], 2,
+                              ordered=True)
+    assert list(results) == ids
+
+
+def test_each_range_is_paged_by_id():
+    results = FakeScanResults(range(6), [(0, 3), (3, 6)], 2, workers=1)
+    assert list(results) == [0, 1, 2, 3, 4, 5]
+    assert results.requests == [(-1, 3), (1, 3), (2, 6), (4, 6)]
+
+
+def test_progress_is_reported_per_partition():
+    reports = []
+    results = FakeScanResults(range(5), [(0, 3), (3, 6)], 2, ordered=True,
+                              progress=reports.append)
+    list(results)
+    assert [(p.partition, p.count, p.complete) for p in reports] == \
+        [(0, 2, False), (0, 3, True), (1, 2, False), (1, 2, True)]
+    assert all(p.rate >= 0 for p in reports)
+    assert reports[-1].lower == 3
+    assert reports[-1].upper == 6
+
+
+def test_failed_page_stops_scan():
+    results = FakeScanResults(range(100), [(0, 50), (50, 100)], 5,
+                              workers=2, fail_after=[59])
+    try:
+        list(results)
+    except SocketError:
+        pass
+    else:
+        assert False, "page failure not raised"
+
+
+def test_empty_scan():
+    assert list(FakeScanResults([], [], 10)) == []
@@ -0,0 +1,160 @@
+#/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright 2011-2013, Nigel Small
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from datetime import date
+
+from py2neo import neo4j, node, rel
+
+
+class FakeGraph(object):
+
+    def _subresource(self, key):
+        return None
+
+
+class RecordingBatch(neo4j.WriteBatch):
+    """ Records each chunk as it would be sent, with requests in earlier
+    chunks located at "node/<position>".
+    """
+
+    def __init__(self, **kwargs):
+        self.chunks = []
+        neo4j.WriteBatch.__init__(self, FakeGraph(), **kwargs)
+
+    def _execute_chunk(self, requests, external, offset):
+        locations = dict((position, "node/{0}".format(position))
+                         for position in external)
+        self.chunks.append([
+            (neo4j._resolved(request.uri, offset, locations),
+             neo4j._resolved(request.body, offset, locations))
+            for request in requests
+        ])
+
+
+def test_chunked_batch_returns_all_results():
+    graph_db = neo4j.GraphDatabaseService()
+    batch = neo4j.WriteBatch(graph_db, max_requests=7)
+    for i in range(20):
+        batch.create(node(number=i))
+    results = batch.submit()
+    assert [n["number"] for n in results] == list(range(20))
+
+
+def test_chunked_batch_resolves_references_across_chunks():
+    graph_db = neo4j.GraphDatabaseService()
+    batch = neo4j.WriteBatch(graph_db, max_requests=3)
+    previous = None
+    for i in range(10):
+        current = batch.create(node(number=i))
+        if previous is not None:
+            batch.create(rel(previous, "NEXT", current))
+        previous = current
+    results = batch.submit()
+    nodes = [r for r in results if isinstance(r, neo4j.Node)]
+    rels = [r for r in results if isinstance(r, neo4j.Relationship)]
+    assert len(nodes) == 10
+    assert len(rels) == 9
+    for i, r in enumerate(rels):
+        assert r.start_node == nodes[i]
+        assert r.end_node == nodes[i + 1]
+
+
+def test_chunked_batch_by_size():
+    graph_db = neo4j.GraphDatabaseService()
+    batch = neo4j.WriteBatch(graph_db, max_bytes=1024, keep_results=False)
+    for i in range(100):
+        batch.create(node(number=i, padding="x" * 50))
+    assert batch.submit() == []
+
+
+def test_chunked_batch_by_size_resolves_references_across_chunks():
+    graph_db = neo4j.GraphDatabaseService()
+    batch = neo4j.WriteBatch(graph_db, max_bytes=200)
+    previous = None
+    for i in range(10):
+        current = batch.create(node(number=i))
+        if previous is not None:
+            batch.create(rel(previous, "NEXT", current))
+        previous = current
+    results = batch.submit()
+    nodes = [r for r in results if isinstance(r, neo4j.Node)]
+    rels = [r for r in results if isinstance(r, neo4j.Relationship)]
+    assert len(nodes) == 10
+    assert len(rels) == 9
+    for i, r in enumerate(rels):
+        assert r.start_node == nodes[i]
+        assert r.end_node == nodes[i + 1]
+
+
+def test_chunked_batch_by_size_accepts_any_encodable_value():
+    graph_db = neo4j.GraphDatabaseService()
+    batch = neo4j.WriteBatch(graph_db, max_bytes=1024)
+    batch.create(node(born=date(1999, 12, 31)))
+    born, = batch.submit()
+    assert born["born"] == "1999-12-31"
+
+
+def test_chunked_batch_renumbers_positional_references():
+    batch = RecordingBatch(max_requests=3)
+    for i in range(2):
+        batch.append_post("node", {"number": 2 * i})
+        batch.append_post("node", {"number": 2 * i + 1})
+        start, end = 3 * i, 3 * i + 1
+        batch.append_post(batch._uri_for(start, "relationships"),
+                          {"to": batch._uri_for(end), "type": "KNOWS"})
+    batch.run()
+    for chunk in batch.chunks:
+        assert chunk[2] == ("{0}/relationships", {"to": "{1}", "type": "KNOWS"})
+
+
+def test_chunked_batch_by_size_locates_positional_references():
+    # the relationship does not fit in the chunk holding both nodes
+    batch = RecordingBatch(max_bytes=150)
+    batch.append_post("node", {"number": 0})
+    batch.append_post("node", {"number": 1})
+    batch.append_post(batch._uri_for(0, "relationships"),
+                      {"to": batch._uri_for(1), "type": "KNOWS"})
+    batch.run()
+    assert len(batch.chunks) == 2
+    assert batch.chunks[1] == [("node/0/relationships",
+                                {"to": "node/1", "type": "KNOWS"})]
+
+
+def test_chunked_batch_rejects_positions_in_earlier_chunks():
+    batch = RecordingBatch(max_requests=2)
+    batch.append_post("node", {"number": 0})
+    batch.append_post("node", {"number": 1})
+    try:
+        batch._uri_for(0)
+    except ValueError:
+        pass
+    else:
+        assert False, "reference to sent request accepted"
+    batch.run()
+
+
+def test_chunked_batch_creates_relationships_by_position():
+    graph_db = neo4j.GraphDatabaseService()
+    batch = neo4j.WriteBatch(graph_db, max_requests=3)
+    for i in range(3):
+        batch.create(node(number=2 * i))
+        batch.create(node(number=2 * i + 1))
+        batch.create(rel(3 * i, "KNOWS", 3 * i + 1))
+    results = batch.submit()
+    for i in range(3):
+        a, b, r = results[3 * i:3 * i + 3]
+        assert r.start_node == a
+        assert r.end_node == b
@@ -0,0 +1,47 @@
+#/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+# Copyright 2011-2013, Nigel Small
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+""" Helpers shared between tests.
+"""
+
+import threading
+
+try:
+    from http.server import HTTPServer
+    from socketserver import ThreadingMixIn
+except ImportError:
+    from BaseHTTPServer import HTTPServer
+    from SocketServer import ThreadingMixIn
+
+
+class LocalServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+def serve(handler, **attributes):
+    """ Start an HTTP server on a free local port in a background thread,
+    setting any `attributes` given on the server for use by `handler`, and
+    return the server along with its root URI. The caller should
+    `shutdown` and `server_close` the server when done.
+    """
+    server = LocalServer(("127.0.0.1", 0), handler)
+    for key, value in attributes.items():
+        setattr(server, key, value)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    return server, "http://127.0.0.1:{0}/".format(server.server_address[1])